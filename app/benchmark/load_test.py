@@ -0,0 +1,129 @@
+"""Prueba de carga de la API: throughput y latencias p50/p95/p99 por endpoint y nivel de concurrencia.
+
+Pensada para ejecutarse contra la aplicación apuntando al servidor de réplica (benchmark.replay_server), de
+manera que los resultados sean reproducibles y comparables antes y después de cada cambio de rendimiento.
+Con --output se guarda el resultado como línea base y con --compare se compara con una línea base anterior.
+
+Uso (desde app/, con la API levantada en el puerto 8000):
+> uv run python -m benchmark.load_test --appids 413150 1245620 570 --concurrency 1 8 32 --requests 200 --output baseline.json
+> uv run python -m benchmark.load_test --appids 413150 1245620 570 --concurrency 1 8 32 --requests 200 --compare baseline.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from pathlib import Path
+import httpx
+import numpy as np
+
+# Endpoint -> función que construye la petición (método, ruta, cuerpo) para un appid
+ENDPOINTS = {
+    "precio": lambda appid: ("POST", "/api/predict/precio", {"appid": appid}),
+    "popularidad": lambda appid: ("POST", "/api/predict/popularidad", {"appid": appid}),
+    "reviews": lambda appid: ("POST", "/api/predict/reviews", {"appid": appid}),
+    "search": lambda appid: ("GET", "/api/search?q=the", None),
+    "game": lambda appid: ("GET", f"/api/game/{appid}", None),
+    "trending": lambda appid: ("GET", "/api/trending", None),
+}
+
+
+async def _run_level(client : httpx.AsyncClient, endpoint : str, appids : list[int], concurrency : int,
+                     total : int) -> dict:
+    """Lanza total peticiones a endpoint con concurrency peticiones en vuelo a la vez."""
+    build = ENDPOINTS[endpoint]
+    requests = itertools.cycle(appids)
+    latencies, errors = [], 0
+
+    async def worker(n : int):
+        nonlocal errors
+        for _ in range(n):
+            method, path, body = build(next(requests))
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    # Reparto de las peticiones entre los workers
+    shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in shares if n))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput": round(total / elapsed, 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+    }
+
+async def run(base_url : str, endpoints : list[str], appids : list[int], levels : list[int], total : int,
+              warmup : int, timeout : float) -> dict:
+    """Ejecuta la prueba de carga. Devuelve {endpoint: {concurrencia: resultados}}."""
+    results = {}
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for endpoint in endpoints:
+            # Calentamiento: cachés, modelos y conexiones antes de medir
+            if warmup:
+                await _run_level(client, endpoint, appids, 1, warmup)
+            results[endpoint] = {}
+            for level in levels:
+                results[endpoint][str(level)] = await _run_level(client, endpoint, appids, level, total)
+                print(_format_row(endpoint, level, results[endpoint][str(level)]))
+    return results
+
+
+def _format_row(endpoint : str, level : int | str, r : dict, baseline : dict | None = None) -> str:
+    row = (f"{endpoint:<12} c={str(level):<4} {r['throughput']:>9.2f} req/s  p50 {r['p50_ms']:>8.2f} ms  "
+           f"p95 {r['p95_ms']:>8.2f} ms  p99 {r['p99_ms']:>8.2f} ms  errores {r['errors']}")
+    if baseline is not None:
+        row += (f"  | throughput {_change(baseline['throughput'], r['throughput'])}"
+                f"  p95 {_change(baseline['p95_ms'], r['p95_ms'])}")
+    return row
+
+def _change(before : float, after : float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before:+.1%}"
+
+def compare(results : dict, baseline : dict):
+    """Muestra los resultados junto a la variación respecto a la línea base."""
+    print("\nComparación con la línea base")
+    for endpoint, levels in results.items():
+        for level, r in levels.items():
+            print(_format_row(endpoint, level, r, baseline.get(endpoint, {}).get(level)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de SteamPredictor")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    parser.add_argument("--appids", nargs="+", type=int, required=True, help="juegos grabados en el replay server")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="peticiones por endpoint y nivel")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--output", type=Path, help="guarda los resultados (línea base) en este JSON")
+    parser.add_argument("--compare", type=Path, help="línea base con la que comparar los resultados")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.url, args.endpoints, args.appids, args.concurrency, args.requests,
+                              args.warmup, args.timeout))
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados guardados en {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""Servidor de réplica de las APIs de Steam y YouTube para hacer benchmarks de la aplicación sin llamar a los
+servicios reales (sin gastar cuota ni depender de su latencia).
+
+Sirve respuestas grabadas de appdetails, appreviewhistogram, appreviews, las imágenes de cabecera y las
+búsquedas de YouTube, añadiendo una latencia configurable y errores (503 y 429 con Retry-After) con una
+probabilidad dada. Las respuestas se guardan en data/replay/ con el subcomando record.
+
+Uso (desde app/):
+> uv run python -m benchmark.replay_server record --appids 413150 1245620 570
+> uv run python -m benchmark.replay_server serve --port 8001 --latency-ms 80 --jitter-ms 30 --error-rate 0.01
+
+Y la aplicación apuntando al servidor de réplica:
+> STEAM_STORE_URL=http://127.0.0.1:8001 YOUTUBE_API_URL=http://127.0.0.1:8001/youtube/v3/ uv run uvicorn main:app --port 8000
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from utils import config
+
+STEAM_URL = "https://store.steampowered.com"
+YOUTUBE_URL = "https://www.googleapis.com/youtube/v3"
+
+# Mismos parámetros que extraction.steam.get_reviews_text
+APPREVIEWS_PARAMS = {"json": 1, "language": "english", "purchase_type": "all", "filter": "recent",
+                     "num_per_page": 100, "cursor": "*"}
+
+
+def _key(text : str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class Recordings:
+    """Respuestas grabadas en disco: {root}/{tipo}/{clave}.json (o .jpg las imágenes)."""
+    def __init__(self, root : Path):
+        self.root = Path(root)
+
+    def _path(self, kind : str, key : str, suffix : str) -> Path:
+        return self.root / kind / f"{key}{suffix}"
+
+    def load_json(self, kind : str, key : str) -> dict | None:
+        path = self._path(kind, key, ".json")
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_bytes(self, kind : str, key : str, suffix : str) -> bytes | None:
+        path = self._path(kind, key, suffix)
+        return path.read_bytes() if path.exists() else None
+
+    def save_json(self, kind : str, key : str, data : dict):
+        path = self._path(kind, key, ".json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def save_bytes(self, kind : str, key : str, content : bytes, suffix : str):
+        path = self._path(kind, key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+# region record
+async def _record_youtube(client : httpx.AsyncClient, recordings : Recordings, name : str, api_key : str):
+    params = {"part": "snippet", "q": name, "type": "video", "videoCategoryId": "20", "maxResults": 4,
+              "order": "relevance", "key": api_key}
+    search = (await client.get(f"{YOUTUBE_URL}/search", params=params)).json()
+    recordings.save_json("youtube_search", _key(name), search)
+
+    ids = ",".join(item["id"]["videoId"] for item in search.get("items", []))
+    if ids:
+        params = {"part": "statistics,snippet", "id": ids, "key": api_key}
+        videos = (await client.get(f"{YOUTUBE_URL}/videos", params=params)).json()
+        recordings.save_json("youtube_videos", _key(ids), videos)
+
+async def record(appids : list[str], recordings : Recordings, youtube_api_key : str | None):
+    """Graba las respuestas reales de cada juego."""
+    async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+        for appid in appids:
+            print(f"Grabando {appid}")
+            details = (await client.get(f"{STEAM_URL}/api/appdetails", params={"appids": appid, "cc": "eur"})).json()
+            recordings.save_json("appdetails", appid, details)
+            data = (details.get(appid) or {}).get("data") or {}
+
+            if data.get("header_image"):
+                image = await client.get(data["header_image"])
+                if image.status_code == 200:
+                    recordings.save_bytes("images", appid, image.content, ".jpg")
+
+            histogram = await client.get(f"{STEAM_URL}/appreviewhistogram/{appid}", params={"l": "english"})
+            recordings.save_json("appreviewhistogram", appid, histogram.json())
+            reviews = await client.get(f"{STEAM_URL}/appreviews/{appid}", params=APPREVIEWS_PARAMS)
+            recordings.save_json("appreviews", appid, reviews.json())
+
+            if youtube_api_key and data.get("name"):
+                await _record_youtube(client, recordings, data["name"], youtube_api_key)
+# endregion
+
+
+# region serve
+def create_app(recordings : Recordings, base_url : str, latency_ms : float = 0, jitter_ms : float = 0,
+               error_rate : float = 0, rate_limit_rate : float = 0, seed : int | None = None) -> FastAPI:
+    """Aplicación que sirve las respuestas grabadas.
+
+    Args:
+        recordings (Recordings): respuestas grabadas.
+        base_url (str): url del propio servidor (para reescribir las urls de las imágenes).
+        latency_ms (float): latencia media añadida a cada respuesta.
+        jitter_ms (float): variación máxima (uniforme) de la latencia.
+        error_rate (float): probabilidad de responder 503.
+        rate_limit_rate (float): probabilidad de responder 429 con Retry-After: 1.
+        seed (int | None): semilla para que la latencia y los errores sean reproducibles.
+    """
+    app = FastAPI(title="SteamPredictor replay server")
+    rng = random.Random(seed)
+
+    @app.middleware("http")
+    async def inject(request : Request, call_next):
+        delay = rng.uniform(max(0.0, latency_ms - jitter_ms), latency_ms + jitter_ms) / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+        draw = rng.random()
+        if draw < rate_limit_rate:
+            return Response(status_code=429, headers={"Retry-After": "1"})
+        if draw < rate_limit_rate + error_rate:
+            return Response(status_code=503)
+        return await call_next(request)
+
+    @app.get("/api/appdetails")
+    def appdetails(appids : str):
+        data = recordings.load_json("appdetails", appids)
+        if data is None:
+            return {appids: {"success": False}}
+        # Las imágenes también se sirven desde la réplica
+        game = (data.get(appids) or {}).get("data")
+        if game is not None and recordings.load_bytes("images", appids, ".jpg") is not None:
+            game["header_image"] = f"{base_url}/images/{appids}.jpg"
+        return data
+
+    @app.get("/appreviewhistogram/{appid}")
+    def appreviewhistogram(appid : str):
+        data = recordings.load_json("appreviewhistogram", appid)
+        return data if data is not None else {"success": 1, "results": {}}
+
+    @app.get("/appreviews/{appid}")
+    def appreviews(appid : str):
+        data = recordings.load_json("appreviews", appid)
+        return data if data is not None else {"success": 1, "reviews": []}
+
+    @app.get("/images/{appid}.jpg")
+    def image(appid : str):
+        content = recordings.load_bytes("images", appid, ".jpg")
+        if content is None:
+            return Response(status_code=404)
+        return Response(content=content, media_type="image/jpeg")
+
+    @app.get("/youtube/v3/search")
+    def youtube_search(q : str):
+        data = recordings.load_json("youtube_search", _key(q))
+        return data if data is not None else {"items": []}
+
+    @app.get("/youtube/v3/videos")
+    def youtube_videos(id : str):
+        data = recordings.load_json("youtube_videos", _key(id))
+        return data if data is not None else {"items": []}
+
+    @app.get("/health")
+    def health():
+        return JSONResponse({"status": "ok"})
+
+    return app
+# endregion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de réplica de Steam y YouTube para benchmarks")
+    parser.add_argument("--data", type=Path, default=config.REPLAY_DATA_PATH, help="directorio de las grabaciones")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="graba las respuestas reales de los juegos indicados")
+    rec.add_argument("--appids", nargs="+", required=True)
+
+    srv = sub.add_parser("serve", help="sirve las respuestas grabadas")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8001)
+    srv.add_argument("--latency-ms", type=float, default=0)
+    srv.add_argument("--jitter-ms", type=float, default=0)
+    srv.add_argument("--error-rate", type=float, default=0, help="probabilidad de responder 503")
+    srv.add_argument("--rate-limit-rate", type=float, default=0, help="probabilidad de responder 429")
+    srv.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    recordings = Recordings(args.data)
+    if args.command == "record":
+        config.load_env_file()
+        asyncio.run(record(args.appids, recordings, os.environ.get("API_KEY_YT")))
+    else:
+        app = create_app(recordings, f"http://{args.host}:{args.port}", args.latency_ms, args.jitter_ms,
+                         args.error_rate, args.rate_limit_rate, args.seed)
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Módulo que gestiona el modelo CLIP usado para obtener los embeddings de las imágenes.
+
+El modelo no se carga al importar el módulo sino la primera vez que se pide (o cuando el lifespan de la
+aplicación lo precalienta), de manera que importar extraction.steam no obliga a inicializar torch.
+
+Las peticiones concurrentes no codifican cada una su imagen: ClipBatcher junta las imágenes que llegan
+en unos pocos milisegundos (o hasta un máximo de N) y hace un único encode en batch.
+
+Backends disponibles (config.CLIP_BACKEND):
+    - fp32: el modelo tal cual, igual que en la extracción con la que se entrenaron los modelos.
+    - int8: cuantización dinámica a int8 de las capas lineales (CPU). Antes de activarlo en producción
+      conviene comprobar la paridad con extraction/clip_parity.py.
+"""
+import asyncio
+import threading
+import time
+from utils import config
+
+
+BACKENDS = ("fp32", "int8")
+
+
+def _quantize_dynamic(model):
+    """Cuantiza a int8 los pesos de las capas lineales del modelo. Las activaciones se cuantizan al vuelo,
+    por lo que no hace falta calibración y el modelo sigue usándose con encode()."""
+    import torch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+class ClipProvider:
+    """Proveedor perezoso y thread-safe de un modelo SentenceTransformer.
+
+    Args:
+        model_name (str): nombre del modelo de sentence-transformers.
+        backend (str): 'fp32' o 'int8' (cuantización dinámica para CPU).
+    """
+    def __init__(self, model_name : str, backend : str = "fp32"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend de CLIP no soportado: {backend}. Opciones: {BACKENDS}")
+        self.model_name = model_name
+        self.backend = backend
+        self.load_seconds = None
+        self.error = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Devuelve el modelo, cargándolo si todavía no se ha cargado.
+        Si otro hilo lo está cargando, espera a que termine.
+        """
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._load()
+        return self._model
+
+    def warm(self) -> float:
+        """Fuerza la carga del modelo y devuelve los segundos que ha tardado."""
+        self.get()
+        return self.load_seconds
+
+    @property
+    def is_ready(self) -> bool:
+        return self._model is not None
+
+    def status(self) -> dict:
+        """Estado del modelo para el endpoint de salud."""
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "ready": self.is_ready,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+    def _load(self):
+        # Import aquí para no pagar la inicialización de torch al importar el módulo
+        from sentence_transformers import SentenceTransformer
+
+        print(f"Cargando modelo {self.model_name} ({self.backend})")
+        start = time.perf_counter()
+        try:
+            model = SentenceTransformer(self.model_name, device="cpu" if self.backend == "int8" else None)
+            model.eval()
+            if self.backend == "int8":
+                model = _quantize_dynamic(model)
+        except Exception as e:
+            self.error = str(e)
+            raise
+        self.load_seconds = round(time.perf_counter() - start, 3)
+        self.error = None
+        self._model = model
+        print(f"Modelo {self.model_name} cargado en {self.load_seconds}s")
+
+
+class ClipBatcher:
+    """Cola que agrupa las imágenes de peticiones concurrentes en un único encode en batch.
+
+    Args:
+        provider (ClipProvider): proveedor del modelo.
+        max_batch (int): número máximo de imágenes por batch.
+        max_wait_ms (float): milisegundos que se espera a que lleguen más imágenes tras la primera.
+    """
+    def __init__(self, provider : ClipProvider, max_batch : int = 16, max_wait_ms : float = 5):
+        self.provider = provider
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.images = 0
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        """Arranca la tarea que consume la cola. Se llama desde el lifespan de la aplicación."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Para la tarea y falla las peticiones que quedasen en la cola."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Encoder CLIP detenido"))
+
+    async def encode(self, img):
+        """Devuelve el embedding de una imagen PIL. Si la cola no está arrancada se codifica directamente."""
+        if self._task is None:
+            vectors = await asyncio.to_thread(self._encode_batch, [img])
+            return vectors[0]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((img, future))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "images": self.images,
+            "mean_batch_size": round(self.images / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _encode_batch(self, images : list):
+        return self.provider.get().encode(images, batch_size=len(images))
+
+    async def _collect(self) -> list:
+        """Espera la primera imagen y junta las que lleguen hasta max_wait o max_batch."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Si el cliente ha cancelado la petición no se codifica su imagen
+            batch = [(img, future) for img, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                vectors = await asyncio.to_thread(self._encode_batch, [img for img, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.images += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
+# Modelo CLIP para las imágenes
+CLIP = ClipProvider(config.CLIP_MODEL_NAME, config.CLIP_BACKEND)
+CLIP_BATCHER = ClipBatcher(CLIP, config.CLIP_BATCH_SIZE, config.CLIP_BATCH_WAIT_MS)
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,89 @@
+"""Comprobación de paridad de los embeddings de CLIP de un backend frente a los del entrenamiento.
+
+Compara, mediante similitud coseno, los embeddings que genera el backend elegido con los vectores v_clip
+fp32 de precios.parquet, que son con los que se entrenó el KNN de precios. Las imágenes se leen de
+data/images (descargadas por el script E) y, si no están, se descargan de Steam.
+
+Uso (desde app/):
+> uv run python -m extraction.clip_parity --backend int8 --n 200
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import requests
+from io import BytesIO
+from PIL import Image
+from utils import config
+from extraction.clip import ClipProvider
+
+
+def cosine_similarity(a : np.ndarray, b : np.ndarray) -> np.ndarray:
+    """Similitud coseno fila a fila entre dos matrices de la misma forma."""
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.sum(a * b, axis=1)
+
+def _load_reference(n : int, seed : int) -> pd.DataFrame:
+    """Muestra de n juegos (id, v_clip) de precios.parquet."""
+    df = pd.read_parquet(config.PRICES_DATA_PATH, columns=['id', 'v_clip'])
+    return df.sample(n=min(n, len(df)), random_state=seed)
+
+def _load_image(appid : str) -> Image.Image | None:
+    """Imagen de cabecera del juego: local si existe, si no se descarga."""
+    local_path = config.IMAGES_PATH / f"{appid}_header.jpg"
+    try:
+        if local_path.exists():
+            return Image.open(local_path).convert('RGB')
+        response = requests.get(config.HEADER_IMAGE_URL.format(appid=appid), timeout=config.HTTP_TIMEOUT)
+        response.raise_for_status()
+        return Image.open(BytesIO(response.content)).convert('RGB')
+    except Exception as e:
+        print(f"No se ha podido cargar la imagen de {appid}: {e}")
+        return None
+
+def parity_check(provider : ClipProvider, images : list, reference : np.ndarray, batch_size : int = 16) -> dict:
+    """Codifica las imágenes con el proveedor y compara los embeddings con los de referencia.
+
+    Returns:
+        dict: número de imágenes, similitud coseno media, mínima y percentil 5, y ms por imagen.
+    """
+    model = provider.get()
+    start = time.perf_counter()
+    embeddings = model.encode(images, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    similarity = cosine_similarity(np.asarray(embeddings, dtype=np.float32), reference.astype(np.float32))
+    return {
+        "backend": provider.backend,
+        "n": len(images),
+        "cosine_mean": round(float(similarity.mean()), 5),
+        "cosine_min": round(float(similarity.min()), 5),
+        "cosine_p5": round(float(np.percentile(similarity, 5)), 5),
+        "ms_per_image": round(1000 * elapsed / len(images), 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridad de embeddings CLIP frente a precios.parquet")
+    parser.add_argument("--backend", default=config.CLIP_BACKEND, choices=["fp32", "int8"])
+    parser.add_argument("--n", type=int, default=200, help="número de juegos a comparar")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sample = _load_reference(args.n, args.seed)
+    images, reference = [], []
+    for appid, v_clip in zip(sample['id'], sample['v_clip']):
+        img = _load_image(appid)
+        if img is not None:
+            images.append(img)
+            reference.append(np.asarray(v_clip, dtype=np.float32))
+
+    if not images:
+        print("No se ha podido cargar ninguna imagen")
+        return
+
+    provider = ClipProvider(config.CLIP_MODEL_NAME, args.backend)
+    print(parity_check(provider, images, np.stack(reference)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""Módulo que orquesta la obtención de los datos de entrada de cada modelo.
+
+Solo appdetails tiene que ir primero (de ahí salen la fecha de salida, el nombre y la url de la cabecera).
+El resto de fuentes (histograma, imagen + CLIP y YouTube) se lanzan a la vez, de manera que la latencia
+es la de la fase más lenta y no la suma de todas.
+
+Cada fuente pasa antes por una caché en memoria con su propio tiempo de vida. Los metadatos de la imagen
+se buscan además en el almacén de embeddings que escribe la extracción offline (script E): si el juego ya
+se procesó con la misma cabecera no se descarga la imagen, y si la imagen descargada ya está en el
+almacén (mismo hash) no se pasa por CLIP.
+
+Las estadísticas de YouTube de los juegos que ya están en yt_stats.parquet se sirven desde ahí (búsqueda
+por appid); solo los juegos nuevos hacen la búsqueda en la API, que es la llamada que más cuota gasta.
+"""
+import asyncio
+from utils import config
+from utils.http import UpstreamClient
+from utils.cache import TTLCache, cached
+from utils.metrics import timed
+from utils.embedding_store import EmbeddingStore, content_hash
+from extraction.steam import get_appdetails, get_appreviewshistogram, download_image, get_image_metadata_from_bytes
+from extraction.youtube import get_video_data
+from transformation.historic import HistoricIndex
+from transformation.popularity import set_yt_score_max
+
+APPDETAILS_CACHE = TTLCache("appdetails", config.APPDETAILS_CACHE_TTL, max_entries=20000,
+                            max_bytes=config.APPDETAILS_CACHE_MAX_BYTES)
+HISTOGRAM_CACHE = TTLCache("appreviewshistogram", config.HISTOGRAM_CACHE_TTL, max_entries=20000,
+                           max_bytes=config.HISTOGRAM_CACHE_MAX_BYTES)
+YOUTUBE_CACHE = TTLCache("youtube", config.YOUTUBE_CACHE_TTL, max_entries=20000,
+                         max_bytes=config.YOUTUBE_CACHE_MAX_BYTES)
+IMAGE_CACHE = TTLCache("image", config.IMAGE_CACHE_TTL, max_entries=20000,
+                       max_bytes=config.IMAGE_CACHE_MAX_BYTES)
+
+CACHES = [APPDETAILS_CACHE, HISTOGRAM_CACHE, YOUTUBE_CACHE, IMAGE_CACHE]
+
+EMBEDDING_STORE = EmbeddingStore(config.CLIP_STORE_PATH)
+
+YT_STATS = ["viewCount", "likeCount", "commentCount", "favoriteCount"]
+YOUTUBE_INDEX = None
+
+
+def load_youtube_index():
+    """Carga en memoria el índice appid -> estadísticas de YouTube de yt_stats.parquet (si existe)."""
+    global YOUTUBE_INDEX
+    data = config.read_yt_stats_data()
+    YOUTUBE_INDEX = HistoricIndex.from_dataframe(data) if data is not None else None
+    set_yt_score_max(data)
+
+async def watch_embedding_store(interval : float):
+    """Carga en un hilo aparte las filas nuevas del almacén de embeddings cada interval segundos, para no
+    leer el índice del disco en el event loop en cada consulta."""
+    while True:
+        try:
+            await asyncio.to_thread(EMBEDDING_STORE.refresh)
+        except Exception as e:
+            print(f"Error recargando el almacén de embeddings: {e}")
+        await asyncio.sleep(interval)
+
+
+async def cached_appdetails(client : UpstreamClient, appid : str) -> dict:
+    # Se devuelve una copia para que quien la use pueda añadir campos sin modificar la caché
+    data = await cached(APPDETAILS_CACHE, appid, lambda: timed("appdetails", get_appdetails(client, appid)))
+    return dict(data)
+
+async def cached_appreviewshistogram(client : UpstreamClient, appid : str, release_date : str) -> dict:
+    return await cached(HISTOGRAM_CACHE, (appid, release_date),
+                        lambda: timed("appreviewshistogram", get_appreviewshistogram(client, appid, release_date)))
+
+async def cached_image_metadata(client : UpstreamClient, appid : str, url : str) -> tuple[float, list]:
+    return await cached(IMAGE_CACHE, url, lambda: _image_metadata(client, appid, url))
+
+async def _image_metadata(client : UpstreamClient, appid : str, url : str) -> tuple[float, list]:
+    """Brillo y embedding de la cabecera: almacén por appid, almacén por hash o descarga + CLIP."""
+    entry = EMBEDDING_STORE.get_by_appid(appid)
+    if entry is not None and entry['url'] == url:
+        return _from_store(entry)
+
+    content = await timed("image_download", download_image(client, url))
+    entry = EMBEDDING_STORE.get_by_hash(content_hash(content))
+    if entry is not None:
+        return _from_store(entry)
+
+    return await get_image_metadata_from_bytes(content)
+
+def _from_store(entry : dict) -> tuple[float, list]:
+    # Mismo redondeo que la extracción para que los vectores sean iguales a los del entrenamiento
+    return entry['brillo'], [round(float(x), 4) for x in entry['vector']]
+
+def _offline_video_data(appid : str) -> dict | None:
+    """Estadísticas de YouTube del juego en yt_stats.parquet con el formato de get_video_data, o None."""
+    if YOUTUBE_INDEX is None or appid not in YOUTUBE_INDEX:
+        return None
+    cols = [col for col in YOUTUBE_INDEX.columns if "video_statistics" in col or col == "yt_score"]
+    values = YOUTUBE_INDEX.lookup(appid, cols)
+    videos = [
+        {"video_statistics": {stat: int(values.get(f"video_{i}_video_statistics.{stat}", 0)) for stat in YT_STATS}}
+        for i in range(4)
+    ]
+    return {"video_statistics": videos, "yt_score": float(values.get("yt_score", 0))}
+
+async def cached_video_data(appid : str, name : str, release_date : str) -> dict:
+    offline = _offline_video_data(appid)
+    if offline is not None:
+        return offline
+    return await cached(YOUTUBE_CACHE, (name, release_date),
+                        lambda: timed("youtube", asyncio.to_thread(get_video_data, name, release_date)))
+
+def cache_stats() -> dict:
+    """Estadísticas (aciertos, fallos, memoria) de cada caché."""
+    return {cache.name: cache.stats() for cache in CACHES}
+
+
+async def fetch_price_inputs(client : UpstreamClient, appid : str) -> dict:
+    """Obtiene los datos necesarios para el modelo de precios: appdetails y metadatos de la imagen.
+    """
+    data = await cached_appdetails(client, appid)
+    brillo, v_clip = await cached_image_metadata(client, appid, data['header_url'])
+
+    return {"appdetails": data, "brillo": brillo, "v_clip": v_clip}
+
+async def fetch_popularity_inputs(client : UpstreamClient, appid : str) -> dict:
+    """Obtiene los datos necesarios para el modelo de popularidad.
+
+    Tras appdetails se lanzan en paralelo el histograma de reseñas, la imagen (descarga + CLIP) y la
+    búsqueda de YouTube (o sus estadísticas ya extraídas). La API de YouTube es síncrona, por lo que se
+    ejecuta en un hilo aparte.
+    """
+    data = await cached_appdetails(client, appid)
+    release_date = data['release_date']
+
+    histogram, (brillo, v_clip), yt_data = await asyncio.gather(
+        cached_appreviewshistogram(client, appid, release_date),
+        cached_image_metadata(client, appid, data['header_url']),
+        cached_video_data(appid, data['name'], release_date),
+    )
+    data['appreviewshistogram'] = histogram
+
+    return {
+        "appdetails": data,
+        "brillo": brillo,
+        "v_clip": v_clip,
+        "appreviewshistogram": histogram,
+        "yt_data": yt_data,
+    }
+
+if __name__ == '__main__':
+    pass
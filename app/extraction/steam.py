@@ -1,28 +1,33 @@
 """Módulo de requests a las distintas APIs de Steam.
+
+Las funciones de request son asíncronas y reciben el cliente HTTP compartido (utils.http.UpstreamClient),
+que reutiliza conexiones y reintenta los errores transitorios, de manera que las distintas fases de una
+predicción se pueden solapar.
 """
-import requests
+import asyncio
 import datetime
-from sentence_transformers import SentenceTransformer
-from PIL import Image, ImageStat
+from PIL import Image
 from io import BytesIO
+from utils import config
+from utils.http import UpstreamClient
+from utils.embedding_store import reduce_image, image_brightness
+from utils.metrics import timed
+from extraction.clip import CLIP_BATCHER
 
 # Url de la API de appdetails
-APPDETAILS_URL = "https://store.steampowered.com/api/appdetails"
-APPREVIEWSHISTOGRAM_URL = "https://store.steampowered.com/appreviewhistogram/"
-APPREVIEWS_URL = "https://store.steampowered.com/appreviews/"
-
-# Modelo CLIP para las imágenes
-MODEL_CLIP = SentenceTransformer('clip-ViT-B-32')
+APPDETAILS_URL = f"{config.STEAM_STORE_URL}/api/appdetails"
+APPREVIEWSHISTOGRAM_URL = f"{config.STEAM_STORE_URL}/appreviewhistogram/"
+APPREVIEWS_URL = f"{config.STEAM_STORE_URL}/appreviews/"
 
 
-def get_appdetails(appid : str) -> dict:
+async def get_appdetails(client : UpstreamClient, appid : str) -> dict:
     """Obtiene la información de un juego identificado por su APPID de la API de appdetails.
     """
     print(f"Obteniendo información de {appid}")
     
     # Realizamos request a la API de appdetails
     params_info = {"appids": appid, "cc": "eur"}
-    data = _request_url(APPDETAILS_URL, params_info)
+    data = await _request_url(client, APPDETAILS_URL, params_info)
     if data.get(appid) is None or not data[appid].get("success", False):
         raise ValueError("Appdetails request with no content", appid)
     
@@ -60,33 +65,55 @@ def get_appdetails(appid : str) -> dict:
 
     return appdetails
 
-def get_image_metadata(url: str) -> tuple[float, list]:
-    """Obtiene el embedding y el brillo a partir de la url de la imagen
+async def get_image_metadata(client : UpstreamClient, url: str) -> tuple[float, list]:
+    """Obtiene el embedding y el brillo a partir de la url de la imagen.
     """
-    print(f"Obteniendo metadatos de la imagen {url}")
-    # Cargar imagen desde URL
-    response = requests.get(url)
-    img = Image.open(BytesIO(response.content)).convert('RGB')
-    
-    # Obtener brilo
-    stat = ImageStat.Stat(img)
-    brillo = round(stat.mean[0], 4)
-    
+    content = await download_image(client, url)
+    return await get_image_metadata_from_bytes(content)
+
+async def download_image(client : UpstreamClient, url : str) -> bytes:
+    """Descarga la imagen de la url y devuelve su contenido.
+    La descarga se corta si la imagen supera config.IMAGE_MAX_BYTES o tarda más de config.IMAGE_DOWNLOAD_TIMEOUT.
+    """
+    print(f"Descargando imagen {url}")
+    response = await client.get_bytes(url, config.IMAGE_MAX_BYTES, config.IMAGE_DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+async def get_image_metadata_from_bytes(content : bytes) -> tuple[float, list]:
+    """Obtiene el embedding y el brillo a partir del contenido de una imagen.
+
+    La decodificación se hace en un hilo aparte y el embedding se pide al encoder de CLIP compartido,
+    que agrupa las imágenes de peticiones concurrentes en un mismo batch.
+    """
+    img, brillo = await asyncio.to_thread(_load_image, content)
+
     # Extraer embedding
-    feat_clip = MODEL_CLIP.encode(img)
-    vector_clip = [round(float(x), 4) for x in feat_clip.tolist()]
-    
+    feat_clip = await timed("clip_encode", CLIP_BATCHER.encode(img))
     img.close()
-    
+    vector_clip = [round(float(x), 4) for x in feat_clip.tolist()]
+
     return brillo, vector_clip
 
-def get_appreviewshistogram(appid: str, release_date : str) -> dict:
+def _load_image(content : bytes) -> tuple[Image.Image, float]:
+    """Decodifica la imagen a una resolución cercana a la entrada de CLIP y calcula su brillo.
+
+    CLIP redimensiona igualmente a 224px. El brillo se calcula igual que en el script E (ver
+    utils.embedding_store), así que coincide con el del almacén de embeddings.
+    """
+    img = Image.open(BytesIO(content))
+    if img.width * img.height > config.IMAGE_MAX_PIXELS:
+        raise ValueError(f"Imagen demasiado grande: {img.width}x{img.height}")
+    img = reduce_image(img)
+    return img, image_brightness(img)
+
+async def get_appreviewshistogram(client : UpstreamClient, appid: str, release_date : str) -> dict:
     url = APPREVIEWSHISTOGRAM_URL + appid
 
     params_info = {"l": "english"}
     appreviewhistogram = {}
 
-    data = _request_url (url, params_info)
+    data = await _request_url(client, url, params_info)
 
     # Caso en el que no haya ninguna review: los rollups están vacíos
     if data.get("results") is None or data["results"].get("rollups") is None:
@@ -150,7 +177,7 @@ def get_appreviewshistogram(appid: str, release_date : str) -> dict:
 
     return appreviewhistogram
 
-def get_reviews_text(appid : str) -> list[dict]:
+async def get_reviews_text(client : UpstreamClient, appid : str) -> list[dict]:
     """Dado un APPID obtiene 100 reseñas de ese juego.
     """
     url = APPREVIEWS_URL + appid
@@ -164,7 +191,7 @@ def get_reviews_text(appid : str) -> list[dict]:
     }
 
     try:
-        response = requests.get(url, params=params)
+        response = await client.get(url, params=params)
         response.raise_for_status()
         data_json = response.json()
     except Exception:
@@ -184,11 +211,11 @@ def get_reviews_text(appid : str) -> list[dict]:
 
     return reviews_list
 
-def _request_url(url : str ,params : dict) -> dict:
-    """Hace un request.get de la url con los parámetros dados.
+async def _request_url(client : UpstreamClient, url : str, params : dict) -> dict:
+    """Hace un get asíncrono de la url con los parámetros dados.
     Si el request ha sido correcto se devuelve el json de los datos.
     """
-    response = requests.get(url, params=params)
+    response = await client.get(url, params=params)
     response.raise_for_status()
     content_type = response.headers.get("content-type", "")
     if("application/json" not in content_type):
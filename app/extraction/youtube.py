@@ -1,23 +1,56 @@
 """Módulo de extracción de datos de un juego mediante la API de Yotube Data v3
 
+El cliente de la API se construye una sola vez con el documento de discovery que incluye la librería
+(static_discovery), sin descargarlo en cada petición. Como httplib2 no es thread-safe, cada hilo ejecuta
+las peticiones con su propia conexión.
+
 Dependencias:
     - API_KEY_YT: API key de Youtube (Obtenible desde Google Cloud Console)
 """
 
 import os
+import threading
+import httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from utils import config
 from utils.config import load_env_file
 
 load_env_file()
 API_KEY = os.environ.get("API_KEY_YT")
 
-def get_video_data(game_name: str, release_date: str) -> list[dict]:
+_youtube = None
+_youtube_lock = threading.Lock()
+_local = threading.local()
+
+
+def _client():
+    """Cliente de la API de YouTube, creado la primera vez que se usa."""
+    global _youtube
+    if _youtube is None:
+        with _youtube_lock:
+            if _youtube is None:
+                # config.YOUTUBE_API_URL permite apuntar a otro servidor (réplica para benchmarks)
+                client_options = {"api_endpoint": config.YOUTUBE_API_URL} if config.YOUTUBE_API_URL else None
+                _youtube = build("youtube", "v3", developerKey=API_KEY, static_discovery=True,
+                                 cache_discovery=False, client_options=client_options)
+    return _youtube
+
+def _http() -> httplib2.Http:
+    """Conexión HTTP del hilo actual."""
+    if getattr(_local, "http", None) is None:
+        _local.http = httplib2.Http(timeout=config.HTTP_TIMEOUT)
+    return _local.http
+
+def get_video_data(game_name: str, release_date: str) -> dict:
     """Dada un APPID y la fecha de salida de un juego realiza las busquedas en la API de Youtube para obtener los
     identificadores de un vídeo y luego obtiene las estadísticas de los 4 primeros vídeos.
+
+    Devuelve un diccionario con el mismo formato que los registros de la extracción (script C2):
+    {"video_statistics": [{"id", "video_statistics", "video_title", "channel"}, ...]}
     """
     print("Obtaining Youtube Data")
-    youtube = build("youtube", "v3", developerKey=API_KEY)
+    youtube = _client()
     release_date = f"{release_date}T00:00:00Z"
     try:
         # Búsqueda IDs
@@ -29,11 +62,11 @@ def get_video_data(game_name: str, release_date: str) -> list[dict]:
             publishedBefore=release_date,
             maxResults=4,
             order="relevance",
-        ).execute().get("items", [])
+        ).execute(http=_http()).get("items", [])
 
         if not items:
             print(f"No data found for {game_name}.")
-            return []
+            return {"video_statistics": []}
 
         video_ids = [item["id"]["videoId"] for item in items]
 
@@ -42,7 +75,7 @@ def get_video_data(game_name: str, release_date: str) -> list[dict]:
             part="statistics,snippet",
             id=",".join(video_ids),
         )
-        videos_response = videos_request.execute()
+        videos_response = videos_request.execute(http=_http())
         stats_list = []
         for item in videos_response['items']:
             stats_list.append({
@@ -52,7 +85,7 @@ def get_video_data(game_name: str, release_date: str) -> list[dict]:
                 "channel":          item["snippet"]["channelTitle"],
             })
 
-        return stats_list
+        return {"video_statistics": stats_list}
 
     except HttpError as e:
         if e.resp.status == 403 and "quotaExceeded" in str(e.content):
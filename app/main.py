@@ -11,16 +11,31 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import random
-from joblib import load
+import asyncio
+import json
 from utils import config
-from extraction.steam import get_appdetails, get_image_metadata, get_appreviewshistogram, get_reviews_text
-from extraction.youtube import get_video_data
+from extraction.steam import get_reviews_text
+from extraction.clip import CLIP, CLIP_BATCHER
+from extraction.pipeline import fetch_price_inputs, fetch_popularity_inputs, cache_stats, load_youtube_index
+from extraction.pipeline import EMBEDDING_STORE, watch_embedding_store
+from extraction.pipeline import cached_appdetails, cached_appreviewshistogram, cached_image_metadata, cached_video_data
 from transformation.prices import transform_for_prices
 from transformation.popularity import transform_for_popularity
+from transformation.historic import HistoricIndex
+from transformation.reviews import predict_sentiment, load_stop_words
+from utils.catalog import CatalogWatcher
+from utils.search_index import SearchIndex
+from utils.trending import TrendingFeed
+from utils.http import UpstreamClient
+from utils.cache import SingleFlight
+from utils.model_registry import ModelRegistry
+from utils import metrics
+from utils.metrics import STAGE_SECONDS, MODEL_LOAD_SECONDS, timed
 import pandas as pd
 from sklearn.preprocessing import OrdinalEncoder
 
@@ -35,23 +50,97 @@ PRICE_ORDER = [
     '>40'
 ]
 
+def _warm_clip():
+    """Carga CLIP. Si falla, el error queda registrado en CLIP.status() y se reintenta en la primera predicción."""
+    try:
+        CLIP.warm()
+    except Exception as e:
+        print(f"Error cargando el modelo CLIP: {e}")
+
+def _popularity(game : dict) -> int:
+    return game["positive_reviews"] + game["negative_reviews"]
+
+def _rebuild_search_index(games : list[dict]):
+    """Construye el índice de búsqueda y lo sustituye de forma atómica."""
+    app.state.search_index = SearchIndex(games, _popularity)
+
+# Reseñas de prueba con las que se valida una nueva versión del modelo de reseñas
+SMOKE_REVIEWS = ["Great game, I loved every minute of it", "Terrible, a complete waste of money"]
+
+def _validate_price_model(model, recent : list[pd.DataFrame]):
+    """Una nueva versión del modelo de precios tiene que poder predecir las últimas filas servidas."""
+    if not recent:
+        if not hasattr(model, "predict"):
+            raise ValueError("El modelo de precios no tiene predict")
+        return
+    matrix = pd.concat(recent, ignore_index=True)
+    predictions = model.predict(matrix)
+    if len(predictions) != len(matrix):
+        raise ValueError("El modelo de precios no devuelve una predicción por fila")
+    for prediction in predictions:
+        _price_label(prediction)
+
+def _validate_reviews_model(model, recent : list[list[str]]):
+    texts = SMOKE_REVIEWS + [text for texts in recent for text in texts[:5]]
+    predict_sentiment(model, texts)
+
 # region startup/shutdown
 # --------------------------------------------------------------------------
 # Lifespan: se ejecuta al arrancar (startup) y al apagar (shutdown)
 # --------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: cargar modelos en memoria
-    # app.state.model_popularidad = load(config.project_root() / 'models/popularidad/xgboost_model.pkl')
-    print("Cargando modelo de precios")
-    app.state.model_price = load(config.PRICE_MODEL_PATH)
-    # app.state.model_reviews = load(config.project_root() / 'models/reviews/logistic_regression_optuna.pkl')
-
-    # Cargar los datos en memoria
-    app.state.historic_data = config.read_historic_games_data()
+    # Startup: cargar modelos en memoria. Después se vigilan sus ficheros y, si cambian, la nueva versión
+    # se carga y valida en segundo plano y sustituye a la anterior sin reiniciar la API
+    # Recursos de NLTK del modelo de reseñas: se cargan aquí para que un fallo detenga el arranque
+    await asyncio.to_thread(load_stop_words)
+    app.state.models = ModelRegistry(config.MODELS_POLL_SECONDS)
+    app.state.models.register("precio", config.PRICE_MODEL_PATH, _validate_price_model)
+    # El modelo de reseñas es opcional: si falta, la API arranca igual y /api/predict/reviews responde 503
+    app.state.models.register("reviews", config.REVIEWS_MODEL_PATH, _validate_reviews_model, optional=True)
+    # app.state.models.register("popularidad", config.project_root() / 'models/popularidad/xgboost_model.pkl')
+    app.state.models.load_all()
+    await app.state.models.start()
+
+    # Cargar los datos en memoria: índice id -> fila sobre historic_games_data
+    app.state.historic_index = HistoricIndex.from_dataframe(config.read_historic_games_data())
+    # Estadísticas de YouTube de los juegos ya extraídos (evita la búsqueda en la API)
+    load_youtube_index()
+    # Almacén de embeddings CLIP: se carga al arrancar y después se leen sus filas nuevas en segundo plano
+    await asyncio.to_thread(EMBEDDING_STORE.refresh)
+    embedding_watcher = asyncio.create_task(watch_embedding_store(config.CLIP_STORE_POLL_SECONDS))
+
+    # Índice de búsqueda: empieza con los juegos mock y se reconstruye en segundo plano con el catálogo real
+    # cada vez que cambia el fichero
+    # Lo mismo con el listado de trending, que se guarda ya serializado
+    mock_games = [g.model_dump() for g in MOCK_GAMES]
+    _rebuild_search_index(mock_games)
+    app.state.trending = TrendingFeed(config.TRENDING_SIZE, config.TRENDING_MAX_AGE, config.TRENDING_REFRESH_SECONDS)
+    app.state.trending.update(mock_games)
+    await app.state.trending.start()
+    app.state.catalog_watcher = CatalogWatcher(config.CATALOG_PATH, config.CATALOG_POLL_SECONDS)
+    app.state.catalog_watcher.subscribe(_rebuild_search_index)
+    app.state.catalog_watcher.subscribe(app.state.trending.update)
+    await app.state.catalog_watcher.start()
+
+    # Cliente HTTP asíncrono compartido por todas las peticiones a APIs externas
+    app.state.http_client = UpstreamClient(config.HTTP_TIMEOUT, config.HTTP_MAX_PER_HOST, config.HTTP_MAX_RETRIES,
+                                           config.HTTP_BACKOFF_BASE, config.HTTP_BACKOFF_MAX)
+
+    # Precalentar CLIP en segundo plano: la API arranca ya y /api/health indica cuándo está lista
+    clip_warmup = asyncio.create_task(asyncio.to_thread(_warm_clip))
+    await CLIP_BATCHER.start()
 
     print("SteamPredictor API iniciada")
     yield
+    await app.state.models.stop()
+    await app.state.catalog_watcher.stop()
+    await app.state.trending.stop()
+    await CLIP_BATCHER.stop()
+    embedding_watcher.cancel()
+    if not clip_warmup.done():
+        clip_warmup.cancel()
+    await app.state.http_client.aclose()
     print("SteamPredictor API detenida")
 
 
@@ -80,23 +169,41 @@ class PredictionRequest(BaseModel):
     appid: int
     model_name: str = "default"
 
+class BatchPredictionRequest(BaseModel):
+    """Datos de entrada para una predicción de varios juegos a la vez."""
+    appids: list[int]
+    model_name: str = "default"
+
 class PredictionResponse(BaseModel):
     """Resultado de una predicción."""
     value: float
     confidence: float
     model_used: str
     details: dict
+    model_version: str | None = None
 
 class PopularityResponse(BaseModel):
     reviews : int
+    model_version : str | None = None
 
 class PriceResponse(BaseModel):
     price : str
+    model_version : str | None = None
 
 class ReviewsResponse(BaseModel):
     value : bool
     topics : list
 
+class BatchPredictionItem(BaseModel):
+    """Resultado de la predicción de un juego dentro de un batch. Si falla, value es None y error indica el motivo."""
+    appid: int
+    value: str | int | None = None
+    error: str | None = None
+
+class BatchPredictionResponse(BaseModel):
+    results: list[BatchPredictionItem]
+    model_version: str | None = None
+
 class GameInfo(BaseModel):
     """Información básica de un juego. Usada para mostrar un juego en la página web y para luego obtener la información
     de dicho juego en cada modelo"""
@@ -158,59 +265,82 @@ def index(request: Request):
 # --------------------------------------------------------------------------
 
 @app.get("/api/search")
-def search_games(q: str = ""):
-    """Buscar juegos por nombre."""
-    if not q:
-        return [g.model_dump() for g in MOCK_GAMES]
-    query = q.lower()
-    return [g.model_dump() for g in MOCK_GAMES if query in g.name.lower()]
+def search_games(q: str = "", limit: int = 20):
+    """Buscar juegos por nombre. Devuelve los más populares que contienen la búsqueda."""
+    limit = max(1, min(limit, config.SEARCH_MAX_RESULTS))
+    return app.state.search_index.search(q, limit)
 
 
 @app.get("/api/game/{appid}")
 def get_game(appid: int):
     """Obtener detalles de un juego."""
-    for g in MOCK_GAMES:
-        if g.appid == appid:
-            return g.model_dump()
+    game = app.state.search_index.get(appid)
+    if game is not None:
+        return game
     return JSONResponse(status_code=404, content={"error": "Juego no encontrado"})
 
 
 @app.get("/api/trending")
-def get_trending():
-    """Juegos trending con predicción de tendencia."""
-    trending = []
-    for g in MOCK_GAMES:
-        trending.append({
-            **g.model_dump(),
-            "trend": random.choice(["up", "down"]),
-            "change_percent": round(random.uniform(1, 25), 1),
-        })
-    return trending
+def get_trending(request: Request):
+    """Juegos trending con predicción de tendencia. El listado se precalcula en segundo plano."""
+    feed = app.state.trending
+    payload, etag = feed.snapshot()
+    headers = {**feed.headers, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+@app.get("/api/health")
+def health():
+    """Estado de la API: está lista cuando los modelos necesarios para predecir están cargados. Los opcionales
+    que no están cargados aparecen con ready False pero no impiden que esté lista."""
+    registry = app.state.models
+    models = {
+        **{name: {"ready": registry.get(name) is not None, **status} for name, status in registry.status().items()},
+        "clip": {**CLIP.status(), "batching": CLIP_BATCHER.stats()},
+    }
+    ready = all(registry.get(name) is not None for name, spec in registry.specs.items() if not spec["optional"])
+    ready = ready and CLIP.is_ready
+    content = {"status": "ready" if ready else "loading", "models": models}
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    """Aciertos, fallos y memoria de las cachés de APIs externas."""
+    return cache_stats()
+
+@app.get("/metrics")
+def get_metrics():
+    """Métricas de la API (latencia por fase, errores de APIs externas, cachés y modelos) en formato Prometheus."""
+    metrics.update_cache_metrics(cache_stats())
+    if CLIP.load_seconds is not None:
+        MODEL_LOAD_SECONDS.set(round(CLIP.load_seconds, 3), model="clip")
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # endregion
 
 #region predictions
+# Predicciones en curso: si llegan varias peticiones iguales a la vez (juego trending), solo la primera hace
+# el trabajo y el resto esperan su resultado
+PREDICTIONS = SingleFlight("predictions")
+
 @app.post("/api/predict/popularidad", response_model=PopularityResponse)
-def predict_popularidad(req: PredictionRequest):
+async def predict_popularidad(req: PredictionRequest):
     """Predicción de popularidad (stub)."""
-    print('Predicting popularity')
     appid = str(req.appid)
-    data = get_appdetails(appid)
-    release_date = data['release_date']
-    data['appreviewshistogram'] = get_appreviewshistogram(appid, release_date)
-    print(data)
+    return await PREDICTIONS.do(("popularidad", appid), lambda: _predict_popularidad(appid))
 
-    header_url = data['header_url']
-    brillo, v_clip = get_image_metadata(header_url)
-    print(brillo)
-    print(v_clip, len(v_clip))
-
-    name = data['name']
-    print(name, release_date)
-    yt_data = get_video_data(name, release_date)
-    print(yt_data)
+async def _predict_popularidad(appid : str) -> PopularityResponse:
+    print('Predicting popularity')
+    inputs = await fetch_popularity_inputs(app.state.http_client, appid)
+    data = inputs['appdetails']
+    print(data)
+    print(inputs['brillo'])
+    print(inputs['yt_data'])
 
-    row = transform_for_popularity(data, appid, app.state.historic_data, v_clip, brillo,data['appreviewshistogram'], yt_data)
+    with STAGE_SECONDS.time(stage="transform"):
+        row = transform_for_popularity(data, appid, app.state.historic_index, inputs['v_clip'], inputs['brillo'],
+                                       inputs['appreviewshistogram'], inputs['yt_data'])
     print(row)
     print(row.columns)
 
@@ -220,59 +350,238 @@ def predict_popularidad(req: PredictionRequest):
 
 
 @app.post("/api/predict/precio", response_model=PriceResponse)
-def predict_precio(req: PredictionRequest):
+async def predict_precio(req: PredictionRequest):
     """Predicción de precio (stub)."""
-    print('Predicting prices')
     appid = str(req.appid)
-    data = get_appdetails(appid)
-    print(data)
+    return await PREDICTIONS.do(("precio", appid), lambda: _predict_precio(appid))
 
-    header_url = data['header_url']
-    brillo, v_clip = get_image_metadata(header_url)
-    print(brillo)
-    print(v_clip, len(v_clip))
+async def _predict_precio(appid : str) -> PriceResponse:
+    print('Predicting prices')
+    inputs = await fetch_price_inputs(app.state.http_client, appid)
+    data = inputs['appdetails']
+    print(data)
+    print(inputs['brillo'])
 
     print("Transforming data to dataFrame")
-    row = transform_for_prices(data, appid, app.state.historic_data, v_clip, brillo )
+    with STAGE_SECONDS.time(stage="transform"):
+        row = transform_for_prices(data, appid, app.state.historic_index, inputs['v_clip'], inputs['brillo'])
     print(row)
     print(row.columns)
 
-    prediction = app.state.model_price.predict(row)
-
-    idx = int(round(float(prediction[0])))
-    idx = max(0, min(idx, len(PRICE_ORDER) - 1))
-    range_label = PRICE_ORDER[idx]
+    # El predict es CPU, se ejecuta en el threadpool para no bloquear el event loop
+    price_model = app.state.models.get("precio")
+    with STAGE_SECONDS.time(stage="predict"):
+        prediction = await run_in_threadpool(price_model.model.predict, row)
+    range_label = _price_label(prediction[0])
+    app.state.models.remember("precio", row)
 
     print('Predicción', range_label, prediction)
-    return PriceResponse(price=range_label)
+    return PriceResponse(price=range_label, model_version=price_model.version)
 
 @app.post("/api/predict/reviews", response_model=PredictionResponse)
-def predict_reviews(req: PredictionRequest):
-    """Predicción de sentimiento de reseñas (stub)."""
+async def predict_reviews(req: PredictionRequest):
+    """Predicción del sentimiento de las reseñas más recientes del juego."""
     appid = str(req.appid)
-    reviews_list = get_reviews_text(appid)
-    print(reviews_list)
-    print(len(reviews_list))
-
-
-    ratio = round(random.uniform(0.55, 0.96), 2)
+    if app.state.models.get("reviews") is None:
+        return JSONResponse(status_code=503, content={"error": "Modelo de reviews no cargado"})
+    return await PREDICTIONS.do(("reviews", appid), lambda: _predict_reviews(appid))
+
+async def _predict_reviews(appid : str) -> PredictionResponse | JSONResponse:
+    reviews_list = await timed("reviews", get_reviews_text(app.state.http_client, appid))
+    print(f"{len(reviews_list)} reseñas obtenidas")
+    if not reviews_list:
+        return JSONResponse(status_code=404, content={"error": "Juego sin reseñas"})
+
+    texts = [review["texto"] for review in reviews_list]
+    reviews_model = app.state.models.get("reviews")
+    with STAGE_SECONDS.time(stage="predict"):
+        sentiment = await run_in_threadpool(predict_sentiment, reviews_model.model, texts)
+    app.state.models.remember("reviews", texts)
+
+    ratio = sentiment["ratio"]
+    steam_ratio = sum(review["valoracion"] for review in reviews_list) / len(reviews_list)
     return PredictionResponse(
         value=ratio,
-        confidence=round(random.uniform(0.70, 0.93), 2),
+        confidence=sentiment["confidence"],
         model_used="Logistic Regression (Optuna)",
         details={
             "metric": "positive_ratio",
             "unit": "ratio",
-            "sentiment_distribution": {
-                "very_positive": round(random.uniform(0.2, 0.5), 2),
-                "positive": round(random.uniform(0.1, 0.3), 2),
-                "mixed": round(random.uniform(0.05, 0.15), 2),
-                "negative": round(random.uniform(0.02, 0.1), 2),
-                "very_negative": round(random.uniform(0.01, 0.05), 2),
-            },
+            "num_reviews": len(reviews_list),
+            "steam_ratio": round(steam_ratio, 2),
+            "sentiment_distribution": sentiment["sentiment_distribution"],
             "history": _generate_mock_history(ratio * 100),
         },
+        model_version=reviews_model.version,
     )
 
 
-# endregion
\ No newline at end of file
+# --------------------------------------------------------------------------
+# Predicción en batch: se obtienen los datos de todos los juegos a la vez y
+# se hace un único predict sobre la matriz de features
+# --------------------------------------------------------------------------
+def _price_label(prediction) -> str:
+    """Convierte la salida del modelo de precios en la etiqueta del rango de precio."""
+    idx = int(round(float(prediction)))
+    idx = max(0, min(idx, len(PRICE_ORDER) - 1))
+    return PRICE_ORDER[idx]
+
+def _price_row(appid : str, inputs : dict) -> pd.DataFrame:
+    return transform_for_prices(inputs['appdetails'], appid, app.state.historic_index, inputs['v_clip'], inputs['brillo'])
+
+def _popularity_row(appid : str, inputs : dict) -> pd.DataFrame:
+    return transform_for_popularity(inputs['appdetails'], appid, app.state.historic_index, inputs['v_clip'],
+                                    inputs['brillo'], inputs['appreviewshistogram'], inputs['yt_data'])
+
+BATCH_MODELS = {
+    "precio": {
+        "fetch_function": fetch_price_inputs,
+        "transform_function": _price_row,
+        "model": "precio",
+        "output_function": _price_label,
+    },
+    "popularidad": {
+        "fetch_function": fetch_popularity_inputs,
+        "transform_function": _popularity_row,
+        "model": "popularidad",
+        "output_function": lambda prediction: int(round(float(prediction))),
+    },
+}
+
+@app.post("/api/predict/{type}/batch", response_model=BatchPredictionResponse)
+async def predict_batch(type: str, req: BatchPredictionRequest):
+    """Predicción de varios juegos con una única llamada al modelo."""
+    spec = BATCH_MODELS.get(type)
+    # Solo los tipos con modelo registrado (popularidad todavía no tiene)
+    if spec is None or spec["model"] not in app.state.models.specs:
+        return JSONResponse(status_code=404, content={"error": f"Predicción en batch no disponible para '{type}'"})
+    model = app.state.models.get(spec["model"])
+    if model is None:
+        return JSONResponse(status_code=503, content={"error": f"Modelo de {type} no cargado"})
+    if len(req.appids) > config.BATCH_MAX_APPIDS:
+        return JSONResponse(status_code=422, content={"error": f"Máximo {config.BATCH_MAX_APPIDS} juegos por batch"})
+
+    print(f'Predicting {type} batch of {len(req.appids)} games')
+    appids = list(dict.fromkeys(str(appid) for appid in req.appids))
+    semaphore = asyncio.Semaphore(config.BATCH_CONCURRENCY)
+
+    async def _fetch(appid):
+        async with semaphore:
+            inputs = await spec["fetch_function"](app.state.http_client, appid)
+        with STAGE_SECONDS.time(stage="transform"):
+            return spec["transform_function"](appid, inputs)
+
+    rows = await asyncio.gather(*(_fetch(appid) for appid in appids), return_exceptions=True)
+
+    # Los juegos que fallan (sin datos, coming soon...) no impiden predecir el resto. gather también puede
+    # devolver un CancelledError, que no hereda de Exception. (type es aquí el parámetro de la ruta)
+    errors = {appid: str(row) or row.__class__.__name__
+              for appid, row in zip(appids, rows) if isinstance(row, BaseException)}
+    valid = [(appid, row) for appid, row in zip(appids, rows) if not isinstance(row, BaseException)]
+
+    values = {}
+    if valid:
+        matrix = pd.concat([row for _, row in valid], ignore_index=True)
+        with STAGE_SECONDS.time(stage="predict_batch"):
+            predictions = await run_in_threadpool(model.model.predict, matrix)
+        values = {appid: spec["output_function"](p) for (appid, _), p in zip(valid, predictions)}
+
+    results = [
+        BatchPredictionItem(appid=int(appid), value=values.get(appid), error=errors.get(appid))
+        for appid in appids
+    ]
+    return BatchPredictionResponse(results=results, model_version=model.version)
+
+
+# --------------------------------------------------------------------------
+# Predicción en streaming (server-sent events): cada fase se envía en cuanto
+# termina para que el frontend pueda ir mostrando los datos
+# --------------------------------------------------------------------------
+STREAM_RESPONSES = {
+    "precio": lambda value, version: PriceResponse(price=value, model_version=version),
+    "popularidad": lambda value, version: PopularityResponse(reviews=value, model_version=version),
+}
+
+def _sse(event : str, data) -> str:
+    """Mensaje en formato server-sent events."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _stream_stages(type : str, appid : str, data : dict) -> dict:
+    """Fases que dependen de appdetails y se lanzan en paralelo. Devuelve nombre de la fase -> corrutina."""
+    client = app.state.http_client
+    stages = {"image": cached_image_metadata(client, appid, data['header_url'])}
+    if type == "popularidad":
+        stages["appreviewshistogram"] = cached_appreviewshistogram(client, appid, data['release_date'])
+        stages["youtube"] = cached_video_data(appid, data['name'], data['release_date'])
+    return stages
+
+def _stage_event(stage : str, result, inputs : dict):
+    """Guarda el resultado de una fase en inputs (mismo formato que fetch_*_inputs) y devuelve lo que se envía."""
+    if stage == "image":
+        inputs['brillo'], inputs['v_clip'] = result
+        return {"brillo": result[0], "clip_dim": len(result[1])}
+    if stage == "appreviewshistogram":
+        inputs['appdetails']['appreviewshistogram'] = inputs['appreviewshistogram'] = result
+        return result
+    inputs['yt_data'] = result
+    return result
+
+async def _predict_inputs(type : str, appid : str, inputs : dict) -> tuple:
+    """Transforma y predice. Devuelve el valor y la versión del modelo usada."""
+    spec = BATCH_MODELS[type]
+    with STAGE_SECONDS.time(stage="transform"):
+        row = spec["transform_function"](appid, inputs)
+    model = app.state.models.get(spec["model"])
+    if model is None:
+        raise RuntimeError(f"Modelo de {type} no cargado")
+    with STAGE_SECONDS.time(stage="predict"):
+        prediction = await run_in_threadpool(model.model.predict, row)
+    app.state.models.remember(spec["model"], row)
+    return spec["output_function"](prediction[0]), model.version
+
+async def _prediction_events(type : str, appid : str, request : Request):
+    """Genera los eventos de una predicción: metadata, una por fase (image, appreviewshistogram, youtube) según
+    van terminando y prediction. Si algo falla se envía un evento error y se termina.
+
+    Si el cliente se desconecta, el generador se cancela y con él las fases que sigan pendientes.
+    """
+    # Sin modelo (el de popularidad todavía no existe) no se descarga nada: el cliente recibe el error y
+    # EventSource no muestra un error de conexión genérico como con un 503
+    if app.state.models.get(BATCH_MODELS[type]["model"]) is None:
+        yield _sse("error", {"error": f"Modelo de {type} no cargado"})
+        return
+    pending = set()
+    try:
+        data = await cached_appdetails(app.state.http_client, appid)
+        yield _sse("metadata", {"appid": int(appid), **data})
+        inputs = {"appdetails": data}
+
+        tasks = {asyncio.create_task(coro): stage for stage, coro in _stream_stages(type, appid, data).items()}
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if await request.is_disconnected():
+                return
+            for task in done:
+                stage = tasks[task]
+                yield _sse(stage, _stage_event(stage, task.result(), inputs))
+
+        value, version = await _predict_inputs(type, appid, inputs)
+        yield _sse("prediction", STREAM_RESPONSES[type](value, version).model_dump())
+    except Exception as e:
+        print(f"Error en la predicción en streaming de {appid}: {e}")
+        yield _sse("error", {"error": str(e)})
+    finally:
+        for task in pending:
+            task.cancel()
+
+@app.get("/api/predict/{type}/stream")
+async def predict_stream(type: str, appid: int, request: Request):
+    """Predicción en streaming (text/event-stream) con los resultados parciales de cada fase."""
+    if type not in STREAM_RESPONSES:
+        return JSONResponse(status_code=404, content={"error": f"Predicción en streaming no disponible para '{type}'"})
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(_prediction_events(type, str(appid), request), media_type="text/event-stream",
+                             headers=headers)
+
+# endregion
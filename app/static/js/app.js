@@ -123,6 +123,18 @@ async function navigateToGame(appid) {
     `;
 }
 
+// Predicciones que el backend puede enviar por fases (server-sent events). Popularidad no tiene todavía
+// modelo: su stream solo devolvería un error, así que sigue usando POST /api/predict/popularidad
+const STREAM_TYPES = ['precio'];
+const STREAM_STAGES = {
+    metadata: 'Datos del juego',
+    image: 'Imagen de cabecera',
+    appreviewshistogram: 'Histograma de reseñas',
+    youtube: 'Vídeos de YouTube',
+};
+
+let currentStream = null;
+
 async function requestPrediction(type, appid) {
     const resultsArea = document.getElementById('prediction-results-area');
     resultsArea.style.display = 'block';
@@ -130,6 +142,11 @@ async function requestPrediction(type, appid) {
 
     resultsArea.scrollIntoView({ behavior: 'smooth' });
 
+    if (STREAM_TYPES.includes(type) && window.EventSource) {
+        streamPrediction(type, appid, resultsArea);
+        return;
+    }
+
     const res = await fetch(`/api/predict/${type}`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -141,6 +158,48 @@ async function requestPrediction(type, appid) {
     showPredictionView(type, prediction);
 }
 
+function streamPrediction(type, appid, resultsArea) {
+    // Si había otra predicción en curso se cierra: el backend cancela el trabajo pendiente
+    if (currentStream) currentStream.close();
+
+    const steps = [];
+    const renderSteps = () => {
+        resultsArea.innerHTML = `
+            <ul class="prediction-steps">${steps.map((s) => `<li>${s}</li>`).join('')}</ul>
+            <div class="loading"><div class="spinner"></div></div>
+        `;
+    };
+
+    const source = new EventSource(`/api/predict/${type}/stream?appid=${appid}`);
+    currentStream = source;
+
+    Object.entries(STREAM_STAGES).forEach(([stage, label]) => {
+        source.addEventListener(stage, () => {
+            steps.push(`${label} \u2713`);
+            renderSteps();
+        });
+    });
+
+    source.addEventListener('prediction', (event) => {
+        source.close();
+        currentStream = null;
+        const prediction = JSON.parse(event.data);
+        currentPrediction = prediction;
+        showPredictionView(type, prediction);
+    });
+
+    source.addEventListener('error', (event) => {
+        source.close();
+        currentStream = null;
+        const message = event.data ? JSON.parse(event.data).error : 'Error de conexión';
+        // El mensaje viene del servidor: se inserta como texto, nunca como HTML
+        const error = document.createElement('div');
+        error.className = 'prediction-error';
+        error.textContent = message;
+        resultsArea.replaceChildren(error);
+    });
+}
+
 function showPredictionView(type, prediction) {
     document.getElementById('prediction-detail-content').innerHTML = `
         <div class="loading"><div class="spinner"></div></div>
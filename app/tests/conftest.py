@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# La aplicación se ejecuta desde app/ e importa utils.*, extraction.*... (ver Containerfile)
+APP_DIR = Path(__file__).resolve().parents[1]
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
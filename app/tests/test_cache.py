@@ -0,0 +1,84 @@
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import TTLCache
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+def test_get_and_set():
+    cache = TTLCache("test", ttl=None)
+    assert cache.get("a") is None
+    assert cache.get("a", "default") == "default"
+
+    cache.set("a", {"name": "Portal"})
+
+    assert cache.get("a") == {"name": "Portal"}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache("test", ttl=60)
+    cache.set("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.stats()["bytes"] == 0
+
+def test_set_renews_ttl(clock):
+    cache = TTLCache("test", ttl=60)
+    cache.set("a", 1)
+    clock.now += 50
+    cache.set("a", 2)
+    clock.now += 50
+
+    assert cache.get("a") == 2
+
+def test_evicts_least_recently_used_entry():
+    cache = TTLCache("test", ttl=None, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_evicts_to_stay_under_max_bytes():
+    value = "x" * 1000
+    size = cache_module._approx_size(value)
+    cache = TTLCache("test", ttl=None, max_bytes=2 * size)
+    cache.set("a", value)
+    cache.set("b", value)
+
+    cache.set("c", value)
+
+    assert len(cache) == 2 and cache.get("a") is None
+    assert cache.stats()["bytes"] == 2 * size
+
+def test_values_larger_than_max_bytes_are_not_stored():
+    cache = TTLCache("test", ttl=None, max_bytes=100)
+    cache.set("a", "x" * 1000)
+
+    assert len(cache) == 0
+
+def test_replacing_a_key_updates_bytes():
+    cache = TTLCache("test", ttl=None)
+    cache.set("a", "x" * 1000)
+    cache.set("a", "x")
+
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] == cache_module._approx_size("x")
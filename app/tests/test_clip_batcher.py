@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import pytest
+
+from extraction.clip import ClipBatcher
+
+class FakeModel:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def encode(self, images, batch_size):
+        with self.lock:
+            self.calls.append(list(images))
+        if self.error is not None:
+            raise self.error
+        return [f"v-{img}" for img in images]
+
+class FakeProvider:
+    def __init__(self, model):
+        self.model = model
+
+    def get(self):
+        return self.model
+
+def _encode_all(batcher, images):
+    async def run():
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.encode(img) for img in images), return_exceptions=True)
+        finally:
+            await batcher.stop()
+    return asyncio.run(run())
+
+def test_concurrent_calls_are_coalesced():
+    model = FakeModel()
+    batcher = ClipBatcher(FakeProvider(model), max_batch=16, max_wait_ms=50)
+
+    vectors = _encode_all(batcher, ["a", "b", "c", "d"])
+
+    assert vectors == ["v-a", "v-b", "v-c", "v-d"]
+    assert model.calls == [["a", "b", "c", "d"]]
+    assert batcher.stats() == {"batches": 1, "images": 4, "mean_batch_size": 4.0}
+
+def test_max_batch_splits_batches():
+    model = FakeModel()
+    batcher = ClipBatcher(FakeProvider(model), max_batch=2, max_wait_ms=50)
+
+    vectors = _encode_all(batcher, ["a", "b", "c"])
+
+    assert vectors == ["v-a", "v-b", "v-c"]
+    assert [len(call) for call in model.calls] == [2, 1]
+
+def test_failing_batch_propagates_to_every_waiter():
+    error = RuntimeError("fallo de CLIP")
+    batcher = ClipBatcher(FakeProvider(FakeModel(error)), max_batch=16, max_wait_ms=50)
+
+    results = _encode_all(batcher, ["a", "b", "c"])
+
+    assert all(result is error for result in results)
+    assert batcher.stats()["batches"] == 0
+
+def test_batcher_keeps_serving_after_a_failed_batch():
+    model = FakeModel(RuntimeError("fallo de CLIP"))
+    batcher = ClipBatcher(FakeProvider(model), max_batch=16, max_wait_ms=20)
+
+    async def run():
+        await batcher.start()
+        try:
+            with pytest.raises(RuntimeError):
+                await batcher.encode("a")
+            model.error = None
+            return await batcher.encode("b")
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == "v-b"
+
+def test_encode_without_start_encodes_directly():
+    model = FakeModel()
+    batcher = ClipBatcher(FakeProvider(model))
+
+    assert asyncio.run(batcher.encode("a")) == "v-a"
+    assert model.calls == [["a"]]
@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from transformation import popularity, prices
+from transformation.historic import HistoricIndex
+
+GAME = {
+    "short_description": "Un juego de prueba",
+    "price_overview": {"initial": 1999},
+    "supported_languages": ["English", "Spanish", "French"],
+    "release_date": "2021-03-15",
+    "genres": [{"description": "Action"}, {"description": "Indie"}, {"description": "Sports"}, "roto"],
+    "categories": [{"description": "Single-player"}, {"description": "Steam Cloud"}],
+}
+
+HISTOGRAM = {"rollups": {"recommendations_up": 120, "recommendations_down": 30}}
+
+YT_DATA = {"video_statistics": [
+    {"video_statistics": {"viewCount": "1000", "likeCount": "50", "commentCount": "7", "favoriteCount": "0"}},
+    {"video_statistics": {"viewCount": "abc", "likeCount": None}},
+    "roto",
+]}
+
+V_CLIP = [0.1, 0.2, 0.3]
+
+
+def _historic(cols):
+    df = pd.DataFrame({"id": [10], **{col: [i + 0.5] for i, col in enumerate(cols)}})
+    return HistoricIndex.from_dataframe(df)
+
+
+# Fila calculada como antes de FeatureSpec: un diccionario por petición que se convierte a DataFrame
+def _pandas_row(game, appid, historic_index, genres, categories, history_cols):
+    row = {}
+    row["description_len"] = len(game.get("short_description", ""))
+    price_dict = game.get("price_overview", {})
+    row["price_overview"] = price_dict.get("initial", 0) / 100 if isinstance(price_dict, dict) else 0
+    row["num_languages"] = len(game.get("supported_languages", []))
+    try:
+        row["release_year"] = pd.to_datetime(game.get("release_date")).year
+    except Exception:
+        row["release_year"] = 0
+    genres_list = [g["description"] for g in game.get("genres", []) if isinstance(g, dict)]
+    for genre in genres:
+        row[genre] = 1 if genre in genres_list else 0
+    categories_list = [c["description"] for c in game.get("categories", []) if isinstance(c, dict)]
+    for cat in categories:
+        row[cat] = 1 if cat in categories_list else 0
+    row.update(historic_index.lookup(appid, history_cols) or {col: 0 for col in history_cols})
+    return pd.DataFrame([row])
+
+def _pandas_prices(game, appid, historic_index, v_clip, brillo):
+    row = _pandas_row(game, appid, historic_index, prices.GENRES, prices.CATEGORIES, prices.HISTORY_COLS)
+    row["v_clip"] = [v_clip]
+    row["brillo"] = brillo
+    return row[prices.UNPROCESSED_COLUMNS]
+
+def _pandas_popularity(game, appid, historic_index, v_clip, brillo, histogram, yt_data):
+    row = _pandas_row(game, appid, historic_index, popularity.GENRES, popularity.CATEGORIES, popularity.HISTORY_COLS)
+    row["v_clip"] = [v_clip]
+    row["brillo"] = brillo
+    rollups = histogram.get("rollups") if isinstance(histogram, dict) else None
+    if isinstance(rollups, dict):
+        row["recomendaciones_totales"] = (rollups.get("recommendations_up", 0) or 0) + (rollups.get("recommendations_down", 0) or 0)
+    else:
+        row["recomendaciones_totales"] = None
+    for col in popularity.YT_STAT_COLS:
+        row[col] = 0
+    score = 0
+    videos = yt_data.get("video_statistics", []) if isinstance(yt_data, dict) else []
+    for i, video in enumerate(videos[:4]):
+        if not isinstance(video, dict):
+            continue
+        stats = video.get("video_statistics", {}) or {}
+        values = {}
+        for stat in popularity.YT_STATS:
+            values[stat] = int(np.nan_to_num(pd.to_numeric(stats.get(stat, 0), errors="coerce")))
+            row[f"video_{i}_video_statistics.{stat}"] = values[stat]
+        v, l, c = values["viewCount"], values["likeCount"], values["commentCount"]
+        if v > 0 or l > 0 or c > 0:
+            score += 0.5 * np.log10(v + 1) + 0.3 * np.log10(l + 1) + 0.2 * np.log10(c + 1)
+    row["yt_score"] = score
+    return row[popularity.COLUMNS]
+
+
+def _assert_same_row(new, old):
+    assert list(new.columns) == list(old.columns)
+    assert new.loc[0, "v_clip"] == old.loc[0, "v_clip"]
+    numeric = [col for col in new.columns if col != "v_clip"]
+    np.testing.assert_allclose(new[numeric].to_numpy(dtype=float), old[numeric].to_numpy(dtype=float), equal_nan=True)
+
+@pytest.mark.parametrize("appid", ["10", "99"])
+def test_prices_row_matches_pandas_row(appid):
+    historic_index = _historic(prices.HISTORY_COLS)
+
+    new = prices.transform_for_prices(GAME, appid, historic_index, V_CLIP, 87.5)
+    old = _pandas_prices(GAME, appid, historic_index, V_CLIP, 87.5)
+
+    _assert_same_row(new, old)
+
+@pytest.mark.parametrize("appid", ["10", "99"])
+@pytest.mark.parametrize("histogram", [HISTOGRAM, {}])
+def test_popularity_row_matches_pandas_row(monkeypatch, appid, histogram):
+    # Sin yt_stats.parquet no se normaliza el yt_score, igual que antes
+    monkeypatch.setattr(popularity, "YT_SCORE_MAX", None)
+    historic_index = _historic(popularity.HISTORY_COLS)
+
+    new = popularity.transform_for_popularity(GAME, appid, historic_index, V_CLIP, 87.5, histogram, YT_DATA)
+    old = _pandas_popularity(GAME, appid, historic_index, V_CLIP, 87.5, histogram, YT_DATA)
+
+    _assert_same_row(new, old)
+
+def test_invalid_release_date_and_missing_fields():
+    row = prices.transform_for_prices({"release_date": "Coming soon"}, "99", _historic(prices.HISTORY_COLS), V_CLIP, 0)
+
+    assert row.loc[0, "release_year"] == 0
+    assert row.loc[0, "description_len"] == 0
+    assert not math.isnan(row.loc[0, "brillo"])
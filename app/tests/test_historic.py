@@ -0,0 +1,27 @@
+import pandas as pd
+
+from transformation.historic import HistoricIndex
+
+COLS = ["dev_games", "dev_mean_reviews"]
+
+def _index():
+    df = pd.DataFrame({"id": [10, 20, 10], "dev_games": [3, 1, 99], "dev_mean_reviews": [0.8, 0.5, 0.0]})
+    return HistoricIndex.from_dataframe(df)
+
+def test_lookup():
+    index = _index()
+
+    assert index.lookup("20", COLS) == {"dev_games": 1, "dev_mean_reviews": 0.5}
+    assert index.lookup(20, ["dev_games"]) == {"dev_games": 1}
+    assert index.lookup("30", COLS) is None
+
+def test_repeated_ids_keep_the_first_row():
+    index = _index()
+
+    assert len(index) == 2
+    assert index.lookup("10", COLS) == {"dev_games": 3, "dev_mean_reviews": 0.8}
+
+def test_contains():
+    index = _index()
+
+    assert "10" in index and 10 in index and "30" not in index
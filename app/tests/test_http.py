@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+
+from utils import http
+from utils.http import DownloadTimeoutError, ResponseTooLargeError, UpstreamClient
+
+URL = "https://store.steampowered.com/api/appdetails"
+
+@pytest.fixture
+def delays(monkeypatch):
+    delays = []
+    async def _sleep(seconds):
+        delays.append(seconds)
+    monkeypatch.setattr(http.asyncio, "sleep", _sleep)
+    return delays
+
+def _client(handler, **kwargs):
+    client = UpstreamClient(**kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def _run(client, coro):
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await client.aclose()
+    return asyncio.run(_main())
+
+def _responses(*responses):
+    responses = list(responses)
+    calls = []
+    def _handler(request):
+        calls.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    return _handler, calls
+
+def test_retries_5xx_until_success(delays):
+    handler, calls = _responses(httpx.Response(503), httpx.Response(502), httpx.Response(200, json={"ok": True}))
+    client = _client(handler, max_retries=3, backoff_base=1, backoff_max=10)
+
+    response = _run(client, client.get(URL, params={"appids": 10}))
+
+    assert response.json() == {"ok": True}
+    assert len(calls) == 3 and calls[0].url.params["appids"] == "10"
+    assert client.retries == 2
+    # Backoff exponencial con jitter: [base/2, base] y [base, 2 * base]
+    assert 0.5 <= delays[0] <= 1 and 1 <= delays[1] <= 2
+
+def test_honours_retry_after_up_to_backoff_max(delays):
+    handler, _ = _responses(httpx.Response(429, headers={"Retry-After": "3"}),
+                            httpx.Response(429, headers={"Retry-After": "120"}), httpx.Response(200))
+    client = _client(handler, backoff_max=10)
+
+    assert _run(client, client.get(URL)).status_code == 200
+    assert delays == [3, 10]
+
+def test_client_errors_are_not_retried(delays):
+    handler, calls = _responses(httpx.Response(404))
+    client = _client(handler)
+
+    assert _run(client, client.get(URL)).status_code == 404
+    assert len(calls) == 1 and delays == []
+
+def test_returns_last_response_after_max_retries(delays):
+    handler, calls = _responses(*[httpx.Response(500) for _ in range(3)])
+    client = _client(handler, max_retries=2)
+
+    assert _run(client, client.get(URL)).status_code == 500
+    assert len(calls) == 3 and len(delays) == 2
+
+def test_reraises_network_errors(delays):
+    handler, calls = _responses(httpx.ConnectError("caído"), httpx.ConnectError("caído"))
+    client = _client(handler, max_retries=1)
+
+    with pytest.raises(httpx.ConnectError):
+        _run(client, client.get(URL))
+    assert len(calls) == 2
+
+def test_recovers_from_network_errors(delays):
+    handler, _ = _responses(httpx.ReadTimeout("lento"), httpx.Response(200))
+    client = _client(handler)
+
+    assert _run(client, client.get(URL)).status_code == 200
+
+def test_limits_concurrency_per_host():
+    active, peak = 0, 0
+    async def _handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200)
+    client = _client(_handler, max_per_host=2)
+
+    async def _many():
+        return await asyncio.gather(*(client.get(URL) for _ in range(6)))
+
+    assert all(r.status_code == 200 for r in _run(client, _many()))
+    assert peak == 2
+
+def test_total_download_deadline_is_not_retried():
+    calls = []
+    async def _handler(request):
+        calls.append(request)
+        await asyncio.sleep(1)
+        return httpx.Response(200, content=b"imagen")
+    client = _client(_handler, max_retries=3)
+
+    with pytest.raises(DownloadTimeoutError):
+        _run(client, client.get_bytes(URL, max_bytes=1024, timeout=0.05))
+    assert len(calls) == 1 and client.retries == 0
+
+def test_get_bytes_caps_the_body(delays):
+    handler, calls = _responses(httpx.Response(200, content=b"x" * 2048))
+    client = _client(handler)
+
+    with pytest.raises(ResponseTooLargeError):
+        _run(client, client.get_bytes(URL, max_bytes=1024, timeout=5))
+    assert len(calls) == 1
+
+def test_get_bytes(delays):
+    handler, _ = _responses(httpx.Response(503), httpx.Response(200, content=b"imagen"))
+    client = _client(handler)
+
+    assert _run(client, client.get_bytes(URL, max_bytes=1024, timeout=5)).content == b"imagen"
@@ -0,0 +1,83 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from extraction.clip import CLIP
+from utils.model_registry import ModelRegistry, ModelVersion
+
+@pytest.fixture
+def client():
+    # Sin el lifespan: no se carga ningún modelo ni se hace ninguna petición externa
+    main.app.state.models = ModelRegistry(60)
+    return TestClient(main.app)
+
+@pytest.fixture
+def no_downloads(monkeypatch):
+    async def _fail(*args, **kwargs):
+        raise AssertionError("No se tiene que descargar nada sin modelo")
+    monkeypatch.setattr(main, "cached_appdetails", _fail)
+    monkeypatch.setattr(main, "get_reviews_text", _fail)
+
+def test_stream_without_model_sends_error_event(client, no_downloads):
+    response = client.get("/api/predict/popularidad/stream", params={"appid": 730})
+
+    assert response.status_code == 200
+    assert response.text == 'event: error\ndata: {"error": "Modelo de popularidad no cargado"}\n\n'
+
+def test_reviews_without_model_returns_503(client, no_downloads, tmp_path):
+    main.app.state.models.register("reviews", tmp_path / "missing.pkl", optional=True)
+    main.app.state.models.load_all()
+
+    response = client.post("/api/predict/reviews", json={"appid": 730})
+
+    assert response.status_code == 503
+
+def test_health_ignores_missing_optional_models(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(type(CLIP), "is_ready", property(lambda self: True))
+    main.app.state.models.register("reviews", tmp_path / "missing.pkl", optional=True)
+    main.app.state.models.load_all()
+
+    response = client.get("/api/health")
+
+    assert response.status_code == 200
+    reviews = response.json()["models"]["reviews"]
+    assert reviews["ready"] is False and reviews["optional"] is True and reviews["error"]
+
+class _PriceModel:
+    def predict(self, matrix):
+        return matrix["x"].to_numpy()
+
+@pytest.fixture
+def price_model(client, monkeypatch, tmp_path):
+    registry = main.app.state.models
+    registry.register("precio", tmp_path / "precio.pkl")
+    registry._models["precio"] = ModelVersion("precio", _PriceModel(), "v1", tmp_path / "precio.pkl", 0)
+    main.app.state.http_client = None
+
+    async def _fetch(client, appid):
+        if appid == "20":
+            raise asyncio.TimeoutError()
+        if appid == "30":
+            raise ValueError("Juego sin datos")
+        return {"x": int(appid) // 10}
+    monkeypatch.setitem(main.BATCH_MODELS["precio"], "fetch_function", _fetch)
+    monkeypatch.setitem(main.BATCH_MODELS["precio"], "transform_function",
+                        lambda appid, inputs: pd.DataFrame([inputs]))
+
+def test_batch_reports_failing_appids(client, price_model):
+    response = client.post("/api/predict/precio/batch", json={"appids": [10, 20, 30, 40]})
+
+    assert response.status_code == 200
+    results = {item["appid"]: item for item in response.json()["results"]}
+    assert results[10]["value"] == main.PRICE_ORDER[1] and results[40]["value"] == main.PRICE_ORDER[4]
+    assert results[20] == {"appid": 20, "value": None, "error": "TimeoutError"}
+    assert results[30]["error"] == "Juego sin datos"
+    assert response.json()["model_version"] == "v1"
+
+def test_batch_without_registered_model_is_not_available(client):
+    response = client.post("/api/predict/popularidad/batch", json={"appids": [10]})
+
+    assert response.status_code == 404
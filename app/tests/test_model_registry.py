@@ -0,0 +1,100 @@
+import asyncio
+import os
+
+import joblib
+import pytest
+
+from utils.model_registry import ModelRegistry
+
+def _save(path, value):
+    joblib.dump({"value": value}, path)
+
+def _validate(model, recent):
+    if model["value"] < 0:
+        raise ValueError("versión no válida")
+
+def test_missing_required_model_stops_startup(tmp_path):
+    registry = ModelRegistry()
+    registry.register("precio", tmp_path / "precio.pkl")
+
+    with pytest.raises(FileNotFoundError):
+        registry.load_all()
+    assert registry.errors["precio"]
+
+def test_missing_optional_model_is_unavailable(tmp_path):
+    registry = ModelRegistry()
+    registry.register("precio", tmp_path / "precio.pkl")
+    registry.register("reviews", tmp_path / "reviews.pkl", optional=True)
+    _save(tmp_path / "precio.pkl", 1)
+
+    registry.load_all()
+
+    assert registry.get("precio").model == {"value": 1}
+    assert registry.get("reviews") is None
+    assert registry.status()["reviews"]["optional"] is True
+    assert registry.status()["reviews"]["error"]
+
+def test_optional_model_loads_when_its_file_appears(tmp_path):
+    registry = ModelRegistry()
+    registry.register("reviews", tmp_path / "reviews.pkl", optional=True)
+    registry.load_all()
+
+    _save(tmp_path / "reviews.pkl", 1)
+
+    assert asyncio.run(registry.check()) == ["reviews"]
+    assert registry.get("reviews").model == {"value": 1}
+    assert registry.status()["reviews"]["error"] is None
+
+def _touch(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_swaps_to_new_version_when_the_file_changes(tmp_path):
+    path = tmp_path / "precio.pkl"
+    _save(path, 1)
+    registry = ModelRegistry()
+    registry.register("precio", path, _validate)
+    registry.load_all()
+    first = registry.get("precio")
+
+    assert asyncio.run(registry.check()) == []
+
+    _save(path, 2)
+    _touch(path, path.stat().st_mtime_ns + 10**9)
+    assert asyncio.run(registry.check()) == ["precio"]
+
+    second = registry.get("precio")
+    assert second.model == {"value": 2} and second.version != first.version
+    # Quien ya tenía la versión anterior la sigue usando
+    assert first.model == {"value": 1}
+
+def test_keeps_previous_version_when_validation_fails(tmp_path):
+    path = tmp_path / "precio.pkl"
+    _save(path, 1)
+    registry = ModelRegistry()
+    registry.register("precio", path, _validate)
+    registry.load_all()
+    version = registry.get("precio").version
+
+    _save(path, -1)
+    _touch(path, path.stat().st_mtime_ns + 10**9)
+    assert asyncio.run(registry.check()) == []
+
+    assert registry.get("precio").version == version
+    assert registry.status()["precio"]["error"] == "versión no válida"
+    # El fichero que falla no se reintenta hasta que vuelva a cambiar
+    assert asyncio.run(registry.check()) == []
+
+def test_validation_receives_recent_inputs(tmp_path):
+    path = tmp_path / "precio.pkl"
+    _save(path, 1)
+    seen = []
+    registry = ModelRegistry(smoke_size=2)
+    registry.register("precio", path, lambda model, recent: seen.append(recent))
+    registry.load_all()
+    for inputs in ["a", "b", "c"]:
+        registry.remember("precio", inputs)
+
+    _touch(path, path.stat().st_mtime_ns + 10**9)
+    asyncio.run(registry.check())
+
+    assert seen == [[], ["b", "c"]]
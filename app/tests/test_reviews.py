@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+import pytest
+
+from transformation import reviews
+
+def test_stop_words_are_not_downloaded_in_the_request_path(monkeypatch):
+    monkeypatch.setattr(reviews, "_STOP_WORDS", None)
+    monkeypatch.setattr(reviews.nltk, "download", lambda *args, **kwargs: pytest.fail("Descarga en una petición"))
+
+    with pytest.raises(RuntimeError):
+        reviews.clean_text_stem("a great game")
+
+def test_load_stop_words_fails_fast(monkeypatch):
+    def _missing(language):
+        raise LookupError(language)
+    monkeypatch.setattr(reviews, "_STOP_WORDS", None)
+    monkeypatch.setattr(reviews, "stopwords", SimpleNamespace(words=_missing))
+    monkeypatch.setattr(reviews.nltk, "download", lambda *args, **kwargs: False)
+
+    with pytest.raises(RuntimeError):
+        reviews.load_stop_words()
+
+def test_load_stop_words(monkeypatch):
+    monkeypatch.setattr(reviews, "_STOP_WORDS", None)
+    monkeypatch.setattr(reviews, "stopwords", SimpleNamespace(words=lambda language: ["the", "a"]))
+
+    assert reviews.load_stop_words() == {"the", "a"}
+    assert reviews.clean_text_stem("the games") == "game"
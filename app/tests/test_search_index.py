@@ -0,0 +1,85 @@
+import asyncio
+import gzip
+import json
+import os
+
+from utils.catalog import CatalogWatcher, load_catalog
+from utils.search_index import SearchIndex, normalize
+
+GAMES = [
+    {"appid": 1, "name": "Portal", "players": 50},
+    {"appid": 2, "name": "Portal 2", "players": 80},
+    {"appid": 3, "name": "Pokémon Portals", "players": 10},
+    {"appid": 4, "name": "Hollow Knight", "players": 60},
+    {"appid": 5, "name": "Counter-Strike 2", "players": 100},
+]
+
+def _index():
+    return SearchIndex(GAMES, lambda game: game["players"])
+
+def _appids(results):
+    return [game["appid"] for game in results]
+
+def test_normalize():
+    assert normalize("  Pokémon: Édition Spéciale! ") == "pokemon edition speciale"
+    assert normalize("Counter-Strike 2") == "counter strike 2"
+
+def test_results_are_ordered_by_popularity():
+    assert _appids(_index().search("portal")) == [2, 1, 3]
+
+def test_short_queries_use_the_gram_list():
+    assert _appids(_index().search("2")) == [5, 2]
+    assert _appids(_index().search("kni")) == [4]
+
+def test_matches_substrings_across_words_and_accents():
+    assert _appids(_index().search("counter strike")) == [5]
+    assert _appids(_index().search("POKEMON")) == [3]
+    assert _appids(_index().search("low kni")) == [4]
+
+def test_limit_and_no_results():
+    assert _appids(_index().search("portal", k=2)) == [2, 1]
+    assert _index().search("zelda") == []
+    assert _index().search("portalx") == []
+
+def test_empty_query_returns_the_most_popular():
+    assert _appids(_index().search("", k=3)) == [5, 2, 4]
+
+def test_get_by_appid():
+    index = _index()
+
+    assert index.get(4)["name"] == "Hollow Knight"
+    assert index.get(99) is None
+    assert len(index) == 5
+
+def _write_catalog(path, names):
+    records = [{"id": str(i), "appdetails": {"name": name, "price_overview": {"final": 999}},
+                "appreviewhistogram": {"rollups": {"recommendations_up": i}}} for i, name in enumerate(names, 1)]
+    # Registro sin nombre y registro repetido: se descartan
+    records += [{"id": "99", "appdetails": {}}, records[0]]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+def test_load_catalog(tmp_path):
+    path = tmp_path / "games_info.jsonl.gz"
+    _write_catalog(path, ["Portal", "Portal 2"])
+
+    games = load_catalog(path)
+
+    assert [game["name"] for game in games] == ["Portal", "Portal 2"]
+    assert games[1]["price"] == 9.99 and games[1]["positive_reviews"] == 2
+
+def test_catalog_watcher_reloads_when_the_file_changes(tmp_path):
+    path = tmp_path / "games_info.jsonl.gz"
+    watcher = CatalogWatcher(path)
+    loaded = []
+    watcher.subscribe(lambda games: loaded.append([game["name"] for game in games]))
+
+    assert asyncio.run(watcher.check()) is False
+    _write_catalog(path, ["Portal"])
+    assert asyncio.run(watcher.check()) is True
+    assert asyncio.run(watcher.check()) is False
+
+    _write_catalog(path, ["Portal", "Hollow Knight"])
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    assert asyncio.run(watcher.check()) is True
+    assert loaded == [["Portal"], ["Portal", "Hollow Knight"]]
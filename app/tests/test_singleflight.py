@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from utils.cache import SingleFlight, TTLCache, cached
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def _factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def _main():
+        results = await asyncio.gather(*(flight.do("a", _factory) for _ in range(5)))
+        return results, len(flight)
+
+    results, inflight = asyncio.run(_main())
+    assert results == [1] * 5 and calls == 1
+    assert inflight == 0
+
+def test_different_keys_run_separately():
+    flight = SingleFlight("test")
+
+    async def _main():
+        return await asyncio.gather(flight.do("a", lambda: asyncio.sleep(0, "a")),
+                                    flight.do("b", lambda: asyncio.sleep(0, "b")))
+
+    assert asyncio.run(_main()) == ["a", "b"]
+
+def test_cancelling_one_caller_does_not_cancel_the_others():
+    flight = SingleFlight("test")
+
+    async def _factory():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def _main():
+        first = asyncio.create_task(flight.do("a", _factory))
+        second = asyncio.create_task(flight.do("a", _factory))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(_main()) == ("ok", True)
+
+def test_cached_fills_the_cache_once():
+    cache = TTLCache("test_cached_fill", ttl=None)
+    calls = 0
+
+    async def _factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    async def _main():
+        first = await asyncio.gather(*(cached(cache, "a", _factory) for _ in range(3)))
+        return first, await cached(cache, "a", _factory)
+
+    first, second = asyncio.run(_main())
+    assert first == [{"value": 1}] * 3 and second == {"value": 1}
+    assert calls == 1
+
+def test_cached_does_not_store_exceptions():
+    cache = TTLCache("test_cached_errors", ttl=None)
+    results = [ValueError("fallo"), "ok"]
+
+    async def _factory():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with pytest.raises(ValueError):
+        asyncio.run(cached(cache, "a", _factory))
+    assert asyncio.run(cached(cache, "a", _factory)) == "ok"
@@ -0,0 +1,31 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from extraction import steam
+from utils.embedding_store import CLIP_INPUT_SIZE
+
+def _encode(size, fmt="JPEG", color=(120, 60, 30)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+@pytest.mark.parametrize("fmt", ["JPEG", "PNG"])
+def test_load_image_decodes_near_clip_size(fmt):
+    img, brillo = steam._load_image(_encode((1840, 860), fmt))
+
+    assert img.mode == "RGB"
+    assert CLIP_INPUT_SIZE <= min(img.size) < 2 * CLIP_INPUT_SIZE
+    assert abs(brillo - 120) < 2
+
+def test_load_image_keeps_small_images():
+    img, _ = steam._load_image(_encode((300, 140)))
+
+    assert img.size == (300, 140)
+
+def test_load_image_rejects_huge_images(monkeypatch):
+    monkeypatch.setattr(steam.config, "IMAGE_MAX_PIXELS", 100 * 100)
+
+    with pytest.raises(ValueError):
+        steam._load_image(_encode((200, 200)))
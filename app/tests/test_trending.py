@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+from utils.trending import TrendingFeed, compute_trending
+
+def _game(appid, reviews_per_day=None, positive=10, negative=10):
+    game = {"appid": appid, "positive_reviews": positive, "negative_reviews": negative}
+    if reviews_per_day is not None:
+        game["reviews_per_day"] = reviews_per_day
+    return game
+
+def test_ranks_every_game_by_reviews_per_day():
+    # El juego sin histograma tiene muchas reseñas totales, pero no se compara con las reseñas por día
+    games = [_game(1, 5), _game(2, None, positive=10**6), _game(3, 50), _game(4, 0)]
+
+    assert [game["appid"] for game in compute_trending(games, 3)] == [3, 1, 2]
+
+def test_trend_compares_with_the_mean_ratio():
+    games = [_game(1, 2, positive=90, negative=10), _game(2, 1, positive=10, negative=90)]
+
+    trending = compute_trending(games, 2)
+
+    assert trending[0]["trend"] == "up" and trending[0]["change_percent"] == 40.0
+    assert trending[1]["trend"] == "down" and trending[1]["change_percent"] == 40.0
+
+def test_update_changes_payload_and_etag():
+    feed = TrendingFeed(size=2)
+    feed.update([_game(1, 5)])
+    payload, etag = feed.snapshot()
+
+    feed.update([_game(1, 5), _game(2, 10)])
+
+    assert feed.snapshot()[1] != etag
+    assert [game["appid"] for game in json.loads(feed.snapshot()[0])] == [2, 1]
+    assert [game["appid"] for game in json.loads(payload)] == [1]
+
+def test_periodic_refresh():
+    feed = TrendingFeed(size=2, interval=0.01)
+    games = [_game(1, 5)]
+    feed.update(games)
+
+    async def _main():
+        await feed.start()
+        games.append(_game(2, 10))
+        await asyncio.sleep(0.05)
+        await feed.stop()
+
+    asyncio.run(_main())
+    assert [game["appid"] for game in json.loads(feed.snapshot()[0])] == [2, 1]
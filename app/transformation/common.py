@@ -1,6 +1,8 @@
 """Módulo de transformación para la información de los juegos común entre precios y popularidad.
 """
 
+import datetime
+import numpy as np
 import pandas as pd
 
 def price_range(x : str) -> str:
@@ -21,42 +23,82 @@ def price_range(x : str) -> str:
     elif x >= 40:
         return '>40'
 
-def initial_transformations(game: dict, row : dict) -> pd.DataFrame: 
-    """Dado un juego (dict) extrae los campos: 
+class FeatureSpec:
+    """Especificación compilada de las columnas de un modelo.
 
-        - description_len
-        - price_overview
-        - price_range
-        - num_languages
-        - release_year
+    Fija el orden de las columnas y precalcula la posición de cada una, de manera que cada petición rellena
+    un vector de NumPy preasignado en vez de ir creando columnas de pandas. Las columnas de objetos (v_clip,
+    que contiene la lista del embedding) se guardan aparte y solo se juntan al crear el DataFrame que recibe
+    sklearn.
+
+    Args:
+        columns (list[str]): columnas en el orden que espera el modelo.
+        object_cols (tuple[str]): columnas que no son numéricas.
     """
-    # Descripción
-    row['description_len'] = len(game.get('short_description', ''))
+    def __init__(self, columns : list[str], object_cols : tuple = ("v_clip",)):
+        self.columns = list(columns)
+        self.numeric = [col for col in self.columns if col not in object_cols]
+        self.position = {col: i for i, col in enumerate(self.numeric)}
+        self.object_positions = [(self.columns.index(col), col) for col in object_cols if col in self.columns]
+
+    def positions(self, cols : list[str]) -> dict[str, int]:
+        """Posición en el vector numérico de cada una de las columnas."""
+        return {col: self.position[col] for col in cols}
 
-    # Precio
-    price_dict = game.get('price_overview', {})
-    price = price_dict.get('initial', 0) / 100 if isinstance(price_dict, dict) else 0
-    row['price_overview'] = price
-    row['price_range'] = price_range(price)
+    def new_row(self) -> np.ndarray:
+        return np.zeros(len(self.numeric), dtype=np.float64)
 
-    # Idiomas
-    row['num_languages'] = len(game.get('supported_languages', []))
+    def to_frame(self, values : np.ndarray, objects : dict) -> pd.DataFrame:
+        """DataFrame de una fila con las columnas en el orden del modelo (frontera con sklearn)."""
+        df = pd.DataFrame(values.reshape(1, -1), columns=self.numeric, copy=False)
+        for loc, col in self.object_positions:
+            df.insert(loc, col, [objects[col]])
+        return df
 
-    # Fecha
+
+def _release_year(release_date) -> int:
+    # release_date viene en formato YYYY-MM-DD (extraction.steam._format_date_string)
     try:
-        row['release_year'] = pd.to_datetime(game.get('release_date')).year
-    except Exception:
-        row['release_year'] = 0
+        return datetime.date.fromisoformat(release_date).year
+    except (TypeError, ValueError):
+        return 0
 
-    return row
+def fill_initial_features(row : np.ndarray, spec : FeatureSpec, game : dict) -> np.ndarray:
+    """Rellena en el vector de la fila los campos (si el modelo los usa):
 
-def add_img_info(row : pd.DataFrame, v_clip : list, brillo : float) -> pd.DataFrame:
-    """Añade a un dataframe los embeddins y el brillo de una imagen
+        - description_len
+        - price_overview
+        - num_languages
+        - release_year
     """
-    row['v_clip'] = [v_clip]
-    row['brillo'] = brillo
+    pos = spec.position
+    if 'description_len' in pos:
+        row[pos['description_len']] = len(game.get('short_description') or '')
+    if 'price_overview' in pos:
+        price_dict = game.get('price_overview', {})
+        row[pos['price_overview']] = price_dict.get('initial', 0) / 100 if isinstance(price_dict, dict) else 0
+    if 'num_languages' in pos:
+        row[pos['num_languages']] = len(game.get('supported_languages', []))
+    if 'release_year' in pos:
+        row[pos['release_year']] = _release_year(game.get('release_date'))
+    return row
+
+def fill_flags(row : np.ndarray, positions : dict[str, int], items : list) -> np.ndarray:
+    """Marca con 1 las columnas de los géneros / categorías (items de appdetails) del juego."""
+    for item in items or []:
+        if isinstance(item, dict):
+            idx = positions.get(item.get('description'))
+            if idx is not None:
+                row[idx] = 1
+    return row
 
+def fill_history(row : np.ndarray, positions : dict[str, int], historic_index, appid : str) -> np.ndarray:
+    """Variables históricas de developers y publishers (0 si el juego no está en el índice)."""
+    values = historic_index.lookup(appid, list(positions))
+    if values is not None:
+        for col, value in values.items():
+            row[positions[col]] = value
     return row
 
-if __name__ == '__name__':
+if __name__ == '__main__':
     pass
@@ -0,0 +1,48 @@
+"""Índice en memoria de historic_games_data para consultar las variables históricas de developers y publishers.
+
+El parquet se carga una sola vez al arrancar la aplicación en columnas contiguas de NumPy y un diccionario
+id -> posición de la fila, de manera que cada petición hace una búsqueda en tiempo constante sin crear
+objetos de pandas.
+"""
+
+import numpy as np
+import pandas as pd
+
+class HistoricIndex:
+    """Índice id -> fila sobre las columnas de historic_games_data.
+
+    Args:
+        ids (iterable): ids de los juegos en el orden de las filas.
+        columns (dict): nombre de columna -> np.ndarray con los valores de cada fila.
+    """
+    def __init__(self, ids, columns : dict[str, np.ndarray]):
+        self.columns = columns
+        self._offsets = {}
+        for offset, appid in enumerate(ids):
+            # Si hay ids repetidos nos quedamos con la primera fila
+            self._offsets.setdefault(str(appid), offset)
+
+    @classmethod
+    def from_dataframe(cls, df : pd.DataFrame) -> "HistoricIndex":
+        """Crea el índice a partir del DataFrame de historic_games_data."""
+        columns = {
+            col: np.ascontiguousarray(df[col].to_numpy())
+            for col in df.columns if col != 'id'
+        }
+        return cls(df['id'].to_numpy(), columns)
+
+    def lookup(self, appid : str, cols : list[str]) -> dict | None:
+        """Devuelve un diccionario columna -> valor del juego, o None si el juego no está en el índice."""
+        offset = self._offsets.get(str(appid))
+        if offset is None:
+            return None
+        return {col: self.columns[col][offset] for col in cols}
+
+    def __contains__(self, appid):
+        return str(appid) in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+if __name__ == '__main__':
+    pass
@@ -1,11 +1,14 @@
 """Módulo de transformación de datos para el problema de popularidad.
 
 Realiza las transformaciones necesarias para tener los mismos datos que necesita el modelo para predecir.
+La fila se rellena sobre un vector de NumPy (ver FeatureSpec) y solo se convierte a DataFrame al final.
 """
 
-import pandas as pd
+import math
 import numpy as np
-from transformation.common import  initial_transformations, add_img_info
+import pandas as pd
+from transformation.common import FeatureSpec, fill_initial_features, fill_flags, fill_history
+from transformation.historic import HistoricIndex
 
 GENRES = ['Action', 'Adventure', 'Casual', 'Early Access', 'Free To Play',
 'Indie', 'RPG', 'Simulation', 'Strategy']
@@ -24,66 +27,74 @@ HISTORY_COLS = [
     'ema_reviews_publishers', 'max_historico_reviews_publishers',
 ]
 
-def _transform_game_dict(game: dict, appid: str, historic_data: pd.DataFrame) -> pd.DataFrame:
-    """
-    Transforma un diccionario con información de un juego Steam
-    en una única fila de DataFrame lista para usar con el modelo.
-    """
-    row = {}
-    row = initial_transformations(game, row)
-
-    # Géneros
-    genres_list = [g['description'] for g in game.get('genres', []) if isinstance(g, dict)]
-    for genre in GENRES:
-        row[genre] = 1 if genre in genres_list else 0
-
-    # Categorías
-    categories_list = [c['description'] for c in game.get('categories', []) if isinstance(c, dict)]
-    for cat in CATEGORIES:
-        row[cat] = 1 if cat in categories_list else 0
-
-    # Datos históricos de Developers y Publishers
-    match = historic_data[historic_data['id'].astype(str) == str(appid)]
-    print(match)
-    if not match.empty:
-        hist_row = match.iloc[0]
-        for col in HISTORY_COLS:
-            row[col] = hist_row[col]
-    else:
-        for col in HISTORY_COLS:
-            row[col] = 0
-
-    return pd.DataFrame([row])
-
-def _transform_reviews(row : pd.DataFrame, appreviewshistogram : dict) -> pd.DataFrame:
-    """Dada una fila de dataFrame se le añade el campo de número de reviews totales.
+YT_STATS = ["viewCount", "likeCount", "commentCount", "favoriteCount"]
+
+YT_STAT_COLS = [f"video_{i}_video_statistics.{stat}" for i in range(4) for stat in YT_STATS]
+
+# Orden de las columnas que espera el modelo
+COLUMNS = (['description_len', 'price_overview', 'num_languages', 'release_year'] + GENRES + CATEGORIES
+           + HISTORY_COLS + ['v_clip', 'brillo', 'recomendaciones_totales'] + YT_STAT_COLS + ['yt_score'])
+
+SPEC = FeatureSpec(COLUMNS)
+GENRE_POSITIONS = SPEC.positions(GENRES)
+CATEGORY_POSITIONS = SPEC.positions(CATEGORIES)
+HISTORY_POSITIONS = SPEC.positions(HISTORY_COLS)
+# Posición de cada estadística de cada vídeo: YT_POSITIONS[i][stat]
+YT_POSITIONS = [{stat: SPEC.position[f"video_{i}_video_statistics.{stat}"] for stat in YT_STATS} for i in range(4)]
+
+# Máximo del yt_score sin normalizar del catálogo (yt_stats.parquet). En la transformación
+# (src/B_Transformacion/C_estadisticas_youtube.py) el yt_score se divide por este máximo, así que el de los
+# juegos que se buscan en la API también se divide para que esté en la misma escala [0, 1]
+YT_SCORE_MAX = None
+
+
+def set_yt_score_max(data : pd.DataFrame | None):
+    """Calcula YT_SCORE_MAX a partir de las estadísticas de yt_stats.parquet (None si no hay parquet)."""
+    global YT_SCORE_MAX
+    if data is None or data.empty:
+        YT_SCORE_MAX = None
+        return
+    def stat(i, name):
+        col = f"video_{i}_video_statistics.{name}"
+        if col not in data:
+            return np.zeros(len(data))
+        return np.nan_to_num(pd.to_numeric(data[col], errors="coerce").to_numpy(dtype=float))
+
+    score = np.zeros(len(data))
+    for i in range(4):
+        # Misma fórmula que _fill_yt_data (y que la transformación)
+        score += (0.5 * np.log10(stat(i, "viewCount") + 1) + 0.3 * np.log10(stat(i, "likeCount") + 1)
+                  + 0.2 * np.log10(stat(i, "commentCount") + 1))
+    max_score = float(score.max())
+    YT_SCORE_MAX = max_score if max_score > 0 else None
+
+
+def _to_int(value) -> int:
+    """Estadística de YouTube (la API las devuelve como texto) a entero. Los valores no numéricos valen 0."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return int(value) if math.isfinite(value) else 0
+
+def _fill_reviews(row, appreviewshistogram : dict):
+    """Añade a la fila el número de reviews totales (NaN si no hay histograma).
     """
     rollups = appreviewshistogram.get("rollups") if isinstance(appreviewshistogram, dict) else None
 
     if isinstance(rollups, dict):
         rec_up   = rollups.get("recommendations_up",   0) or 0
         rec_down = rollups.get("recommendations_down", 0) or 0
-        row["recomendaciones_totales"] = rec_up + rec_down
+        row[SPEC.position["recomendaciones_totales"]] = rec_up + rec_down
     else:
-        row["recomendaciones_totales"] = None
+        row[SPEC.position["recomendaciones_totales"]] = math.nan
 
     return row
 
-def _transform_yt_data(row: pd.DataFrame, yt_data: dict) -> pd.DataFrame:
+def _fill_yt_data(row, yt_data: dict):
     """
-    Dada una fila de dataFrame obtiene todas las columnas de la información de YouTube.
-    Añade las métricas por vídeo (viewCount, likeCount, commentCount) y yt_score.
+    Añade a la fila las métricas por vídeo (viewCount, likeCount, commentCount, favoriteCount) y yt_score.
     """
-    YT_STAT_COLS = [
-        f"video_{i}_video_statistics.{stat}"
-        for i in range(4)
-        for stat in ["viewCount", "likeCount", "commentCount", "favoriteCount"]
-    ]
-
-    for col in YT_STAT_COLS:
-        row[col] = 0
-    row["yt_score"] = 0
-
     if not isinstance(yt_data, dict):
         return row
 
@@ -92,36 +103,41 @@ def _transform_yt_data(row: pd.DataFrame, yt_data: dict) -> pd.DataFrame:
         return row
 
     score_total = 0
-    encontrado_alguna_metrica = False
 
     for i, video in enumerate(video_statistics[:4]):
         if not isinstance(video, dict):
             continue
 
         stats = video.get("video_statistics", {}) or {}
+        values = {stat: _to_int(stats.get(stat, 0)) for stat in YT_STATS}
+        for stat, idx in YT_POSITIONS[i].items():
+            row[idx] = values[stat]
 
-        for stat in ["viewCount", "likeCount", "commentCount", "favoriteCount"]:
-            val = pd.to_numeric(stats.get(stat, 0), errors="coerce")
-            row[f"video_{i}_video_statistics.{stat}"] = int(np.nan_to_num(val))
-
-        v = row[f"video_{i}_video_statistics.viewCount"]
-        l = row[f"video_{i}_video_statistics.likeCount"]
-        c = row[f"video_{i}_video_statistics.commentCount"]
+        v = values["viewCount"]
+        l = values["likeCount"]
+        c = values["commentCount"]
 
+        # Si no hay ninguna métrica el vídeo suma 0
         if v > 0 or l > 0 or c > 0:
-            encontrado_alguna_metrica = True
             score_total += (
-                0.5 * np.log10(v + 1) +
-                0.3 * np.log10(l + 1) +
-                0.2 * np.log10(c + 1)
+                0.5 * math.log10(v + 1) +
+                0.3 * math.log10(l + 1) +
+                0.2 * math.log10(c + 1)
             )
 
-    row["yt_score"] = score_total if encontrado_alguna_metrica else 0
+    # Misma normalización que yt_stats.parquet (si no hay parquet no se conoce el máximo)
+    if YT_SCORE_MAX is not None:
+        score_total /= YT_SCORE_MAX
+    row[SPEC.position["yt_score"]] = score_total
+
+    # Si los datos vienen de yt_stats.parquet se usa el yt_score ya calculado en la transformación
+    if yt_data.get("yt_score") is not None:
+        row[SPEC.position["yt_score"]] = yt_data["yt_score"]
     return row
 
 def transform_for_popularity(game: dict,
                             appid: str, 
-                            historic_data: pd.DataFrame, 
+                            historic_index: HistoricIndex, 
                             v_clip: list, 
                             brillo: float, 
                             appreviewshistogram : dict,
@@ -161,10 +177,15 @@ def transform_for_popularity(game: dict,
       dtype='str')
     """
     
-    row = _transform_game_dict(game, appid, historic_data)
-    row = add_img_info(row, v_clip, brillo)
-    row = _transform_reviews(row, appreviewshistogram)
-    row = _transform_yt_data(row, yt_data)
-    row.drop(columns=['price_range'], inplace=True)
-    return row
+    row = SPEC.new_row()
+    fill_initial_features(row, SPEC, game)
+    fill_flags(row, GENRE_POSITIONS, game.get('genres'))
+    fill_flags(row, CATEGORY_POSITIONS, game.get('categories'))
+    # Datos históricos de Developers y Publishers (búsqueda O(1) en el índice cargado al arrancar)
+    fill_history(row, HISTORY_POSITIONS, historic_index, appid)
+    row[SPEC.position['brillo']] = brillo
+    _fill_reviews(row, appreviewshistogram)
+    _fill_yt_data(row, yt_data)
+
+    return SPEC.to_frame(row, {'v_clip': v_clip})
 
@@ -1,11 +1,12 @@
 """Módulo de transformación de datos para el problema de precios.
 
 Realiza las transformaciones necesarias para tener los mismos datos que necesita el modelo para predecir.
+La fila se rellena sobre un vector de NumPy (ver FeatureSpec) y solo se convierte a DataFrame al final.
 """
 
 import pandas as pd
-import numpy as np
-from transformation.common import  initial_transformations, add_img_info
+from transformation.common import FeatureSpec, fill_initial_features, fill_flags, fill_history
+from transformation.historic import HistoricIndex
 
 # Define exactamente el orden de las columnas que espera el modelo (Lista 1)
 UNPROCESSED_COLUMNS = [
@@ -41,39 +42,12 @@ HISTORY_COLS = [
     'ema_precio_publishers', 'max_historico_precio_publishers',
 ]
 
-def _transform_game_dict(game: dict, appid : str, historic_data : pd.DataFrame) -> pd.DataFrame:
-    """
-    Transforma un diccionario con información de un juego Steam
-    en una única fila de DataFrame lista para usar con el modelo.
-    """
-    row = {}
-    row = initial_transformations(game, row)
-
-    # Géneros 
-    genres_list = [g['description'] for g in game.get('genres', []) if isinstance(g, dict)]
-    for genre in GENRES:
-        row[genre] = 1 if genre in genres_list else 0
-    
-    # Categorías
-    categories_list = [c['description'] for c in game.get('categories', []) if isinstance(c, dict)]
-    for cat in CATEGORIES:
-        row[cat] = 1 if cat in categories_list else 0
-
-    # Datos históricos de Developers y Publishers
-    match = historic_data[historic_data['id'].astype(str) == str(appid)]
-    print(match)
-    if not match.empty:
-        hist_row = match.iloc[0]
-        for col in HISTORY_COLS:
-            row[col] = hist_row[col]
-    else:
-        for col in HISTORY_COLS:
-            row[col] = 0  
-            
-
-    return pd.DataFrame([row])
+SPEC = FeatureSpec(UNPROCESSED_COLUMNS)
+GENRE_POSITIONS = SPEC.positions(GENRES)
+CATEGORY_POSITIONS = SPEC.positions(CATEGORIES)
+HISTORY_POSITIONS = SPEC.positions(HISTORY_COLS)
 
-def transform_for_prices(game : dict, appid : str, historic_data : pd.DataFrame, v_clip : list, brillo : float) -> pd.DataFrame:
+def transform_for_prices(game : dict, appid : str, historic_index : HistoricIndex, v_clip : list, brillo : float) -> pd.DataFrame:
     """Dados los datos en crudo de la extracción de datos los transforma a dataFrame con las columnas necesarias para que el modelo pueda
     hacer un predict.
 
@@ -92,10 +66,15 @@ def transform_for_prices(game : dict, appid : str, historic_data : pd.DataFrame,
        'ema_precio_publishers', 'max_historico_precio_publishers', 'brillo',
        'v_clip'],
     """
-    row = _transform_game_dict(game, appid, historic_data)
-    row = add_img_info(row ,v_clip, brillo)
+    row = SPEC.new_row()
+    fill_initial_features(row, SPEC, game)
+    fill_flags(row, GENRE_POSITIONS, game.get('genres'))
+    fill_flags(row, CATEGORY_POSITIONS, game.get('categories'))
+    # Datos históricos de Developers y Publishers (búsqueda O(1) en el índice cargado al arrancar)
+    fill_history(row, HISTORY_POSITIONS, historic_index, appid)
+    row[SPEC.position['brillo']] = brillo
 
-    return row[UNPROCESSED_COLUMNS]
+    return SPEC.to_frame(row, {'v_clip': v_clip})
 
 if __name__ == '__main__': 
     pass
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""Módulo de transformación y predicción del sentimiento de las reseñas.
+
+La limpieza es la misma que se aplicó a los datos de entrenamiento del modelo:
+    - src/B_Transformacion/D2_limpieza_reviews.py (limpieza_inicial y limpieza_final)
+    - src/D_Modelos/Reviews/utils/preprocesamiento.py (clean_text_stem)
+Si cambia alguna de ellas hay que cambiarla también aquí.
+
+Todas las reseñas de una petición se predicen con una única llamada a predict_proba: el TF-IDF genera una
+matriz dispersa con todas ellas y la regresión logística la evalúa de una vez.
+"""
+import re
+import unicodedata
+import nltk
+import numpy as np
+from nltk.stem import PorterStemmer
+from nltk.corpus import stopwords
+from unidecode import unidecode
+
+# Umbrales de probabilidad de reseña positiva de cada categoría (de mayor a menor)
+SENTIMENT_BINS = [
+    ("very_positive", 0.8),
+    ("positive", 0.6),
+    ("mixed", 0.4),
+    ("negative", 0.2),
+    ("very_negative", 0.0),
+]
+
+_STEMMER = PorterStemmer()
+_STOP_WORDS = None
+
+
+def load_stop_words() -> set:
+    """Carga las stopwords de NLTK. Se llama al arrancar la aplicación: si no están instaladas (la imagen
+    las descarga al construirse) se descargan una vez y, si tampoco se puede, el arranque falla aquí en vez
+    de en la primera petición."""
+    global _STOP_WORDS
+    try:
+        _STOP_WORDS = set(stopwords.words("english"))
+    except LookupError:
+        if not nltk.download("stopwords", quiet=True):
+            raise RuntimeError("No se han podido descargar las stopwords de NLTK")
+        _STOP_WORDS = set(stopwords.words("english"))
+    return _STOP_WORDS
+
+def _stop_words() -> set:
+    if _STOP_WORDS is None:
+        raise RuntimeError("Stopwords de NLTK no cargadas: hay que llamar a load_stop_words al arrancar")
+    return _STOP_WORDS
+
+def limpieza_inicial(texto : str) -> str:
+    """Elimina enlaces y texto entre corchetes (markdown)."""
+    texto = re.sub(r'http\S+', "", texto)
+    texto = re.sub(r"\[.*?\]", "", texto)
+    texto = " ".join(texto.split())
+    return texto.strip()
+
+def limpieza_final(texto : str) -> str:
+    """Normaliza el texto: caracteres raros, acentos, ruido y minúsculas."""
+    texto = unicodedata.normalize('NFKC', texto)
+    texto = unidecode(texto)
+    texto = re.sub(r'[^a-zA-Z0-9\s.,!?"\'()$%;\-&/]', ' ', texto)
+    texto = " ".join(texto.split())
+    return texto.lower().strip()
+
+def clean_text_stem(text : str) -> str:
+    """Se queda solo lo que es texto, quitando stopwords y aplicando stemming"""
+    stop_words = _stop_words()
+    text = re.sub(r"[^a-z\s]", "", text)
+    return " ".join(_STEMMER.stem(word) for word in text.split() if word not in stop_words)
+
+def transform_reviews(texts : list[str]) -> list[str]:
+    return [clean_text_stem(limpieza_final(limpieza_inicial(text))) for text in texts]
+
+def predict_sentiment(model, texts : list[str]) -> dict:
+    """Predice el sentimiento de todas las reseñas con una única llamada al modelo.
+
+    Returns:
+        dict: ratio de reseñas positivas, confianza media del modelo y distribución de las reseñas por
+        categoría de sentimiento.
+    """
+    positive_idx = list(model.classes_).index(1)
+    proba = model.predict_proba(transform_reviews(texts))[:, positive_idx]
+
+    distribution = {}
+    remaining = np.ones(len(proba), dtype=bool)
+    for name, threshold in SENTIMENT_BINS:
+        in_bin = remaining & (proba >= threshold)
+        distribution[name] = round(float(in_bin.mean()), 2)
+        remaining &= ~in_bin
+
+    return {
+        "ratio": round(float((proba >= 0.5).mean()), 2),
+        "confidence": round(float(np.maximum(proba, 1 - proba).mean()), 2),
+        "sentiment_distribution": distribution,
+    }
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,155 @@
+"""Caché en memoria con TTL y expulsión LRU para las consultas a APIs externas.
+
+Cada fuente (appdetails, histograma, YouTube, imágenes) tiene su propia instancia con su TTL y su límite
+de memoria, y lleva la cuenta de aciertos y fallos.
+
+Además, las peticiones concurrentes de una misma clave se agrupan (single-flight): si un valor ya se está
+calculando, el resto de peticiones esperan a ese cálculo en vez de repetir la llamada a la API.
+"""
+import asyncio
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+from utils.metrics import SINGLEFLIGHT_SHARED
+
+_MISSING = object()
+
+
+def _approx_size(obj : Any) -> int:
+    """Estimación (aproximada) de los bytes que ocupa un objeto y su contenido."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_approx_size(k) + _approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_approx_size(x) for x in obj)
+    return size
+
+
+class TTLCache:
+    """Caché clave-valor con tiempo de vida por entrada, expulsión LRU y límite de memoria.
+
+    Args:
+        name (str): nombre de la caché (para estadísticas).
+        ttl (float | None): segundos de vida de una entrada. None si no caduca.
+        max_entries (int): número máximo de entradas.
+        max_bytes (int): memoria máxima aproximada que pueden ocupar los valores.
+    """
+    def __init__(self, name : str, ttl : float | None, max_entries : int = 1024, max_bytes : int = 64 * 1024 * 1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._data = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key : Any, default : Any = None) -> Any:
+        """Devuelve el valor de la clave si existe y no ha caducado, en otro caso default."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def set(self, key : Any, value : Any) -> None:
+        """Guarda un valor, expulsando las entradas menos usadas si se superan los límites."""
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Estadísticas de uso de la caché."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def _remove(self, key : Any) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SingleFlight:
+    """Agrupa las llamadas concurrentes con la misma clave en una sola ejecución.
+
+    La función se ejecuta en una tarea aparte, de manera que si la petición que la lanzó se cancela (por
+    ejemplo, porque el cliente se desconecta) el resto de peticiones que la esperan no se ven afectadas.
+
+    Args:
+        name (str): nombre (para métricas).
+    """
+    def __init__(self, name : str):
+        self.name = name
+        self._inflight = {}  # key -> asyncio.Task
+
+    async def do(self, key : Any, factory : Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            SINGLEFLIGHT_SHARED.inc(name=self.name)
+        return await asyncio.shield(task)
+
+    def __len__(self):
+        return len(self._inflight)
+
+
+_FLIGHTS = {}  # nombre de la caché -> SingleFlight
+
+async def cached(cache : TTLCache, key : Any, factory : Callable[[], Awaitable[Any]]) -> Any:
+    """Devuelve el valor cacheado para key o lo calcula con factory() y lo guarda.
+
+    Si otra petición ya está calculando el valor de key, se espera a su resultado.
+    Las excepciones no se cachean: si factory falla, la siguiente llamada lo vuelve a intentar.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    async def _fill():
+        value = await factory()
+        cache.set(key, value)
+        return value
+
+    flight = _FLIGHTS.setdefault(cache.name, SingleFlight(cache.name))
+    return await flight.do(key, _fill)
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,106 @@
+"""Módulo de lectura del catálogo de juegos (games_info.jsonl.gz) para la aplicación web.
+
+Convierte cada registro de la extracción (script B) en la información básica que muestra la web y vigila
+el fichero para que los índices que dependen de él se reconstruyan en segundo plano cuando cambia.
+"""
+import asyncio
+import gzip
+import json
+from pathlib import Path
+from typing import Callable
+
+
+def _game_from_record(record : dict) -> dict | None:
+    """Información básica de un juego (mismos campos que GameInfo) a partir de un registro del script B."""
+    appdetails = record.get("appdetails") or {}
+    name = appdetails.get("name")
+    if not name:
+        return None
+
+    price_overview = appdetails.get("price_overview") or {}
+    rollups = (record.get("appreviewhistogram") or {}).get("rollups") or {}
+    developers = appdetails.get("developers") or [""]
+
+    return {
+        "appid": int(record["id"]),
+        "name": name,
+        "banner_url": appdetails.get("header_url") or "",
+        "release_date": appdetails.get("release_date") or "",
+        "developer": developers[0],
+        "genres": [g["description"] for g in appdetails.get("genres") or [] if isinstance(g, dict)],
+        "price": price_overview.get("final", 0) / 100,
+        "positive_reviews": rollups.get("recommendations_up", 0),
+        "negative_reviews": rollups.get("recommendations_down", 0),
+        "reviews_per_day": rollups.get("total_recommendations_per_day", 0),
+    }
+
+def load_catalog(path : Path) -> list[dict]:
+    """Lee el catálogo de juegos. Los registros sin nombre o repetidos se descartan."""
+    games = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                game = _game_from_record(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue
+            if game is not None:
+                games.setdefault(game["appid"], game)
+    return list(games.values())
+
+
+class CatalogWatcher:
+    """Vigila la fecha de modificación del catálogo y, cuando cambia, lo vuelve a leer en un hilo aparte y
+    llama a los callbacks con la lista de juegos.
+
+    Args:
+        path (Path): ruta del catálogo.
+        interval (float): segundos entre comprobaciones.
+    """
+    def __init__(self, path : Path, interval : float = 60):
+        self.path = Path(path)
+        self.interval = interval
+        self.callbacks = []
+        self._mtime = None
+        self._task = None
+
+    def subscribe(self, callback : Callable[[list[dict]], None]):
+        self.callbacks.append(callback)
+
+    async def check(self) -> bool:
+        """Recarga el catálogo si ha cambiado. Devuelve True si se ha recargado."""
+        if not self.path.exists():
+            return False
+        mtime = self.path.stat().st_mtime
+        if mtime == self._mtime:
+            return False
+        games = await asyncio.to_thread(load_catalog, self.path)
+        self._mtime = mtime
+        for callback in self.callbacks:
+            await asyncio.to_thread(callback, games)
+        print(f"Catálogo cargado: {len(games)} juegos")
+        return True
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Error recargando el catálogo: {e}")
+            await asyncio.sleep(self.interval)
+
+if __name__ == '__main__':
+    pass
@@ -1,4 +1,5 @@
 import pandas as pd
+from os import environ
 import numpy as np 
 from sklearn.cluster import KMeans
 from pathlib import Path
@@ -18,7 +19,76 @@ def project_root():
 HISTORIC_GAMES_DATA_PATH = project_root() / "data/processed/historic_games_data.parquet"
 POPULARITY_DATA_PATH = project_root() / "data/processed/popularidad.parquet"
 PRICES_DATA_PATH = project_root() / "data/processed/precios.parquet"
+YT_STATS_DATA_PATH = project_root() / "data/processed/yt_stats.parquet"
 PRICE_MODEL_PATH = project_root() / "models/precios/knncompleteclusters.pkl"
+REVIEWS_MODEL_PATH = project_root() / "models/reviews/logistic_regression_optuna.pkl"
+
+# Segundos entre comprobaciones de los ficheros de los modelos (recarga en caliente)
+MODELS_POLL_SECONDS = 30
+IMAGES_PATH = project_root() / "data/images"
+# Catálogo de juegos (salida del script B) para la búsqueda
+CATALOG_PATH = project_root() / "data/raw/games_info.jsonl.gz"
+# Almacén de embeddings CLIP que escribe el script E de extracción
+CLIP_STORE_PATH = project_root() / "data/processed/clip_store"
+# Segundos entre lecturas de las filas nuevas del almacén de embeddings
+CLIP_STORE_POLL_SECONDS = 60
+
+# Url de la cabecera de un juego a partir de su appid
+HEADER_IMAGE_URL = "https://shared.cloudflare.steamstatic.com/store_item_assets/steam/apps/{appid}/header.jpg"
+
+# URLs base de las APIs externas. Con las variables de entorno se puede apuntar la aplicación al servidor de
+# réplica (benchmark/replay_server.py) para hacer benchmarks sin llamar a Steam ni a YouTube
+STEAM_STORE_URL = environ.get("STEAM_STORE_URL", "https://store.steampowered.com")
+YOUTUBE_API_URL = environ.get("YOUTUBE_API_URL")  # url base completa (.../youtube/v3/). None: API real
+REPLAY_DATA_PATH = project_root() / "data/replay"
+
+# Modelo CLIP para los embeddings de las imágenes
+CLIP_MODEL_NAME = "clip-ViT-B-32"
+# Backend de inferencia de CLIP: 'fp32' (por defecto) o 'int8' (cuantización dinámica en CPU)
+CLIP_BACKEND = environ.get("CLIP_BACKEND", "fp32")
+
+# Micro-batching de CLIP: máximo de imágenes por batch y milisegundos que se espera a juntar imágenes
+CLIP_BATCH_SIZE = 16
+CLIP_BATCH_WAIT_MS = 5
+
+# Cliente HTTP de las APIs externas: timeout (segundos), peticiones simultáneas por host y reintentos
+# con backoff exponencial (segundos) ante errores de red y respuestas 429/5xx
+HTTP_TIMEOUT = 10
+HTTP_MAX_PER_HOST = 8
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_MAX = 10
+
+# Descarga de imágenes: tamaño máximo (bytes), tiempo máximo total (segundos) y píxeles máximos a decodificar
+IMAGE_MAX_BYTES = 5 * 1024 * 1024
+IMAGE_DOWNLOAD_TIMEOUT = 5
+IMAGE_MAX_PIXELS = 40_000_000
+
+# Búsqueda: segundos entre comprobaciones de cambios en el catálogo y máximo de resultados por búsqueda
+CATALOG_POLL_SECONDS = 60
+SEARCH_MAX_RESULTS = 50
+
+# Trending: número de juegos del listado y segundos que los clientes pueden cachearlo
+TRENDING_SIZE = 10
+TRENDING_MAX_AGE = 60
+# Segundos entre recálculos periódicos del listado trending (además de cada vez que cambia el catálogo)
+TRENDING_REFRESH_SECONDS = 300
+
+# Predicción en batch: número máximo de juegos por petición y de juegos descargándose a la vez
+BATCH_MAX_APPIDS = 500
+BATCH_CONCURRENCY = 16
+
+# Caché de las APIs externas: tiempo de vida (segundos, None = no caduca) y memoria máxima (bytes) por fuente.
+# Las imágenes se cachean por url de la cabecera, que cambia (?t=...) cuando Steam actualiza la imagen.
+APPDETAILS_CACHE_TTL = 6 * 3600
+HISTOGRAM_CACHE_TTL = 3600
+YOUTUBE_CACHE_TTL = 24 * 3600
+IMAGE_CACHE_TTL = None
+
+APPDETAILS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+HISTOGRAM_CACHE_MAX_BYTES = 8 * 1024 * 1024
+YOUTUBE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 def load_env_file():
     """Carga el archivo .env si existe en la raíz del proyecto."""
@@ -45,3 +115,19 @@ def read_historic_games_data():
         raise FileNotFoundError("Historic games data file not found")
     print('Data read correctly')
     return data
+
+def read_yt_stats_data():
+    """Lee el parquet con las estadísticas de YouTube de los juegos ya extraídos (yt_stats.parquet).
+    Si no existe devuelve None y las estadísticas se buscan siempre en la API.
+    """
+    print(f'Reading data from {YT_STATS_DATA_PATH}')
+    try:
+        data = pd.read_parquet(YT_STATS_DATA_PATH)
+    except FileNotFoundError:
+        print('YouTube stats file not found')
+        return None
+    stat_cols = [col for col in data.columns if "video_statistics" in col]
+    data[stat_cols] = data[stat_cols].fillna(0).astype("int64")
+    data["id"] = data["id"].astype(str)
+    print('Data read correctly')
+    return data
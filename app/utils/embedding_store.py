@@ -0,0 +1,208 @@
+"""
+Módulo con el almacén persistente de embeddings de imágenes (CLIP).
+
+Los vectores se guardan en una matriz float32 de ancho fijo en un fichero binario que se lee mediante
+memory-map, y a su lado un índice jsonl con una línea por fila: appid, hash del contenido de la imagen,
+url de la cabecera y brillo. El script E escribe en el almacén y la aplicación web lo lee, de manera que
+los juegos ya procesados no vuelven a descargar la imagen ni a pasar por CLIP.
+
+El brillo que se guarda se calcula con image_brightness sobre la imagen decodificada a la resolución de
+CLIP (reduce_image), igual que la aplicación cuando no encuentra la imagen en el almacén, para que un juego
+tenga el mismo brillo venga de donde venga.
+
+El almacén es solo de añadir: si un appid se vuelve a procesar, la última fila es la que vale. Las
+consultas solo leen lo que hay en memoria: quien use el almacén llama a refresh para cargar las filas
+nuevas (la aplicación lo hace en un hilo aparte cada cierto tiempo, y add lo hace tras cada escritura).
+
+Este módulo es un mirror de src/utils/embedding_store.py (la imagen de la aplicación solo incluye app/):
+los cambios se hacen en los dos ficheros.
+"""
+
+import json
+import hashlib
+import numpy as np
+from pathlib import Path
+from PIL import ImageStat
+
+VECTORS_FILENAME = "vectors.f32"
+INDEX_FILENAME = "index.jsonl"
+# Lado de la imagen de entrada de CLIP
+CLIP_INPUT_SIZE = 224
+
+
+def content_hash(content):
+    """
+    Hash del contenido de una imagen.
+
+    Args:
+        content (bytes): bytes de la imagen.
+
+    Returns:
+        str: hash sha1 en hexadecimal.
+    """
+    return hashlib.sha1(content).hexdigest()
+
+
+def reduce_image(img, size=CLIP_INPUT_SIZE):
+    """
+    Decodifica una imagen a una resolución cercana a la entrada de CLIP. En los JPEG, draft hace que el
+    decodificador escale directamente (1/2, 1/4 o 1/8) sin bajar de size; en el resto de formatos se reduce
+    después por un factor entero.
+
+    Args:
+        img (PIL.Image.Image): imagen abierta con Image.open y todavía sin decodificar.
+        size (int): lado mínimo de la imagen resultante.
+
+    Returns:
+        PIL.Image.Image: imagen RGB.
+    """
+    img.draft('RGB', (size, size))
+    img = img.convert('RGB')
+    factor = min(img.size) // size
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img
+
+
+def image_brightness(img):
+    """
+    Brillo medio de una imagen (media del primer canal).
+
+    Args:
+        img (PIL.Image.Image): imagen RGB devuelta por reduce_image.
+
+    Returns:
+        float: brillo redondeado a 4 decimales.
+    """
+    return round(ImageStat.Stat(img).mean[0], 4)
+
+
+class EmbeddingStore:
+    """
+    Almacén de embeddings indexado por appid y por hash del contenido de la imagen.
+
+    Args:
+        path (str | Path): directorio del almacén.
+        dim (int): dimensión de los vectores.
+    """
+    def __init__(self, path, dim=512):
+        self.path = Path(path)
+        self.dim = dim
+        self.row_bytes = dim * np.dtype(np.float32).itemsize
+        self._rows = []        # metadatos de cada fila
+        self._by_appid = {}
+        self._by_hash = {}
+        self._vectors = None
+        self._index_size = 0
+
+    @property
+    def vectors_file(self):
+        return self.path / VECTORS_FILENAME
+
+    @property
+    def index_file(self):
+        return self.path / INDEX_FILENAME
+
+    def refresh(self):
+        """
+        Carga las filas nuevas que se hayan añadido al índice desde la última lectura
+        (por ejemplo, las que escribe el script de extracción mientras la aplicación está en marcha).
+        """
+        if not self.index_file.exists():
+            return
+        size = self.index_file.stat().st_size
+        if size == self._index_size:
+            return
+
+        with open(self.index_file, "rb") as f:
+            f.seek(self._index_size)
+            for line in f:
+                # Una línea sin terminar es una escritura en curso, se leerá en el siguiente refresh
+                if not line.endswith(b"\n"):
+                    break
+                self._index_size += len(line)
+                self._add_to_index(json.loads(line))
+
+        # Solo se indexan filas cuyo vector está completo en disco
+        n_rows = self.vectors_file.stat().st_size // self.row_bytes if self.vectors_file.exists() else 0
+        if n_rows:
+            self._vectors = np.memmap(self.vectors_file, dtype=np.float32, mode="r", shape=(n_rows, self.dim))
+
+    def get_by_appid(self, appid):
+        """
+        Devuelve la entrada de un juego.
+
+        Args:
+            appid (str): identificador del juego.
+
+        Returns:
+            dict | None: {"appid", "sha1", "url", "brillo", "vector"} o None si no está en el almacén.
+        """
+        return self._entry(self._by_appid.get(str(appid)))
+
+    def get_by_hash(self, sha1):
+        """
+        Devuelve la entrada de una imagen a partir del hash de su contenido.
+
+        Args:
+            sha1 (str): hash del contenido (ver content_hash).
+
+        Returns:
+            dict | None: {"appid", "sha1", "url", "brillo", "vector"} o None si no está en el almacén.
+        """
+        return self._entry(self._by_hash.get(sha1))
+
+    def add(self, appid, sha1, url, brillo, vector):
+        """
+        Añade el embedding de una imagen al almacén. Primero se escribe el vector y luego la línea del
+        índice, de manera que un lector nunca ve una fila del índice sin su vector. Solo puede haber un
+        proceso escribiendo en el almacén (el script E).
+
+        Args:
+            appid (str): identificador del juego.
+            sha1 (str): hash del contenido de la imagen.
+            url (str): url de la cabecera.
+            brillo (float): brillo medio de la imagen.
+            vector (list | np.ndarray): embedding de la imagen.
+        """
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dim:
+            raise ValueError(f"Dimensión del vector {vector.shape[0]} distinta de la del almacén {self.dim}")
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.vectors_file, "ab") as f:
+            size = f.tell()
+            row, partial = divmod(size, self.row_bytes)
+            if partial:
+                # Vector a medias de una escritura interrumpida: se descarta para que la fila nueva quede
+                # alineada (ninguna línea del índice apunta a él)
+                f.truncate(size - partial)
+            f.write(vector.tobytes())
+
+        record = {"row": row, "appid": str(appid), "sha1": sha1, "url": url, "brillo": brillo}
+        with open(self.index_file, "at", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        self.refresh()
+
+    def __len__(self):
+        return len(self._by_appid)
+
+    def _add_to_index(self, record):
+        pos = len(self._rows)
+        self._rows.append(record)
+        self._by_appid[record["appid"]] = pos
+        self._by_hash[record["sha1"]] = pos
+
+    def _entry(self, pos):
+        if pos is None:
+            return None
+        record = self._rows[pos]
+        if self._vectors is None or record["row"] >= self._vectors.shape[0]:
+            return None
+        return {
+            "appid": record["appid"],
+            "sha1": record["sha1"],
+            "url": record["url"],
+            "brillo": record["brillo"],
+            "vector": np.array(self._vectors[record["row"]]),
+        }
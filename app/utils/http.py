@@ -0,0 +1,147 @@
+"""Cliente HTTP compartido para las peticiones de la aplicación a APIs externas (Steam y su CDN de imágenes).
+
+Un único httpx.AsyncClient mantiene las conexiones abiertas (keep-alive) por host, de manera que las
+peticiones no repiten el handshake TCP + TLS. Además:
+    - limita el número de peticiones simultáneas a cada host,
+    - reintenta con backoff exponencial (con jitter) los errores de red y las respuestas 429/5xx,
+      respetando la cabecera Retry-After cuando viene.
+
+get_bytes descarga el cuerpo en streaming con un límite de bytes y un tiempo máximo total, para que una
+imagen enorme o un servidor lento no disparen la memoria ni bloqueen la petición. Superar cualquiera de los
+dos límites no se reintenta: el tiempo máximo es el de toda la descarga, no el de cada intento.
+"""
+import asyncio
+import random
+import time
+import httpx
+from email.utils import parsedate_to_datetime
+from utils.metrics import UPSTREAM_ERRORS, UPSTREAM_RETRIES
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ResponseTooLargeError(ValueError):
+    """El cuerpo de la respuesta supera el tamaño máximo permitido."""
+
+
+class DownloadTimeoutError(TimeoutError):
+    """La descarga supera el tiempo máximo total. No es un httpx.TransportError, así que no se reintenta."""
+
+
+def _retry_after_seconds(response : httpx.Response | None) -> float | None:
+    """Segundos indicados en la cabecera Retry-After (en segundos o como fecha HTTP)."""
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class UpstreamClient:
+    """Cliente HTTP asíncrono con pool de conexiones, reintentos y límite de concurrencia por host.
+
+    Args:
+        timeout (float): timeout de cada petición en segundos.
+        max_per_host (int): peticiones simultáneas máximas a un mismo host.
+        max_retries (int): reintentos tras el primer intento.
+        backoff_base (float): espera base (segundos) del backoff exponencial.
+        backoff_max (float): espera máxima entre reintentos (también limita Retry-After).
+    """
+    def __init__(self, timeout : float = 10, max_per_host : int = 8, max_retries : int = 3,
+                 backoff_base : float = 0.5, backoff_max : float = 10):
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+        self._semaphores = {}
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=4 * max_per_host,
+                                keepalive_expiry=60),
+        )
+
+    async def get(self, url : str, params : dict | None = None) -> httpx.Response:
+        """GET con reintentos. Devuelve la última respuesta (el llamante decide con raise_for_status) o
+        relanza el último error de red si ningún intento ha obtenido respuesta."""
+        return await self._retrying(url, lambda: self._client.get(url, params=params))
+
+    async def get_bytes(self, url : str, max_bytes : int, timeout : float) -> httpx.Response:
+        """GET en streaming (con los mismos reintentos que get) que corta la descarga si el cuerpo supera
+        max_bytes (ResponseTooLargeError) o si tarda más de timeout segundos en total (DownloadTimeoutError).
+        Ninguno de los dos casos se reintenta."""
+        return await self._retrying(url, lambda: self._read_capped(url, max_bytes, timeout))
+
+    async def _read_capped(self, url : str, max_bytes : int, timeout : float) -> httpx.Response:
+        try:
+            async with asyncio.timeout(timeout):
+                async with self._client.stream("GET", url) as response:
+                    length = response.headers.get("content-length")
+                    if length is not None and length.isdigit() and int(length) > max_bytes:
+                        raise ResponseTooLargeError(f"{url}: {length} bytes (máximo {max_bytes})")
+                    chunks, size = [], 0
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise ResponseTooLargeError(f"{url}: más de {max_bytes} bytes")
+                        chunks.append(chunk)
+        except TimeoutError:
+            raise DownloadTimeoutError(f"Descarga de {url} de más de {timeout}s") from None
+        # El cuerpo ya está descomprimido: se quitan las cabeceras que describen el cuerpo original
+        headers = [(k, v) for k, v in response.headers.items() if k not in ("content-encoding", "content-length")]
+        return httpx.Response(response.status_code, headers=headers, content=b"".join(chunks),
+                              request=response.request)
+
+    async def _retrying(self, url : str, send) -> httpx.Response:
+        host = httpx.URL(url).host
+        semaphore = self._semaphore(host)
+        response, error = None, None
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                try:
+                    response, error = await send(), None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                    UPSTREAM_ERRORS.inc(host=host, kind=type(e).__name__)
+
+            if response is not None and response.status_code >= 400:
+                UPSTREAM_ERRORS.inc(host=host, kind=str(response.status_code))
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.max_retries:
+                break
+
+            self.retries += 1
+            UPSTREAM_RETRIES.inc(host=host)
+            await asyncio.sleep(self._delay(attempt, response))
+
+        if response is not None:
+            return response
+        raise error
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def _semaphore(self, host : str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+    def _delay(self, attempt : int, response : httpx.Response | None) -> float:
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(backoff / 2, backoff)
+
+if __name__ == '__main__':
+    pass
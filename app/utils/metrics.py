@@ -0,0 +1,164 @@
+"""Métricas de la aplicación en formato de texto de Prometheus (endpoint /metrics).
+
+Implementación mínima de contadores, gauges e histogramas con etiquetas, suficiente para ver dónde se va el
+tiempo de una predicción sin añadir dependencias:
+    - STAGE_SECONDS: latencia de cada fase (appdetails, histograma, descarga de imagen, CLIP, YouTube,
+      transformación y predict).
+    - STAGE_ERRORS: fases que terminan con excepción.
+    - UPSTREAM_ERRORS / UPSTREAM_RETRIES: respuestas de error y reintentos del cliente HTTP por host.
+    - SINGLEFLIGHT_SHARED: peticiones agrupadas con otra igual que ya estaba en curso.
+    - MODEL_LOAD_SECONDS / MODEL_INFO: tiempo de carga y versión en uso de cada modelo.
+Las estadísticas de las cachés y el tiempo de carga de CLIP (que se carga en segundo plano) se copian a
+los gauges justo antes de generar la respuesta.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable
+
+# Buckets (segundos) pensados para llamadas de red y modelos: de 5 ms a 30 s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Métricas creadas, en orden de creación
+REGISTRY = []
+
+
+def _format_labels(labelnames : tuple, values : tuple, extra : str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value : float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base de las métricas: nombre, ayuda, etiquetas y un valor por combinación de etiquetas."""
+    kind = ""
+
+    def __init__(self, name : str, help : str, labelnames : tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels : dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount : float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value : float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Histograma acumulado con buckets fijos (cada observación suma en su bucket, _sum y _count)."""
+    kind = "histogram"
+
+    def __init__(self, name : str, help : str, labelnames : tuple = (), buckets : tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value : float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Mide la duración del bloque (se registra también si el bloque lanza una excepción)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = f'le="{_format_value(float(bound))}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {total!r}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("steampredictor_stage_seconds", "Duración de cada fase de una predicción.", ("stage",))
+STAGE_ERRORS = Counter("steampredictor_stage_errors_total", "Fases de una predicción terminadas con error.", ("stage",))
+UPSTREAM_ERRORS = Counter("steampredictor_upstream_errors_total",
+                          "Respuestas de error y fallos de red de las APIs externas.", ("host", "kind"))
+UPSTREAM_RETRIES = Counter("steampredictor_upstream_retries_total", "Reintentos de peticiones a APIs externas.",
+                           ("host",))
+MODEL_LOAD_SECONDS = Gauge("steampredictor_model_load_seconds", "Segundos que ha tardado en cargarse cada modelo.",
+                           ("model",))
+SINGLEFLIGHT_SHARED = Counter("steampredictor_singleflight_shared_total",
+                              "Peticiones que han esperado a un cálculo ya en curso en vez de repetirlo.", ("name",))
+MODEL_INFO = Gauge("steampredictor_model_info", "Versión de cada modelo (1 la versión en uso).", ("model", "version"))
+CACHE_ENTRIES = Gauge("steampredictor_cache_entries", "Entradas de cada caché.", ("cache",))
+CACHE_BYTES = Gauge("steampredictor_cache_bytes", "Memoria aproximada ocupada por cada caché.", ("cache",))
+CACHE_HIT_RATIO = Gauge("steampredictor_cache_hit_ratio", "Proporción de aciertos de cada caché.", ("cache",))
+CACHE_REQUESTS = Gauge("steampredictor_cache_requests", "Consultas a cada caché por resultado.", ("cache", "result"))
+
+
+async def timed(stage : str, awaitable : Awaitable):
+    """Espera awaitable registrando su duración (y si falla) como la fase stage."""
+    with STAGE_SECONDS.time(stage=stage):
+        try:
+            return await awaitable
+        except Exception:
+            STAGE_ERRORS.inc(stage=stage)
+            raise
+
+def update_cache_metrics(stats : dict):
+    """Copia a los gauges las estadísticas de las cachés (salida de extraction.pipeline.cache_stats)."""
+    for name, s in stats.items():
+        CACHE_ENTRIES.set(s["entries"], cache=name)
+        CACHE_BYTES.set(s["bytes"], cache=name)
+        CACHE_HIT_RATIO.set(s["hit_ratio"], cache=name)
+        CACHE_REQUESTS.set(s["hits"], cache=name, result="hit")
+        CACHE_REQUESTS.set(s["misses"], cache=name, result="miss")
+
+def render() -> str:
+    """Todas las métricas en formato de texto de Prometheus."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+if __name__ == '__main__':
+    pass
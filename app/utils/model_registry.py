@@ -0,0 +1,174 @@
+"""Registro de modelos con recarga en caliente.
+
+Cada modelo se registra con su fichero (.pkl de joblib) y una función de validación. El registro vigila la
+fecha de modificación de los ficheros y, cuando uno cambia (por ejemplo al reentrenar y copiar el modelo a
+models/), lo carga en un hilo aparte, lo valida con un batch de prueba y, solo si todo va bien, sustituye la
+referencia al modelo. Las peticiones que ya tenían la versión anterior terminan con ella.
+
+La versión de un modelo es el inicio del sha1 de su fichero, de manera que se puede saber qué versión ha
+respondido a cada petición.
+
+Un modelo opcional que no se puede cargar al arrancar (por ejemplo, porque todavía no se ha entrenado) no
+impide que la API arranque: queda como no disponible y se carga cuando aparezca su fichero.
+"""
+import asyncio
+import hashlib
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+from joblib import load
+from utils.metrics import MODEL_LOAD_SECONDS, MODEL_INFO
+
+
+def file_version(path : Path) -> str:
+    """Versión de un modelo: primeros 12 caracteres del sha1 del fichero."""
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()[:12]
+
+
+class ModelVersion:
+    """Un modelo cargado junto con su versión."""
+    def __init__(self, name : str, model : Any, version : str, path : Path, load_seconds : float):
+        self.name = name
+        self.model = model
+        self.version = version
+        self.path = path
+        self.load_seconds = load_seconds
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+
+    def status(self) -> dict:
+        return {
+            "version": self.version,
+            "path": str(self.path),
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+        }
+
+
+class ModelRegistry:
+    """Modelos de la aplicación, recargados en segundo plano cuando cambia su fichero.
+
+    Args:
+        interval (float): segundos entre comprobaciones de los ficheros.
+        smoke_size (int): número de entradas recientes que se guardan para validar una nueva versión.
+    """
+    def __init__(self, interval : float = 30, smoke_size : int = 8):
+        self.interval = interval
+        self.smoke_size = smoke_size
+        self.specs = {}      # nombre -> {"path", "validate", "optional"}
+        self.errors = {}     # nombre -> último error de carga o validación
+        self._models = {}    # nombre -> ModelVersion
+        self._stamps = {}    # nombre -> (mtime_ns, size) del último fichero intentado
+        self._recent = {}    # nombre -> entradas recientes (batch de prueba)
+        self._task = None
+
+    def register(self, name : str, path : Path, validate : Callable[[Any, list], None] | None = None,
+                 optional : bool = False):
+        """Registra un modelo. validate(model, recent_inputs) debe lanzar una excepción si el modelo no es válido.
+        Si optional es True un error al cargarlo en load_all no detiene el arranque."""
+        self.specs[name] = {"path": Path(path), "validate": validate, "optional": optional}
+        self._recent[name] = deque(maxlen=self.smoke_size)
+
+    def load_all(self):
+        """Carga (sin validar contra entradas recientes, todavía no hay) todos los modelos registrados."""
+        for name, spec in self.specs.items():
+            try:
+                self._load(name)
+            except Exception as e:
+                if not spec["optional"]:
+                    raise
+                print(f"Modelo opcional {name} no disponible: {e}")
+
+    def get(self, name : str) -> ModelVersion | None:
+        """Versión actual del modelo. Quien la use debe quedarse con la referencia durante toda la petición."""
+        return self._models.get(name)
+
+    def remember(self, name : str, inputs : Any):
+        """Guarda una entrada real del modelo para validar las siguientes versiones."""
+        if name in self._recent:
+            self._recent[name].append(inputs)
+
+    def status(self) -> dict:
+        return {
+            name: {**(self._models[name].status() if name in self._models else {}), "error": self.errors.get(name),
+                   "optional": spec["optional"]}
+            for name, spec in self.specs.items()
+        }
+
+    async def check(self) -> list[str]:
+        """Recarga los modelos cuyo fichero ha cambiado. Devuelve los nombres de los modelos sustituidos."""
+        swapped = []
+        for name, spec in self.specs.items():
+            stamp = self._stamp(spec["path"])
+            if stamp is None or stamp == self._stamps.get(name):
+                continue
+            try:
+                await asyncio.to_thread(self._load, name)
+                swapped.append(name)
+            except Exception as e:
+                # Se sigue sirviendo la versión anterior
+                print(f"Error recargando el modelo {name}: {e}")
+        return swapped
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Error comprobando los modelos: {e}")
+
+    def _stamp(self, path : Path) -> tuple | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, name : str):
+        """Carga, valida y sustituye un modelo. Si algo falla la versión anterior se mantiene."""
+        spec = self.specs[name]
+        path = spec["path"]
+        # Se marca antes de cargar para no reintentar en bucle un fichero que falla
+        self._stamps[name] = self._stamp(path)
+        try:
+            print(f"Cargando modelo {name} ({path})")
+            start = time.perf_counter()
+            version = file_version(path)
+            model = load(path)
+            if spec["validate"] is not None:
+                spec["validate"](model, list(self._recent[name]))
+            load_seconds = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            self.errors[name] = str(e)
+            raise
+
+        previous = self._models.get(name)
+        self._models[name] = ModelVersion(name, model, version, path, load_seconds)
+        self.errors.pop(name, None)
+
+        MODEL_LOAD_SECONDS.set(load_seconds, model=name)
+        if previous is not None:
+            MODEL_INFO.set(0, model=name, version=previous.version)
+        MODEL_INFO.set(1, model=name, version=version)
+        print(f"Modelo {name} versión {version} cargado en {load_seconds}s")
+
+if __name__ == '__main__':
+    pass
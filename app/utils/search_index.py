@@ -0,0 +1,78 @@
+"""Índice de búsqueda de juegos por nombre.
+
+Los nombres se normalizan (minúsculas, sin tildes ni signos) y se indexan todos sus n-gramas de 1 a 3
+caracteres. Los juegos se ordenan por popularidad antes de indexarlos, de manera que el id interno de
+cada juego es su posición en el ranking y las listas de cada n-grama ya están ordenadas por popularidad:
+una búsqueda recorre la lista del n-grama menos frecuente de la consulta y se queda con los k primeros
+nombres que contienen la consulta.
+"""
+import re
+import unicodedata
+import numpy as np
+
+MAX_GRAM = 3
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text : str) -> str:
+    """Minúsculas, sin tildes y con cualquier carácter no alfanumérico sustituido por un espacio."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+def _grams(text : str, n : int) -> set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """Índice invertido de n-gramas sobre los nombres de los juegos.
+
+    Args:
+        games (list[dict]): juegos con, al menos, los campos appid y name.
+        popularity (callable): función juego -> valor de popularidad con el que se ordenan los resultados.
+    """
+    def __init__(self, games : list[dict], popularity=lambda game: 0):
+        self.games = sorted(games, key=popularity, reverse=True)
+        self.names = [normalize(game["name"]) for game in self.games]
+        self.by_appid = {game["appid"]: game for game in self.games}
+
+        postings = {}
+        for doc_id, name in enumerate(self.names):
+            for n in range(1, MAX_GRAM + 1):
+                for gram in _grams(name, n):
+                    postings.setdefault(gram, []).append(doc_id)
+        # Listas contiguas de int32 (ya ordenadas por popularidad al añadirse en orden)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def search(self, query : str, k : int = 20) -> list[dict]:
+        """Los k juegos más populares cuyo nombre normalizado contiene la consulta normalizada."""
+        query = normalize(query)
+        if not query:
+            return self.games[:k]
+
+        # Si la consulta cabe en un n-grama, su lista es exactamente el resultado
+        if len(query) <= MAX_GRAM:
+            ids = self.postings.get(query)
+            return [] if ids is None else [self.games[i] for i in ids[:k]]
+
+        lists = [self.postings.get(gram) for gram in _grams(query, MAX_GRAM)]
+        if any(ids is None for ids in lists):
+            return []
+        candidates = min(lists, key=len)
+
+        results = []
+        for doc_id in candidates:
+            if query in self.names[doc_id]:
+                results.append(self.games[doc_id])
+                if len(results) >= k:
+                    break
+        return results
+
+    def get(self, appid : int) -> dict | None:
+        return self.by_appid.get(appid)
+
+    def __len__(self):
+        return len(self.games)
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,105 @@
+"""Feed de juegos trending precalculado.
+
+El listado se calcula en segundo plano cada vez que se recarga el catálogo y, además, cada cierto tiempo con
+los últimos juegos recibidos. Se guarda ya serializado junto con su ETag, de manera que el endpoint solo tiene
+que devolver los bytes (o un 304 si el cliente ya los tiene).
+
+Criterios:
+    - Los juegos trending son los de mayor número de reseñas por día según su histograma de reseñas. Los
+      juegos sin histograma cuentan con 0 reseñas por día (van al final).
+    - trend / change_percent comparan el porcentaje de reseñas positivas del juego con la media del catálogo.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+
+def _velocity(game : dict) -> float:
+    return game.get("reviews_per_day") or 0
+
+def _positive_ratio(game : dict) -> float | None:
+    total = game["positive_reviews"] + game["negative_reviews"]
+    return game["positive_reviews"] / total if total else None
+
+def compute_trending(games : list[dict], size : int) -> list[dict]:
+    """Calcula el listado de juegos trending a partir de la información de reseñas del catálogo."""
+    ratios = [r for r in (_positive_ratio(g) for g in games) if r is not None]
+    mean_ratio = sum(ratios) / len(ratios) if ratios else 0
+
+    trending = []
+    for game in sorted(games, key=_velocity, reverse=True)[:size]:
+        ratio = _positive_ratio(game)
+        change = 0.0 if ratio is None else (ratio - mean_ratio) * 100
+        trending.append({
+            **game,
+            "trend": "up" if change >= 0 else "down",
+            "change_percent": round(abs(change), 1),
+        })
+    return trending
+
+
+class TrendingFeed:
+    """Listado trending serializado y listo para servir.
+
+    Args:
+        size (int): número de juegos del listado.
+        max_age (int): segundos que los clientes pueden cachear la respuesta (Cache-Control).
+        interval (float): segundos entre recálculos periódicos del listado.
+    """
+    def __init__(self, size : int = 10, max_age : int = 60, interval : float = 300):
+        self.size = size
+        self.max_age = max_age
+        self.interval = interval
+        self.payload = b"[]"
+        self.etag = '"empty"'
+        self.generated_at = None
+        self._games = []
+        self._task = None
+        self._lock = threading.Lock()
+
+    def update(self, games : list[dict]):
+        """Sustituye los juegos y recalcula el listado. Pensado para ejecutarse en segundo plano (callback del
+        catálogo)."""
+        self._games = games
+        self.refresh()
+
+    def refresh(self):
+        """Recalcula el listado con los últimos juegos recibidos."""
+        payload = json.dumps(compute_trending(self._games, self.size), ensure_ascii=False).encode("utf-8")
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        # Se sustituyen juntos para que payload y etag siempre se correspondan
+        with self._lock:
+            self.payload, self.etag, self.generated_at = payload, etag, time.time()
+
+    def snapshot(self) -> tuple[bytes, str]:
+        with self._lock:
+            return self.payload, self.etag
+
+    @property
+    def headers(self) -> dict:
+        return {"Cache-Control": f"public, max-age={self.max_age}"}
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"Error recalculando el listado trending: {e}")
+
+if __name__ == '__main__':
+    pass
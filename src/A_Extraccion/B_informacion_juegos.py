@@ -4,21 +4,25 @@ de los APPID de un JSON comprimido.
 
 Requisitos:
 - Tener un JSON comprimido de APPIDs de Steam con el formato ["APPID1", "APPID2, ...] de nombre appids_list.json.gz
+
+Los juegos se descargan con varios hilos (steam_workers) que comparten un limitador de peticiones por minuto
+(steam_requests_per_minute) que se adapta a las respuestas 429 de Steam. Los resultados se escriben en el
+mismo orden que la lista de appids, así que curr_idx sigue indicando por dónde continuar la sesión.
 """
 
-from requests import Session
-from time import sleep
-from numpy.random import choice, uniform
+import threading
+from numpy.random import choice
 from tqdm import tqdm
 
 from src.utils.exceptions import AppdetailsException, ReviewhistogramException, SteamAPIException
-from src.utils.files import log_appid_errors, write_to_file, erase_file, file_exists
-from src.utils.config import gamelist_file
+from src.utils.files import log_appid_errors, erase_file, file_exists, JsonlWriter
+from src.utils.config import gamelist_file, steam_requests_per_minute, steam_workers
 from src.utils.minio_server import upload_to_minio
 
 from utils_extraccion.webscraping import user_agents
 from utils_extraccion.sesion import ask_overwrite_file, update_config, get_pending_games, overwrite_confirmation
 from utils_extraccion.steam_requests import get_appdetails, get_appreviewhistogram
+from utils_extraccion.concurrencia import AdaptiveRateLimiter, RateLimitedSession, ordered_map
 
 def _download_game_data(appid, session):
     """
@@ -78,24 +82,32 @@ def B_informacion_juegos(minio): # PARA TERMINAR SESIÓN: CTRL + C
                     print("Operación cancelada")
                     return
                 
-        # comienzo de extracción
-        sesion = Session()
+        # comienzo de extracción: una sesión por hilo, todas con el mismo limitador y user agent
+        limiter = AdaptiveRateLimiter(steam_requests_per_minute)
         user_agent = choice(user_agents)
-        sesion.headers.update({'User-Agent': user_agent})
-        print("Comenzando extraccion de juegos...\n")
-        with tqdm(pending_games, unit = "appids") as pbar:
-            for appid in pbar:
+        local = threading.local()
+
+        def _download(appid):
+            if not hasattr(local, "sesion"):
+                local.sesion = RateLimitedSession(limiter)
+                local.sesion.headers.update({'User-Agent': user_agent})
+            return _download_game_data(appid, local.sesion)
+
+        print(f"Comenzando extraccion de juegos ({steam_workers} hilos, {steam_requests_per_minute} peticiones/min)...\n")
+        with JsonlWriter(gamelist_file) as writer, tqdm(total = len(pending_games), unit = "appids") as pbar:
+            for appid, result in ordered_map(_download, pending_games, steam_workers):
                 pbar.set_description(f"Procesando appid {appid}")
-                try:
-                    desc = _download_game_data(appid, sesion)
-                    write_to_file(desc, gamelist_file)
-                except(AppdetailsException, ReviewhistogramException, SteamAPIException) as e:
-                    pbar.write(str(e))
-                    log_appid_errors(e.appid, str(e))
-                finally:
-                    curr_idx += 1
-                    wait = uniform(1.7, 2.5)
-                    sleep(wait)    
+                if isinstance(result, (AppdetailsException, ReviewhistogramException, SteamAPIException)):
+                    pbar.write(str(result))
+                    log_appid_errors(result.appid, str(result))
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    writer.write(result)
+                # Solo avanza cuando el juego está escrito (o descartado), en orden
+                curr_idx += 1
+                pbar.set_postfix(rpm = limiter.requests_per_minute, limitado = limiter.rate_limited)
+                pbar.update(1)
     except KeyboardInterrupt:
         print("\n\nDetenido por el usuario. Guardando antes de salir...")
     except Exception as e:
@@ -14,7 +14,7 @@ from numpy import random
 from time import time
 from tqdm import tqdm
 
-from src.utils.files import write_to_file, erase_file, file_exists
+from src.utils.files import erase_file, file_exists, JsonlWriter
 from src.utils.config import youtube_scraping_file
 from src.utils.minio_server import upload_to_minio
 
@@ -70,7 +70,7 @@ def C1_informacion_youtube_busquedas(minio):
         interval = _IP_interval_rotation()
 
         print('Comenzando extracción de juegos en YouTube...\n')
-        with tqdm(pending_games, unit="juegos") as pbar:
+        with JsonlWriter(youtube_scraping_file) as writer, tqdm(pending_games, unit="juegos") as pbar:
             for game in pbar:
                 # Cargamos los datos
                 appid = game.get('id')
@@ -84,7 +84,7 @@ def C1_informacion_youtube_busquedas(minio):
                     if id_list == []:
                         tqdm.write(f'Juego sin vídeos o error al buscarlo: {name}')
                     jsonl = {'id':appid,'name':name,'video_statistics':id_list}
-                    write_to_file(jsonl, youtube_scraping_file)
+                    writer.write(jsonl)
                     session.wait(4, scope=0.4) # Espera aleatoria de entre 2.4 y 5.6 segundos
                 else:
                     tqdm.write(f'Juego con entrada incompleta: {name}')
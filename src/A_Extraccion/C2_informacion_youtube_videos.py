@@ -12,7 +12,7 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from tqdm import tqdm
 
-from src.utils.files import erase_file, file_exists, write_to_file
+from src.utils.files import erase_file, file_exists, JsonlWriter
 from src.utils.config import yt_statslist_file
 from src.utils.minio_server import upload_to_minio
 
@@ -138,7 +138,7 @@ def C2_informacion_youtube_videos(minio):
 
         print('Comenzando peticiones a la API de Youtube...\n')
         cont = 0
-        with tqdm(pending_games, unit="juegos") as pbar:
+        with JsonlWriter(yt_statslist_file) as writer, tqdm(pending_games, unit="juegos") as pbar:
             for app in pbar:
                 jsonl = None
                 try:
@@ -149,7 +149,7 @@ def C2_informacion_youtube_videos(minio):
                     curr_idx += 1
                     if jsonl:
                         # Escribimos en el archivo destino
-                        write_to_file(jsonl, yt_statslist_file)
+                        writer.write(jsonl)
                     cont += 1
                     if cont == 10000:
                         break
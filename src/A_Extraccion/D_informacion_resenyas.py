@@ -12,7 +12,7 @@ from tqdm import tqdm
 from numpy.random import choice
 
 from src.utils.config import steam_reviews_file
-from src.utils.files import erase_file, write_to_file, file_exists
+from src.utils.files import erase_file, file_exists, JsonlWriter
 from src.utils.minio_server import upload_to_minio
 from src.utils.exceptions import SteamAPIException
 
@@ -64,12 +64,12 @@ def D_informacion_resenyas(minio):
         user_agent = choice(user_agents)
         sesion.headers.update({'User-Agent': user_agent})
         print("Comenzando extraccion de juegos...\n")
-        with tqdm(pending_games, unit = "games") as pbar:
+        with JsonlWriter(steam_reviews_file) as writer, tqdm(pending_games, unit = "games") as pbar:
             for game in pbar:
                 appid = game.get("id")
                 pbar.set_description(f"Procesando appid: {appid}")
                 _download_game_data(game, curr_idx, sesion)
-                write_to_file(game, steam_reviews_file)
+                writer.write(game)
                 curr_idx += 1
                 
     except SteamAPIException as e:
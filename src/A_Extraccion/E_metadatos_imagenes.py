@@ -2,15 +2,19 @@
 Script que extrae de las imágenes el brillo medio y un vector de embeddings mediante una red neuronal
 preentrenada de la librería pytorch. Lo guarda en data/raw/info_imagenes.jsonl.gz
 
+Además, los embeddings de CLIP se añaden al almacén de embeddings (data/processed/clip_store) que lee la
+aplicación web, para que no tenga que volver a descargar y codificar las imágenes ya procesadas.
+
 Requisitos:
 - Fichero games_info.jsonl.gz con la informacion de los juegos
 """
 
 from os import path, environ, makedirs
+from io import BytesIO
 from torch import unsqueeze, no_grad, nn
 import torchvision.models as models
 import torchvision.transforms as transforms
-from PIL import Image, ImageStat
+from PIL import Image
 from requests import Session
 from time import sleep
 from tqdm import tqdm
@@ -18,14 +22,15 @@ from numpy.random import choice, uniform
 from sentence_transformers import SentenceTransformer
 
 from src.utils.minio_server import upload_to_minio
-from src.utils.files import write_to_file, erase_file, file_exists
-from src.utils.config import banners_file, project_root, data_path
+from src.utils.files import erase_file, file_exists, JsonlWriter
+from src.utils.config import banners_file, project_root, data_path, clip_store_path
+from src.utils.embedding_store import EmbeddingStore, content_hash, reduce_image, image_brightness
 
 from utils_extraccion.webscraping import user_agents
 from utils_extraccion.sesion import ask_overwrite_file, update_config, get_pending_games
 from utils_extraccion.sesion import overwrite_confirmation, handle_input
 
-def _analiza_imagen(img_path, url,  trans, appid, download_images, model_resnet, model_clip, model_convnext, sesion):
+def _analiza_imagen(img_path, url,  trans, appid, download_images, model_resnet, model_clip, model_convnext, sesion, store):
     """
     Analiza las características de una imagen
 
@@ -38,6 +43,7 @@ def _analiza_imagen(img_path, url,  trans, appid, download_images, model_resnet,
         model_clip (sentence_transformers.SentenceTransformer): modelo preentrenado para extracción de embeddings.
         model_convnext (torch.nn.Module): modelo preentrenado para extracción de embeddings.
         sesion (Session): Sesion de requests ya abierta.
+        store (EmbeddingStore): almacén de embeddings donde se guarda el vector de CLIP.
 
     Returns:
         dict: diccionario con el brillo medio y vector de características de la imagen
@@ -49,16 +55,21 @@ def _analiza_imagen(img_path, url,  trans, appid, download_images, model_resnet,
     if download_images:
         response = sesion.get(url, timeout=10)
         response.raise_for_status() # Para lanzar excepción si da error la petición
+        content = response.content
     
         with open(ruta_temporal, 'wb') as f:
-            f.write(response.content)
+            f.write(content)
+    else:
+        with open(ruta_temporal, 'rb') as f:
+            content = f.read()
 
     # Análisis de la imagen
-    img = Image.open(ruta_temporal).convert('RGB')
+    img = Image.open(BytesIO(content)).convert('RGB')
         
-    # Extraer el brillo medio
-    stat = ImageStat.Stat(img)
-    brillo = round(stat.mean[0], 4)
+    # Extraer el brillo medio: sobre la imagen reducida a la resolución de CLIP, igual que la aplicación web,
+    # para que el brillo del almacén y el calculado en vivo coincidan
+    with reduce_image(Image.open(BytesIO(content))) as img_reducida:
+        brillo = image_brightness(img_reducida)
 
     # Extraer vector de características
     img_preprocesada = trans(img)
@@ -78,6 +89,9 @@ def _analiza_imagen(img_path, url,  trans, appid, download_images, model_resnet,
         vector_clip = [round(float(x), 4) for x in feat_clip.tolist()]
 
     img.close() 
+
+    # Vector completo (float32) en el almacén compartido con la aplicación web
+    store.add(appid, content_hash(content), url, brillo, feat_clip)
     
     caracteristicas = {
         "brillo_medio": brillo,
@@ -149,24 +163,23 @@ def E_metadatos_imagenes(minio):
     user_agent = choice(user_agents)
     sesion.headers.update({'User-Agent': user_agent})
 
+    store = EmbeddingStore(clip_store_path)
+
     # Procesamiento de las imágenes
     try:
-        with tqdm(pending_games, unit="juegos") as pbar:
+        with JsonlWriter(banners_file) as writer, tqdm(pending_games, unit="juegos") as pbar:
             for juego in pbar:
                 appid = juego.get("id")
                 pbar.set_description(f"Procesando appid: {appid}")
                 
-                if download_images:
-                    url = juego.get("appdetails", {}).get("header_url")
-                    if not url:
-                        curr_idx += 1
-                        continue
-                else:
-                    url = None
+                url = juego.get("appdetails", {}).get("header_url")
+                if download_images and not url:
+                    curr_idx += 1
+                    continue
 
                 try:
                     caracteristicas = _analiza_imagen(ruta_imagenes, url, trans, appid, download_images, 
-                                                     model_resnet, model_clip, model_convnext, sesion)
+                                                     model_resnet, model_clip, model_convnext, sesion, store)
 
                     resultado_juego = {
                         "id": appid,
@@ -176,7 +189,7 @@ def E_metadatos_imagenes(minio):
                         "v_clip": caracteristicas["vector_clip"]
                     }
 
-                    write_to_file(resultado_juego, banners_file)
+                    writer.write(resultado_juego)
                     curr_idx += 1
                     
                     if download_images: 
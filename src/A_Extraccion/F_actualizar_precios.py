@@ -0,0 +1,125 @@
+"""
+Script que actualiza el price_overview de los juegos ya descargados (games_info.jsonl.gz y la muestra de
+precios games_info_sample_precios.jsonl.gz) sin volver a descargar el resto de appdetails.
+
+Usa appdetails con filters=price_overview, que admite cientos de appids por petición, así que refrescar
+todos los precios son unas decenas de peticiones en lugar de una por juego. Después hay que volver a
+ejecutar la transformación B y el script P para regenerar precios.parquet.
+
+Requisitos:
+- Tener el fichero games_info.jsonl.gz (script B)
+"""
+
+from os import replace
+from numpy.random import choice
+from tqdm import tqdm
+
+from src.utils.exceptions import SteamAPIException
+from src.utils.files import JsonlWriter, read_file, file_exists, erase_file
+from src.utils.config import gamelist_file, raw_game_info_prices, steam_price_batch_size, steam_appdetails_per_minute
+from src.utils.minio_server import upload_to_minio
+
+from utils_extraccion.webscraping import user_agents
+from utils_extraccion.steam_requests import get_price_overviews
+from utils_extraccion.concurrencia import AdaptiveRateLimiter, RateLimitedSession
+
+def _download_prices(appids, sesion):
+    """
+    Descarga el price_overview de todos los appids en lotes de steam_price_batch_size.
+
+    Args:
+        appids (list): appids (str) de los juegos.
+        sesion (requests.Session): Sesión persistente para las peticiones HTTP.
+
+    Returns:
+        dict: diccionario appid -> price_overview de los juegos que ha devuelto Steam.
+    """
+    prices = {}
+    batches = [appids[i:i + steam_price_batch_size] for i in range(0, len(appids), steam_price_batch_size)]
+    with tqdm(batches, unit = "peticiones") as pbar:
+        for batch in pbar:
+            try:
+                prices.update(get_price_overviews(batch, sesion))
+            except SteamAPIException as e:
+                pbar.write(f"Error en el lote {batch[0]}-{batch[-1]}: {e}")
+    return prices
+
+def _update_file(filepath, prices, minio):
+    """
+    Sustituye el price_overview de los juegos de un fichero jsonl.gz de appdetails.
+
+    Args:
+        filepath (Path): fichero con registros {"id", "appdetails", "appreviewhistogram"}.
+        prices (dict): diccionario appid -> price_overview.
+        minio (dict): diccionario de la forma {"minio_write": False, "minio_read": False}
+
+    Returns:
+        int: número de juegos cuyo precio ha cambiado.
+    """
+    games = read_file(filepath, minio)
+    if not games:
+        return 0
+
+    changed = 0
+    for game in games:
+        price_overview = prices.get(str(game.get("id")))
+        if price_overview is None or not game.get("appdetails"):
+            continue
+        if game["appdetails"].get("price_overview") != price_overview:
+            game["appdetails"]["price_overview"] = price_overview
+            changed += 1
+
+    # Se escribe en un fichero temporal (en bloques, ver record_store) y solo si se ha escrito entero sustituye
+    # al original. Si algo falla el error se propaga y el original queda intacto
+    tmp_file = filepath.with_name(f"tmp_{filepath.name}")
+    erase_file(tmp_file)
+    try:
+        with JsonlWriter(tmp_file) as writer:
+            for game in games:
+                writer.write(game)
+    except BaseException:
+        erase_file(tmp_file)
+        raise
+    replace(tmp_file, filepath)
+
+    if minio["minio_write"]:
+        corrrectly_uploaded = upload_to_minio(filepath)
+        if corrrectly_uploaded: erase_file(filepath)
+    return changed
+
+def F_actualizar_precios(minio):
+    """
+    Actualiza los precios de los juegos de games_info.jsonl.gz y de la muestra de precios.
+
+    Args:
+        minio (dic): diccionario de la forma {"minio_write": False, "minio_read": False} para activar y
+                desactivar subida y bajada de MinIO
+
+    Returns:
+        None
+    """
+    files = [f for f in [gamelist_file, raw_game_info_prices] if file_exists(f, minio)]
+    if not files:
+        print(f"No existe el fichero {gamelist_file.name}")
+        return
+
+    appids = []
+    for filepath in files:
+        appids.extend(str(game.get("id")) for game in read_file(filepath, minio, default_return = []))
+    appids = list(dict.fromkeys(appids))
+
+    sesion = RateLimitedSession(AdaptiveRateLimiter(steam_appdetails_per_minute))
+    sesion.headers.update({'User-Agent': choice(user_agents)})
+    print(f"Actualizando precios de {len(appids)} juegos...\n")
+    try:
+        prices = _download_prices(appids, sesion)
+    except KeyboardInterrupt:
+        print("\n\nDetenido por el usuario. No se modifica ningún fichero")
+        return
+
+    for filepath in files:
+        changed = _update_file(filepath, prices, minio)
+        print(f"{filepath.name}: {changed} precios actualizados")
+
+if __name__ == "__main__":
+    F_actualizar_precios({"minio_write": False, "minio_read": False})
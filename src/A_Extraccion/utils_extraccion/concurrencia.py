@@ -0,0 +1,170 @@
+"""
+Módulo para extraer datos de la API de Steam con varias peticiones en paralelo sin pasarse del límite
+de peticiones por minuto.
+
+- AdaptiveRateLimiter: token bucket compartido por todos los hilos. Reparte un presupuesto de peticiones
+  por minuto y, cuando Steam responde 429, reduce la tasa a la mitad y pausa todas las peticiones el tiempo
+  indicado en Retry-After. Tras cada respuesta correcta la tasa se recupera poco a poco hasta el objetivo.
+- RateLimitedSession: requests.Session que pide un token antes de cada petición y reintenta los 429.
+- ordered_map: aplica una función a una lista con un pool de hilos devolviendo los resultados en el
+  mismo orden que la entrada (para escribir el fichero y el índice de sesión en orden).
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep, time
+
+from requests import Session
+
+def _retry_after_seconds(response):
+    """
+    Segundos de espera indicados en la cabecera Retry-After (en segundos o como fecha HTTP).
+
+    Args:
+        response (requests.Response): respuesta con código 429.
+
+    Returns:
+        float | None: segundos de espera o None si no viene la cabecera.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket thread-safe con tasa adaptativa.
+
+    Args:
+        requests_per_minute (float): presupuesto objetivo de peticiones por minuto.
+        burst (int): peticiones que se pueden hacer seguidas tras un periodo sin peticiones.
+        min_requests_per_minute (float): tasa mínima a la que se puede reducir tras los 429.
+        default_pause (float): segundos de pausa tras un 429 sin cabecera Retry-After.
+    """
+    def __init__(self, requests_per_minute, burst=1, min_requests_per_minute=5, default_pause=30):
+        self.target_rate = requests_per_minute / 60
+        self.min_rate = min(min_requests_per_minute, requests_per_minute) / 60
+        self.rate = self.target_rate
+        self.burst = burst
+        self.default_pause = default_pause
+        self.rate_limited = 0
+        self._tokens = burst
+        self._last = monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Bloquea el hilo hasta que haya un token disponible (y no haya una pausa por 429 activa)."""
+        while True:
+            with self._lock:
+                now = monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                    self._last = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+            sleep(wait)
+
+    def on_success(self):
+        """Recupera la tasa poco a poco (incremento aditivo) hasta el objetivo."""
+        with self._lock:
+            self.rate = min(self.target_rate, self.rate + self.target_rate * 0.05)
+
+    def on_rate_limited(self, retry_after=None):
+        """
+        Steam ha respondido 429: se reduce la tasa a la mitad y se pausan todas las peticiones.
+
+        Args:
+            retry_after (float | None): segundos indicados en Retry-After.
+        """
+        with self._lock:
+            self.rate_limited += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else self.default_pause
+            self._paused_until = max(self._paused_until, monotonic() + pause)
+            # No se acumulan tokens durante la pausa
+            self._tokens = 0
+            self._last = self._paused_until
+
+    @property
+    def requests_per_minute(self):
+        return round(self.rate * 60, 1)
+
+class RateLimitedSession(Session):
+    """
+    Sesión de requests que respeta un AdaptiveRateLimiter compartido.
+
+    Args:
+        limiter (AdaptiveRateLimiter): limitador compartido entre todas las sesiones.
+        max_retries (int): reintentos de una petición que recibe 429.
+    """
+    def __init__(self, limiter, max_retries=5):
+        super().__init__()
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            response = super().request(method, url, *args, **kwargs)
+            if response.status_code != 429:
+                self.limiter.on_success()
+                return response
+            self.limiter.on_rate_limited(_retry_after_seconds(response))
+        # Se devuelve el último 429 para que lo trate quien hace la petición (raise_for_status)
+        return response
+
+def ordered_map(function, items, workers, window=None):
+    """
+    Aplica function a cada elemento de items con un pool de hilos y devuelve los resultados en orden.
+
+    Solo hay window tareas en vuelo a la vez, así que no se encolan de golpe todos los elementos y si se
+    interrumpe (KeyboardInterrupt) se pierden como mucho window tareas sin escribir.
+
+    Args:
+        function (callable): función a aplicar. Las excepciones se devuelven como resultado.
+        items (iterable): elementos de entrada.
+        workers (int): número de hilos.
+        window (int | None): tareas en vuelo como máximo (por defecto 2 * workers).
+
+    Returns:
+        generator: tuplas (elemento, resultado o excepción) en el orden de items.
+    """
+    window = window or 2 * workers
+    iterator = iter(items)
+    pending = deque()
+
+    def _call(item):
+        try:
+            return function(item)
+        except Exception as e:
+            return e
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for item in iterator:
+            pending.append((item, executor.submit(_call, item)))
+            if len(pending) >= window:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    finally:
+        # Si se corta la iteración no se esperan las tareas que aún no han empezado
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,94 @@
+"""
+Módulo con el almacén de respuestas HTTP en crudo de la API de Steam.
+
+Cada respuesta JSON se guarda completa (antes de filtrar campos o descartar juegos) comprimida con gzip en
+un fichero cuyo nombre es el sha1 de la url y los parámetros de la petición, junto con la fecha de descarga
+y las cabeceras ETag / Last-Modified. Así, cambiar un filtro o sacar un campo nuevo se hace leyendo de disco
+sin volver a descargar el catálogo, y al reextraer solo se piden las entradas caducadas (con petición
+condicional si Steam devolvió ETag).
+
+Estructura: {raiz}/{sha1[:2]}/{sha1}.json.gz
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from time import time
+
+class ResponseCache:
+    """
+    Almacén en disco de respuestas JSON indexadas por url + parámetros.
+
+    Args:
+        root (Path): directorio del almacén.
+        max_age (float | None): segundos tras los que una respuesta se considera caducada (None: nunca).
+        offline (bool): si es True no se hace ninguna petición: se usan las respuestas guardadas aunque
+            estén caducadas.
+    """
+    def __init__(self, root, max_age=None, offline=False):
+        self.root = Path(root)
+        self.max_age = max_age
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, params=None):
+        """Clave de una petición: sha1 de la url y los parámetros ordenados."""
+        canonical = json.dumps({"url": url, "params": params or {}}, sort_keys=True, default=str)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.json.gz"
+
+    def get(self, url, params=None):
+        """
+        Devuelve la entrada guardada de una petición.
+
+        Returns:
+            dict | None: {"url", "params", "fetched_at", "etag", "last_modified", "data"} o None si no existe.
+        """
+        path = self._path(self.key(url, params))
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, EOFError, gzip.BadGzipFile, json.JSONDecodeError):
+            return None
+
+    def is_fresh(self, entry):
+        """True si la entrada se puede usar sin volver a pedirla."""
+        if self.offline or self.max_age is None:
+            return True
+        return time() - entry.get("fetched_at", 0) < self.max_age
+
+    def put(self, url, params, data, etag=None, last_modified=None):
+        """Guarda (o sustituye) la respuesta de una petición."""
+        entry = {"url": url, "params": params or {}, "fetched_at": time(), "etag": etag,
+                 "last_modified": last_modified, "data": data}
+        path = self._path(self.key(url, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: varios hilos pueden estar escribiendo en el almacén a la vez
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return entry
+
+    def touch(self, entry):
+        """Marca como recién descargada una entrada que el servidor ha confirmado (304 Not Modified)."""
+        return self.put(entry["url"], entry["params"], entry["data"], entry.get("etag"), entry.get("last_modified"))
+
+    def count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": round(self.hits / total, 3) if total else 0.0}
@@ -3,6 +3,8 @@ Módulo enfocado a la generalización de código de los Scripts de extracción d
 """
 
 from src.utils.files import read_file, write_to_file, file_exists
+from src.utils.minio_server import download_from_minio
+from src.utils.record_store import BlockGzipRecords, PendingRecords
 from src.utils.config import config_file, appidlist_file, gamelist_file, youtube_scraping_file
 from src.utils.config import steam_reviews_top100_file, steam_reviews_rest_file, get_appid_range
 
@@ -127,6 +129,43 @@ def _get_script_file(script_id):
     else:
         return youtube_scraping_file
     
+def _load_games(file, minio):
+    """
+    Carga la lista de juegos de un fichero. Los .jsonl.gz no se cargan en memoria: se devuelve un
+    BlockGzipRecords que permite empezar a leer en cualquier índice.
+
+    Args:
+        file (Path | list(Path)): fichero/s de entrada del script.
+        minio (dict): diccionario de la forma {"minio_write": False, "minio_read": False}
+
+    Returns:
+        list | BlockGzipRecords | None: juegos del fichero o None si no existe.
+    """
+    # Para manejar distintos ficheros
+    if isinstance(file, list):
+        file_list = []
+        for f in file:
+            data = read_file(f, minio)
+            if data:
+                file_list.extend(data)
+        return file_list
+
+    if file.suffixes[-2:] != [".jsonl", ".gz"]:
+        return read_file(file, minio)
+
+    if minio["minio_read"] and not download_from_minio(file):
+        print(f"Error de MinIO: \n Se intentará leer el fichero localmente")
+    if not file.exists():
+        print(f"Error: File {file.name} does not exist.")
+        return None
+    return BlockGzipRecords(file)
+
+def _pending_range(file_list, curr_idx, end_idx):
+    """Juegos del rango [curr_idx, end_idx] (perezoso si file_list es un BlockGzipRecords)."""
+    if isinstance(file_list, BlockGzipRecords):
+        return PendingRecords(file_list, curr_idx, end_idx + 1)
+    return file_list[curr_idx:end_idx+1]
+
 def get_pending_games(script_id, minio = {"minio_write": False, "minio_read": False}):
     """
     Devuelve lista con la información pedida del fichero necesario para
@@ -137,23 +176,15 @@ def get_pending_games(script_id, minio = {"minio_write": False, "minio_read": Fa
         script_id (str): identificador del script que llama a la función
     
     Returns:
-        list: lista que contiene la información pedida a través
-            de las distintas opciones ofrecidas
+        list | PendingRecords: juegos del rango pedido a través de las distintas opciones
+            ofrecidas. Los ficheros .jsonl.gz se leen de forma perezosa desde curr_idx
         int: posición inicial del rango seleccionado
         int: posición por la que continuar la extracción en el rango seleccionado
         int: posición final del rango seleccionado
     """
     # leer la lista del archivo necesario para el script con id script_id
     file = _get_script_file(script_id)
-    # Para manejar distintos ficheros
-    if isinstance(file, list):
-        file_list = []
-        for f in file:
-            data = read_file(f, minio)
-            if data:
-                file_list.extend(data)
-    else:
-        file_list = read_file(file, minio)
+    file_list = _load_games(file, minio)
     # inicializar indices dummy
     start_idx, curr_idx, end_idx = -1, -1, -1
     # si no hay lista de juegos devolver una lista vacía
@@ -163,7 +194,7 @@ def get_pending_games(script_id, minio = {"minio_write": False, "minio_read": Fa
     continue_session, start_idx, curr_idx, end_idx = _get_session_info(script_id)
     # si se quiere usar información de sesión existente
     if continue_session:
-        return file_list[curr_idx:end_idx+1], start_idx, curr_idx, end_idx
+        return _pending_range(file_list, curr_idx, end_idx), start_idx, curr_idx, end_idx
     
     # si no se quiere usar sesión existente o no hay sesión existente
     print("Configurando nueva sesión...\n")
@@ -190,7 +221,7 @@ def get_pending_games(script_id, minio = {"minio_write": False, "minio_read": Fa
     elif option == "2": # usar rango del identificador, si no hay identificador, se hace completo
         start_idx, curr_idx, end_idx = get_appid_range(list_size)
     
-    return file_list[curr_idx:end_idx+1], start_idx, curr_idx, end_idx
+    return _pending_range(file_list, curr_idx, end_idx), start_idx, curr_idx, end_idx
 
 def overwrite_confirmation():
     """
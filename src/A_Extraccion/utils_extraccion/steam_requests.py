@@ -9,6 +9,22 @@ from tqdm import tqdm
 
 from src.utils.date import format_date_string, unix_to_date_string
 from src.utils.exceptions import AppdetailsException, ReviewhistogramException, SteamAPIException
+from src.utils.config import raw_responses_path, response_cache_max_age_days, response_cache_offline
+
+from utils_extraccion.response_cache import ResponseCache
+
+# Respuestas en crudo de appdetails y appreviewhistogram
+RESPONSE_CACHE = ResponseCache(raw_responses_path, response_cache_max_age_days * 24 * 3600, response_cache_offline)
+
+# price_overview que se guarda para los juegos gratuitos (Steam no lo devuelve)
+FREE_GAME_PRICE_OVERVIEW = {
+    "currency" : "EUR",
+    "initial" : 0,
+    "final" : 0,
+    "discount_percent" : 0,
+    "initial_formatted" : "0€",
+    "final_formatted" : "0€"
+}
 
 def _parse_supported_languages(raw_html):
     """
@@ -28,28 +44,49 @@ def _parse_supported_languages(raw_html):
     language_list = [language.strip() for language in processed_languages.split(",")]
     return language_list
 
-def _request_url(session, params_info, url):
+def _request_url(session, params_info, url, use_cache = True):
     """
     Realiza una petición GET a una URL específica utilizando una sesión.
 
+    Si use_cache es True la respuesta se lee del almacén de respuestas en crudo (RESPONSE_CACHE) cuando
+    está guardada y no ha caducado. Las caducadas se piden de nuevo con If-None-Match / If-Modified-Since
+    y las respuestas correctas se guardan completas antes de devolverlas.
+
     Args:
         sesion (requests.Session): Sesión de la librería requests para 
             'reciclar' la conexión.
         params_info (dict): Diccionario con los parámetros de consulta.
         url (str): Dirección URL del endpoint de la API.
+        use_cache (bool): leer y guardar la respuesta en el almacén de respuestas.
 
     Returns:
         dict | None: Datos decodificados del JSON si la petición es exitosa. 
         Retorna None si ocurre un error de conexión o un estado HTTP erróneo.
     """
+    entry = RESPONSE_CACHE.get(url, params_info) if use_cache else None
+    if entry is not None and RESPONSE_CACHE.is_fresh(entry):
+        RESPONSE_CACHE.count(hit = True)
+        return entry["data"]
+    if use_cache and RESPONSE_CACHE.offline:
+        raise SteamAPIException(f"Response not stored (offline mode): {url} {params_info}")
+
+    # Petición condicional: si no ha cambiado Steam responde 304 sin cuerpo
+    headers = {}
+    if entry is not None and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry is not None and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
 
     try:
-        response = session.get(url, params=params_info)
+        response = session.get(url, params=params_info, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            RESPONSE_CACHE.count(hit = True)
+            return RESPONSE_CACHE.touch(entry)["data"]
         response.raise_for_status()
         content_type = response.headers.get("content-type", "")
         if("application/json" not in content_type):
             raise SteamAPIException("Request does not return a json")
-        return response.json()
+        data = response.json()
     except exceptions.HTTPError as e:
         raise SteamAPIException(f"HTTP error: {e}")
     except exceptions.RequestException as e:
@@ -57,6 +94,11 @@ def _request_url(session, params_info, url):
     except ValueError as e:
         raise SteamAPIException(f"Json decodification error: {e}")
 
+    if use_cache:
+        RESPONSE_CACHE.count(hit = False)
+        RESPONSE_CACHE.put(url, params_info, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return data
+
 def get_appids(n_appids=1000000, last_appid = 0):
     """
     Función que devuelve una lista de appids (str). Ejemplo: ["10", "20", "30"]
@@ -93,7 +135,8 @@ def get_appids(n_appids=1000000, last_appid = 0):
     with tqdm(total=n_appids, desc="appids extracted: ", unit="appids") as pbar:
         while n_appids > 0:
             # Si existe data lo guardamos en el diccionario content
-            data = _request_url(session, info, url)
+            # La lista de appids cambia continuamente, no se guarda
+            data = _request_url(session, info, url, use_cache = False)
             
             if not data:
                 break
@@ -145,21 +188,12 @@ def get_appdetails(appid, sesion):
 
     game_data = data[appid]["data"]
 
-    free_game_po = {
-                        "currency" : "EUR",
-                        "initial" : 0,
-                        "final" : 0,
-                        "discount_percent" : 0,
-                        "initial_formatted" : "0€",
-                        "final_formatted" : "0€"
-                        }
-    
     # Metemos la información útil
     appdetails["name"] = game_data.get("name")
     appdetails["required_age"] = game_data.get("required_age")
     appdetails["short_description"] = game_data.get("short_description")
     appdetails["header_url"] = game_data.get("header_image")
-    appdetails["price_overview"] = game_data.get("price_overview", free_game_po)
+    appdetails["price_overview"] = game_data.get("price_overview", FREE_GAME_PRICE_OVERVIEW)
     appdetails["supported_languages"] = _parse_supported_languages(game_data.get("supported_languages", ""))
     appdetails["capsule_img"] = game_data.get("capsule_imagev5")
     appdetails["developers"] = game_data.get("developers")
@@ -179,6 +213,38 @@ def get_appdetails(appid, sesion):
     
     return appdetails
 
+def get_price_overviews(appids, sesion):
+    """
+    Obtiene el price_overview de varios juegos con una única petición a appdetails.
+
+    Con filters=price_overview la API admite varios appids separados por comas y solo devuelve el precio
+    (sin descripciones, géneros ni categorías).
+
+    Args:
+        appids (list): lista de appids (str) de Steam.
+        sesion (requests.Session): Sesión persistente para realizar la petición HTTP.
+
+    Returns:
+        dict: diccionario appid -> price_overview. Los juegos gratuitos tienen FREE_GAME_PRICE_OVERVIEW
+        y los que Steam no devuelve (success False) no aparecen.
+    """
+    url = "https://store.steampowered.com/api/appdetails"
+    params_info = {"appids": ",".join(appids), "filters": "price_overview", "cc": "eur"}
+
+    # No se usa el almacén de respuestas: se quiere el precio actual
+    data = _request_url(sesion, params_info, url, use_cache = False)
+
+    prices = {}
+    for appid in appids:
+        game = data.get(appid)
+        if game is None or not game.get("success", False):
+            continue
+        # Los juegos gratuitos devuelven data vacío (lista vacía en vez de diccionario)
+        game_data = game.get("data") or {}
+        prices[appid] = game_data.get("price_overview", FREE_GAME_PRICE_OVERVIEW)
+
+    return prices
+
 def get_appreviewhistogram(appid, session, release_date):
     """
     Obtiene y procesa estadísticas de reseñas de un juego en Steam. Extrae métricas
@@ -284,12 +350,14 @@ def get_resenyas(id, sesion, is_top_100):
     # Obtiene las reseñas de un juego, como parámetros tiene filtro por idioma, aparecen
     # ordenadas las reseñas por utilidad, con un máximo de 100 reseñas por página. Por 
     # último se actualiza el cursor para obtener la url de la siguiente página.
+    # Las páginas no pasan por el almacén de respuestas: con filter=recent el contenido de un cursor cambia
+    # en cuanto entran reseñas nuevas, y una página guardada mezclaría reseñas de dos momentos distintos
     url_begin = "https://store.steampowered.com/appreviews/"
     url = url_begin + str(id)
     
     game_reviews = {"datos_resumen": {}, "lista_resenyas": []}
     info = {"json":1, "language":"english", "purchase_type":"all", "filter":"recent", "num_per_page":100,"cursor":"*"}
-    data_json = _request_url(sesion, info, url)
+    data_json = _request_url(sesion, info, url, use_cache = False)
 
     if not data_json:
         return {}
@@ -323,7 +391,7 @@ def get_resenyas(id, sesion, is_top_100):
         info["cursor"] = data_json["cursor"]
         
         # Se cargan los datos de la siguiente página de reviews
-        data_json = _request_url(sesion, info, url)
+        data_json = _request_url(sesion, info, url, use_cache = False)
         if not data_json:
             break
     
@@ -0,0 +1,35 @@
+"""
+Script que compacta los ficheros .jsonl.gz de data/raw escritos registro a registro (un miembro gzip por
+registro) en bloques de 1000 registros (un miembro gzip por bloque), que ocupan menos, se leen más rápido
+y permiten empezar a leer en cualquier registro (ver src/utils/record_store.py).
+
+Uso:
+> python -m src.B_Transformacion.compactar_ficheros_jsonl
+"""
+
+from src.utils.config import raw_data_path
+from src.utils.files import compact_jsonl_gz
+
+def compactar_ficheros(files):
+    """
+    Compacta los ficheros indicados mostrando el tamaño antes y después.
+
+    Args:
+        files (list): lista de Path de ficheros .jsonl.gz
+    """
+    for file in files:
+        try:
+            result = compact_jsonl_gz(file)
+        except Exception as e:
+            print(f"Error al compactar {file.name}: {e}")
+            continue
+        before, after = result["before"], result["after"]
+        print(f"{file.name}: {before['members']} miembros, {before['bytes'] / 1e6:.2f} MB -> "
+              f"{after['members']} miembros, {after['bytes'] / 1e6:.2f} MB")
+
+if __name__ == "__main__":
+    files = sorted(raw_data_path().glob("*.jsonl.gz"))
+    name = input("Introduce nombre del fichero (vacío para compactar todos): ").strip()
+    if name:
+        files = [raw_data_path() / name]
+    compactar_ficheros(files)
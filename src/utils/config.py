@@ -164,6 +164,12 @@ config_file = config_path() / "config.json"
 
 # ------ SCRIPTS DE EXTRACCIÓN ------ #
 
+# Respuestas en crudo de la API de Steam (ver utils_extraccion/response_cache.py). Caducan a los
+# RESPONSE_CACHE_MAX_AGE_DAYS días; con RESPONSE_CACHE_OFFLINE=1 no se hace ninguna petición
+raw_responses_path = raw_data_path() / "responses"
+response_cache_max_age_days = float(environ.get("RESPONSE_CACHE_MAX_AGE_DAYS", 30))
+response_cache_offline = environ.get("RESPONSE_CACHE_OFFLINE", "0") == "1"
+
 # Script A
 appidlist_file = raw_data_path() / "appids_list.json.gz"
 
@@ -172,6 +178,13 @@ steam_log_file = error_log_path() / "steam_log_file.jsonl"
 gamelist_file = raw_data_path() / f"games_info.jsonl.gz"
 raw_game_info_popularity = raw_data_path() / f"games_info_sample_popularidad.jsonl.gz"
 raw_game_info_prices = raw_data_path() / f"games_info_sample_precios.jsonl.gz"
+# Presupuesto de peticiones por minuto a la API de Steam y número de hilos de la extracción. La tienda
+# admite unas 200 peticiones a appdetails cada 5 minutos por IP (40/min). B hace por juego una petición a
+# appdetails y otra a appreviewhistogram, así que con 80 peticiones/min appdetails se queda en su límite.
+# Si Steam responde 429 el limitador baja la tasa solo
+steam_appdetails_per_minute = float(environ.get("STEAM_APPDETAILS_PER_MINUTE", 40))
+steam_requests_per_minute = float(environ.get("STEAM_REQUESTS_PER_MINUTE", 2 * steam_appdetails_per_minute))
+steam_workers = int(environ.get("STEAM_WORKERS", 4))
 
 # Script C1
 youtube_scraping_file = raw_data_path() / "info_steam_youtube1.jsonl.gz"
@@ -187,6 +200,9 @@ banners_file = raw_data_path() / "info_imagenes.jsonl.gz"
 banners_file_popularity = raw_data_path() / "info_imagenes_popularidad.jsonl.gz"
 banners_file_prices = raw_data_path() / "info_imagenes_precios.jsonl.gz"
 
+# Script F: appids por petición de appdetails con filters=price_overview
+steam_price_batch_size = 200
+
 # ------ SCRIPTS DE TRANSFORMACIÓN ------ #
 
 # Script B
@@ -206,6 +222,8 @@ steam_reviews_parquet_file = processed_data_path() / "steam_reviews_processed.pa
 
 # Script E
 P_banners_file = processed_data_path() / "P_info_imagenes.parquet"
+# Almacén de embeddings CLIP compartido con la aplicación web (directorio)
+clip_store_path = processed_data_path() / "clip_store"
 
 # Scripts P
 popularity = processed_data_path() / "popularidad.parquet"
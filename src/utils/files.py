@@ -4,11 +4,14 @@ Módulo que contiene todas las funciones relativas a la trata de archivos.
 
 import json
 import gzip
+import zlib
+from time import monotonic
 from pandas import DataFrame, read_parquet
 from os import remove, path
 import joblib
 
 from .config import steam_log_file
+from .record_store import BLOCK_RECORDS, rewrite_in_blocks
 from .minio_server import upload_to_minio, download_from_minio, erase_from_minio, file_exists_minio
 
 import matplotlib.pyplot as plt
@@ -241,4 +244,122 @@ def file_exists(filepath, minio = {"minio_write": False, "minio_read": False}):
             return ret
         return path.exists(path.join("data/processed", filepath)) or path.exists(path.join("data/raw", filepath))
     else: 
-        return file_exists_minio(filepath)
\ No newline at end of file
+        return file_exists_minio(filepath)
+
+# ------- ESCRITURA EN STREAMING -------
+
+class JsonlWriter:
+    """
+    Escritor de ficheros .jsonl / .jsonl.gz que se mantiene abierto durante toda la extracción.
+
+    write_to_file abre, escribe un registro y cierra el fichero en cada llamada, lo que en un .jsonl.gz
+    genera un miembro gzip por registro (peor compresión y lecturas más lentas). Este escritor acumula los
+    registros en memoria y los escribe como un miembro gzip por bloque cuando se superan max_records
+    registros, max_bytes bytes o max_seconds segundos desde la última escritura. Al salir del bloque with
+    (también por KeyboardInterrupt o una excepción) escribe lo pendiente y cierra el fichero.
+
+    Cada bloque es un miembro gzip completo: lo escrito se puede leer aunque se corte el proceso y el índice
+    de record_store.BlockGzipRecords usa los comienzos de los miembros como puntos de acceso.
+
+    Uso:
+        with JsonlWriter(gamelist_file) as writer:
+            for ...:
+                writer.write(record)
+
+    Args:
+        filepath (Path): fichero .jsonl o .jsonl.gz (se añade al final si ya existe).
+        max_records (int): registros acumulados que provocan una escritura.
+        max_bytes (int): bytes acumulados que provocan una escritura.
+        max_seconds (float): segundos tras los que se escribe lo acumulado aunque no se llegue a los límites.
+    """
+    def __init__(self, filepath, max_records = BLOCK_RECORDS, max_bytes = 1 << 20, max_seconds = 30):
+        self.filepath = Path(filepath)
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.written = 0
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._last_flush = monotonic()
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def open(self):
+        if self.filepath.suffixes[-2:] == [".jsonl", ".gz"]:
+            self._compress = True
+        elif self.filepath.suffix == ".jsonl":
+            self._compress = False
+        else:
+            raise ValueError(f"File extension not supported: {self.filepath.name}")
+        self._file = open(self.filepath, "ab")
+
+    def write(self, data):
+        """Añade un registro (o una lista de registros) al buffer."""
+        for item in (data if isinstance(data, list) else [data]):
+            line = (json.dumps(item, ensure_ascii = False) + "\n").encode("utf-8")
+            self._buffer.append(line)
+            self._buffer_bytes += len(line)
+        if (len(self._buffer) >= self.max_records or self._buffer_bytes >= self.max_bytes
+                or monotonic() - self._last_flush >= self.max_seconds):
+            self.flush()
+
+    def flush(self):
+        """Escribe los registros acumulados (un miembro gzip) y los vuelca a disco."""
+        if self._buffer:
+            block = b"".join(self._buffer)
+            self._file.write(gzip.compress(block) if self._compress else block)
+            self._file.flush()
+            self.written += len(self._buffer)
+            self._buffer, self._buffer_bytes = [], 0
+        self._last_flush = monotonic()
+
+    def close(self):
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+def _count_gzip_members(filepath):
+    """Número de miembros gzip concatenados en un fichero."""
+    members = 0
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            while chunk:
+                decompressor.decompress(chunk)
+                if not decompressor.eof:
+                    break
+                # Fin de un miembro: lo que sobra del bloque es el comienzo del siguiente
+                members += 1
+                chunk = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    return members
+
+def compact_jsonl_gz(filepath, block_size = BLOCK_RECORDS):
+    """
+    Reescribe un .jsonl.gz formado por muchos miembros gzip (uno por registro, de write_to_file) o por un
+    único stream en miembros de block_size registros: buena compresión y puntos de acceso para
+    record_store.BlockGzipRecords. Se escribe en un fichero temporal que sustituye al original al terminar.
+
+    Args:
+        filepath (Path): fichero .jsonl.gz a compactar.
+        block_size (int): registros por miembro gzip.
+
+    Returns:
+        dict: tamaño y número de miembros antes y después de compactar.
+    """
+    filepath = Path(filepath)
+    before = {"bytes": path.getsize(filepath), "members": _count_gzip_members(filepath)}
+    rewrite_in_blocks(filepath, block_size)
+    after = {"bytes": path.getsize(filepath), "members": _count_gzip_members(filepath)}
+    return {"before": before, "after": after}
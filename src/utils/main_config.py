@@ -61,6 +61,14 @@ main_extraccion_info = {
               "ejecutable": "E_metadatos_imagenes", 
               "usar": False, 
               "dependences" : [dep.gamelist_file_dependence]
+        },
+        "F": {"fichero": "F_actualizar_precios", 
+              "mensaje": "Actualizar precios de los juegos",
+              "salida": gamelist_file.name, 
+              "path": gamelist_file, 
+              "ejecutable": "F_actualizar_precios", 
+              "usar": False, 
+              "dependences" : [dep.gamelist_file_dependence]
         }
     }
 
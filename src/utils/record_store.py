@@ -0,0 +1,202 @@
+"""
+Lectura indexada de ficheros .jsonl.gz para empezar a leer en cualquier registro sin descomprimir ni cargar
+en memoria todo lo anterior.
+
+Un fichero gzip puede estar formado por varios miembros concatenados, y cada miembro se puede descomprimir
+de forma independiente empezando en su offset. El índice (fichero hermano {nombre}.idx) guarda, cada
+block_size registros aproximadamente, el offset de un miembro y el número del primer registro que contiene.
+Para leer desde el registro n se busca el bloque que lo contiene, se hace seek a su offset y se descomprime
+desde ahí, saltando como mucho block_size registros.
+
+Los ficheros escritos por files.JsonlWriter y compactados con files.compact_jsonl_gz ya están formados
+por bloques (un miembro gzip por bloque) y los escritos registro a registro tienen un miembro por registro,
+así que indexar es solo recorrer el fichero: la lectura nunca lo modifica. Un fichero antiguo con un único
+stream gzip se puede leer igual, pero hay que descomprimir desde el principio hasta curr_idx; para tener
+puntos de acceso hay que compactarlo (src/B_Transformacion/compactar_ficheros_jsonl.py).
+El índice se invalida si cambia el tamaño o la fecha de modificación del fichero, y se reconstruye en la
+siguiente lectura.
+"""
+
+import bisect
+import gzip
+import json
+import zlib
+from os import replace
+from pathlib import Path
+
+# Registros por miembro gzip de los ficheros escritos en bloques
+BLOCK_RECORDS = 1000
+
+def rewrite_in_blocks(filepath, block_size = BLOCK_RECORDS):
+    """
+    Reescribe un .jsonl.gz con un miembro gzip por cada block_size registros (en un fichero temporal que
+    sustituye al original al terminar). Lo usa files.compact_jsonl_gz.
+
+    Args:
+        filepath (Path): fichero .jsonl.gz.
+        block_size (int): registros por miembro.
+
+    Returns:
+        int: número de registros.
+    """
+    filepath = Path(filepath)
+    tmp_path = filepath.with_name(f"tmp_{filepath.name}")
+    records, buffer = 0, []
+    with gzip.open(filepath, "rb") as src, open(tmp_path, "wb") as dst:
+        # Lectura por líneas: no se carga el fichero entero en memoria
+        for line in src:
+            if not line.strip():
+                continue
+            buffer.append(line if line.endswith(b"\n") else line + b"\n")
+            records += 1
+            if len(buffer) == block_size:
+                dst.write(gzip.compress(b"".join(buffer)))
+                buffer.clear()
+        if buffer:
+            dst.write(gzip.compress(b"".join(buffer)))
+    replace(tmp_path, filepath)
+    return records
+
+class BlockGzipRecords:
+    """
+    Registros de un fichero .jsonl.gz con acceso por posición.
+
+    Args:
+        filepath (Path): fichero .jsonl.gz.
+        block_size (int): registros (aproximados) entre dos puntos de acceso del índice.
+    """
+    def __init__(self, filepath, block_size = BLOCK_RECORDS):
+        self.filepath = Path(filepath)
+        self.index_path = self.filepath.with_name(f"{self.filepath.name}.idx")
+        self.block_size = block_size
+        self._index = None
+
+    # ------- ÍNDICE -------
+
+    def _stamp(self):
+        stat = self.filepath.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @property
+    def index(self):
+        """Índice {"size", "mtime_ns", "records", "blocks": [[offset, primer_registro], ...]}."""
+        if self._index is None:
+            self._index = self._load_index()
+        if self._index is None:
+            self._index = self.build_index()
+        return self._index
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "rt", encoding = "utf-8") as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        stamp = self._stamp()
+        if index.get("size") != stamp["size"] or index.get("mtime_ns") != stamp["mtime_ns"]:
+            return None
+        return index
+
+    def _save_index(self, records, blocks):
+        index = {**self._stamp(), "records": records, "block_size": self.block_size, "blocks": blocks}
+        with open(self.index_path, "wt", encoding = "utf-8") as f:
+            json.dump(index, f)
+        return index
+
+    def _scan(self):
+        """
+        Recorre los miembros gzip del fichero contando registros.
+
+        Returns:
+            int: número de registros.
+            list: puntos de acceso [offset, primer_registro], uno cada block_size registros como mínimo.
+            int: mayor número de registros entre dos puntos de acceso consecutivos.
+        """
+        records, blocks, max_gap = 0, [[0, 0]], 0
+        offset = 0            # offset en el fichero del bloque que se está descomprimiendo
+        carry = b""           # línea incompleta
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        with open(self.filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                chunk_offset = offset
+                offset += len(chunk)
+                while chunk:
+                    lines = (carry + decompressor.decompress(chunk)).split(b"\n")
+                    carry = lines.pop()
+                    records += sum(1 for line in lines if line.strip())
+                    if not decompressor.eof:
+                        break
+                    # Fin de un miembro: el siguiente empieza donde acaba lo consumido del bloque
+                    unused = decompressor.unused_data
+                    member_start = chunk_offset + len(chunk) - len(unused)
+                    if not carry.strip() and records - blocks[-1][1] >= self.block_size:
+                        max_gap = max(max_gap, records - blocks[-1][1])
+                        blocks.append([member_start, records])
+                    chunk, chunk_offset = unused, member_start
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if carry.strip():
+            records += 1
+        # El último punto de acceso no puede estar al final del fichero
+        if blocks[-1][1] == records and len(blocks) > 1:
+            blocks.pop()
+        max_gap = max(max_gap, records - blocks[-1][1])
+        return records, blocks, max_gap
+
+    def build_index(self):
+        """Construye (y guarda) el índice recorriendo los miembros gzip del fichero, sin modificarlo."""
+        records, blocks, max_gap = self._scan()
+        if max_gap > 2 * self.block_size:
+            print(f"Advertencia: {self.filepath.name} tiene pocos puntos de acceso ({max_gap} registros seguidos "
+                  f"en un mismo bloque). Compáctalo con compactar_ficheros_jsonl para reanudar más rápido")
+        return self._save_index(records, blocks)
+
+    # ------- LECTURA -------
+
+    def __len__(self):
+        return self.index["records"]
+
+    def iter_range(self, start = 0, stop = None):
+        """
+        Devuelve de forma perezosa los registros [start, stop).
+
+        Args:
+            start (int): primer registro.
+            stop (int | None): registro en el que parar (sin incluir). None: hasta el final.
+
+        Returns:
+            generator: registros (dict) del rango.
+        """
+        index = self.index
+        stop = index["records"] if stop is None else min(stop, index["records"])
+        if start >= stop:
+            return
+        block = bisect.bisect_right([first for _, first in index["blocks"]], start) - 1
+        offset, current = index["blocks"][block]
+
+        with open(self.filepath, "rb") as f:
+            f.seek(offset)
+            with gzip.GzipFile(fileobj = f, mode = "rb") as gz:
+                for line in gz:
+                    if not line.strip():
+                        continue
+                    if current >= start:
+                        yield json.loads(line)
+                    current += 1
+                    if current >= stop:
+                        break
+
+class PendingRecords:
+    """
+    Rango [start, stop) de un BlockGzipRecords que se lee al iterarlo. Tiene len (para tqdm y para
+    comprobar si está vacío) y se puede iterar varias veces.
+    """
+    def __init__(self, store, start, stop):
+        self.store = store
+        self.start = max(0, start)
+        self.stop = min(stop, len(store))
+
+    def __len__(self):
+        return max(0, self.stop - self.start)
+
+    def __iter__(self):
+        return self.store.iter_range(self.start, self.stop)
@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# Los scripts de extracción importan src.* desde la raíz del repositorio y utils_extraccion.* desde
+# src/A_Extraccion (ver src/main.py)
+ROOT = Path(__file__).resolve().parents[1]
+for path in [ROOT, ROOT / "src" / "A_Extraccion"]:
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
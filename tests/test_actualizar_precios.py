@@ -0,0 +1,77 @@
+import gzip
+import json
+
+import pytest
+
+import F_actualizar_precios
+from F_actualizar_precios import _update_file
+from src.utils.record_store import BlockGzipRecords
+from utils_extraccion import steam_requests
+from utils_extraccion.steam_requests import FREE_GAME_PRICE_OVERVIEW, get_price_overviews
+
+MINIO = {"minio_write": False, "minio_read": False}
+
+def _price(final):
+    return {"currency": "EUR", "initial": final, "final": final, "discount_percent": 0}
+
+def test_get_price_overviews(monkeypatch):
+    calls = []
+    def _request_url(sesion, params_info, url, use_cache = True):
+        calls.append((params_info, use_cache))
+        return {
+            "10": {"success": True, "data": {"price_overview": _price(999)}},
+            "20": {"success": True, "data": []},          # gratuito
+            "30": {"success": False},                     # no disponible en la región
+        }
+    monkeypatch.setattr(steam_requests, "_request_url", _request_url)
+
+    prices = get_price_overviews(["10", "20", "30", "40"], sesion=None)
+
+    assert prices == {"10": _price(999), "20": FREE_GAME_PRICE_OVERVIEW}
+    assert calls == [({"appids": "10,20,30,40", "filters": "price_overview", "cc": "eur"}, False)]
+
+def _write_games(filepath, games):
+    with gzip.open(filepath, "wt", encoding="utf-8") as f:
+        f.writelines(json.dumps(game) + "\n" for game in games)
+
+def _read_games(filepath):
+    with gzip.open(filepath, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def _games(n):
+    return [{"id": str(i), "appdetails": {"name": f"game {i}", "price_overview": _price(100)},
+             "appreviewhistogram": {}} for i in range(n)]
+
+def test_update_file(tmp_path):
+    filepath = tmp_path / "games_info.jsonl.gz"
+    games = _games(2500) + [{"id": "9999", "appdetails": {}, "appreviewhistogram": {}}]
+    _write_games(filepath, games)
+
+    changed = _update_file(filepath, {"1": _price(100), "2": _price(500), "9999": _price(1)}, MINIO)
+
+    assert changed == 1
+    result = _read_games(filepath)
+    assert len(result) == len(games)
+    assert result[2]["appdetails"]["price_overview"] == _price(500)
+    assert result[1] == games[1] and result[-1] == games[-1]
+    # Se escribe en bloques: el fichero sigue teniendo puntos de acceso para reanudar sesiones
+    assert [first for _, first in BlockGzipRecords(filepath).index["blocks"]] == [0, 1000, 2000]
+    assert not list(tmp_path.glob("tmp_*"))
+
+def test_update_file_keeps_original_when_writing_fails(tmp_path, monkeypatch):
+    filepath = tmp_path / "games_info.jsonl.gz"
+    _write_games(filepath, _games(10))
+    content = filepath.read_bytes()
+
+    class _FailingWriter(F_actualizar_precios.JsonlWriter):
+        def write(self, data):
+            if data["id"] == "5":
+                raise OSError("disco lleno")
+            super().write(data)
+    monkeypatch.setattr(F_actualizar_precios, "JsonlWriter", _FailingWriter)
+
+    with pytest.raises(OSError):
+        _update_file(filepath, {"1": _price(500)}, MINIO)
+
+    assert filepath.read_bytes() == content
+    assert not list(tmp_path.glob("tmp_*"))
@@ -0,0 +1,80 @@
+from email.utils import formatdate
+from time import monotonic, sleep, time
+
+import requests
+
+from utils_extraccion.concurrencia import AdaptiveRateLimiter, RateLimitedSession, _retry_after_seconds, ordered_map
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+def test_retry_after_seconds():
+    assert _retry_after_seconds(_Response(429, {"Retry-After": "12"})) == 12
+    assert _retry_after_seconds(_Response(429)) is None
+    assert _retry_after_seconds(_Response(429, {"Retry-After": "mañana"})) is None
+    seconds = _retry_after_seconds(_Response(429, {"Retry-After": formatdate(time() + 30, usegmt=True)}))
+    assert 25 < seconds <= 30
+
+def test_limiter_keeps_the_rate():
+    limiter = AdaptiveRateLimiter(1200)   # 20 por segundo
+    start = monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    # El primer token está disponible desde el principio
+    assert 0.45 < monotonic() - start < 1
+
+def test_limiter_halves_rate_and_pauses_on_429():
+    limiter = AdaptiveRateLimiter(1200, min_requests_per_minute=100)
+    limiter.on_rate_limited(retry_after=0.2)
+    assert limiter.requests_per_minute == 600
+    assert limiter.rate_limited == 1
+
+    start = monotonic()
+    limiter.acquire()
+    assert monotonic() - start >= 0.2
+
+    for _ in range(5):
+        limiter.on_rate_limited(retry_after=0)
+    assert limiter.requests_per_minute == 100
+
+def test_limiter_recovers_up_to_target():
+    limiter = AdaptiveRateLimiter(600)
+    limiter.on_rate_limited(retry_after=0)
+    for _ in range(9):
+        limiter.on_success()
+    assert limiter.requests_per_minute == 570
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.requests_per_minute == 600
+
+def test_session_retries_429(monkeypatch):
+    responses = [_Response(429, {"Retry-After": "0"}), _Response(429, {"Retry-After": "0"}), _Response(200)]
+    monkeypatch.setattr(requests.Session, "request", lambda self, method, url, *args, **kwargs: responses.pop(0))
+    limiter = AdaptiveRateLimiter(6000)
+    sesion = RateLimitedSession(limiter)
+
+    assert sesion.get("https://store.steampowered.com/api/appdetails").status_code == 200
+    assert limiter.rate_limited == 2
+
+def test_session_returns_last_429(monkeypatch):
+    monkeypatch.setattr(requests.Session, "request", lambda self, method, url, *args, **kwargs: _Response(429, {"Retry-After": "0"}))
+    sesion = RateLimitedSession(AdaptiveRateLimiter(6000), max_retries=2)
+
+    assert sesion.get("https://store.steampowered.com/api/appdetails").status_code == 429
+    assert sesion.limiter.rate_limited == 3
+
+def test_ordered_map_keeps_order_and_returns_exceptions():
+    def _function(item):
+        if item == 3:
+            raise ValueError(item)
+        # Los primeros terminan los últimos
+        sleep(0.01 * (10 - item))
+        return item * 2
+
+    results = list(ordered_map(_function, range(10), workers=4, window=5))
+
+    assert [item for item, _ in results] == list(range(10))
+    assert isinstance(results[3][1], ValueError)
+    assert [result for item, result in results if item != 3] == [i * 2 for i in range(10) if i != 3]
@@ -0,0 +1,83 @@
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from src.utils.embedding_store import EmbeddingStore, content_hash, image_brightness, reduce_image
+
+ROOT = Path(__file__).resolve().parents[1]
+DIM = 4
+
+def _vector(value):
+    return np.full(DIM, value, dtype=np.float32)
+
+def test_add_and_lookup(tmp_path):
+    store = EmbeddingStore(tmp_path, dim=DIM)
+    store.add("10", content_hash(b"a"), "url_a", 0.5, _vector(1))
+    store.add("20", content_hash(b"b"), "url_b", 0.7, _vector(2))
+
+    assert len(store) == 2
+    assert store.get_by_appid("10")["url"] == "url_a"
+    assert np.array_equal(store.get_by_hash(content_hash(b"b"))["vector"], _vector(2))
+    assert store.get_by_appid("30") is None
+
+def test_lookups_only_read_memory_until_refresh(tmp_path):
+    writer = EmbeddingStore(tmp_path, dim=DIM)
+    reader = EmbeddingStore(tmp_path, dim=DIM)
+    writer.add("10", content_hash(b"a"), "url_a", 0.5, _vector(1))
+
+    assert reader.get_by_appid("10") is None
+    reader.refresh()
+    assert reader.get_by_appid("10")["brillo"] == 0.5
+
+def test_last_row_of_an_appid_wins(tmp_path):
+    store = EmbeddingStore(tmp_path, dim=DIM)
+    store.add("10", content_hash(b"a"), "url_a", 0.5, _vector(1))
+    store.add("10", content_hash(b"b"), "url_b", 0.6, _vector(2))
+
+    assert len(store) == 1
+    assert store.get_by_appid("10")["url"] == "url_b"
+
+def test_add_discards_partial_vector(tmp_path):
+    store = EmbeddingStore(tmp_path, dim=DIM)
+    store.add("10", content_hash(b"a"), "url_a", 0.5, _vector(1))
+    # Escritura interrumpida: medio vector al final del fichero y sin línea en el índice
+    with open(store.vectors_file, "ab") as f:
+        f.write(_vector(9).tobytes()[:DIM * 2])
+
+    store.add("20", content_hash(b"b"), "url_b", 0.7, _vector(2))
+
+    assert store.vectors_file.stat().st_size == 2 * store.row_bytes
+    assert np.array_equal(store.get_by_appid("20")["vector"], _vector(2))
+    reader = EmbeddingStore(tmp_path, dim=DIM)
+    reader.refresh()
+    assert np.array_equal(reader.get_by_appid("10")["vector"], _vector(1))
+
+def test_app_mirror_is_identical():
+    # La aplicación tiene su propia copia del módulo: solo puede cambiar la nota del docstring
+    def _code(path):
+        lines = path.read_text(encoding="utf-8").splitlines()
+        return [line for line in lines if not line.startswith("Este módulo es un mirror de")]
+
+    assert _code(ROOT / "src/utils/embedding_store.py") == _code(ROOT / "app/utils/embedding_store.py")
+
+def _jpeg(size, color=(200, 100, 50)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+def test_reduce_image_keeps_at_least_clip_size():
+    img = reduce_image(Image.open(BytesIO(_jpeg((1840, 860)))))
+
+    assert img.mode == "RGB"
+    assert min(img.size) >= 224 and img.size[0] < 1840
+
+def test_brightness_of_the_reduced_image():
+    content = _jpeg((920, 430))
+    full = Image.open(BytesIO(content)).convert("RGB")
+
+    brillo = image_brightness(reduce_image(Image.open(BytesIO(content))))
+
+    assert abs(brillo - image_brightness(full)) < 1
+    assert brillo == image_brightness(reduce_image(Image.open(BytesIO(content))))
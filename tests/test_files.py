@@ -0,0 +1,80 @@
+import gzip
+import json
+
+import pytest
+
+from src.utils import files
+from src.utils.files import JsonlWriter, _count_gzip_members, compact_jsonl_gz, write_to_file
+
+def _read(filepath):
+    opener = gzip.open if filepath.suffix == ".gz" else open
+    with opener(filepath, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def test_writer_buffers_until_max_records(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    with JsonlWriter(filepath, max_records=3, max_seconds=3600) as writer:
+        writer.write({"id": 1})
+        writer.write({"id": 2})
+        assert writer.written == 0 and filepath.stat().st_size == 0
+        writer.write({"id": 3})
+        assert writer.written == 3
+        writer.write({"id": 4})
+
+    assert _read(filepath) == [{"id": i} for i in range(1, 5)]
+    # Un miembro gzip por escritura: el bloque lleno y lo pendiente al cerrar
+    assert _count_gzip_members(filepath) == 2
+
+def test_writer_flushes_on_max_bytes(tmp_path):
+    filepath = tmp_path / "games.jsonl"
+    with JsonlWriter(filepath, max_records=1000, max_bytes=50, max_seconds=3600) as writer:
+        writer.write({"text": "x" * 60})
+        assert writer.written == 1
+
+def test_writer_flushes_on_max_seconds(tmp_path, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(files, "monotonic", lambda: now[0])
+    filepath = tmp_path / "games.jsonl"
+    with JsonlWriter(filepath, max_records=1000, max_seconds=30) as writer:
+        writer.write({"id": 1})
+        assert writer.written == 0
+        now[0] = 31
+        writer.write({"id": 2})
+        assert writer.written == 2
+
+def test_writer_writes_pending_records_on_exception(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    with pytest.raises(KeyboardInterrupt):
+        with JsonlWriter(filepath) as writer:
+            writer.write([{"id": 1}, {"id": 2}])
+            raise KeyboardInterrupt
+
+    assert _read(filepath) == [{"id": 1}, {"id": 2}]
+
+def test_writer_appends_to_existing_file(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    with JsonlWriter(filepath) as writer:
+        writer.write({"id": 1})
+    with JsonlWriter(filepath) as writer:
+        writer.write({"id": 2})
+
+    assert _read(filepath) == [{"id": 1}, {"id": 2}]
+
+def test_writer_rejects_other_extensions(tmp_path):
+    with pytest.raises(ValueError):
+        JsonlWriter(tmp_path / "games.json").open()
+
+def test_compact_jsonl_gz(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    records = [{"id": i, "name": f"game {i}"} for i in range(25)]
+    # Un miembro por registro, como escribe write_to_file
+    for record in records:
+        write_to_file(record, filepath)
+
+    result = compact_jsonl_gz(filepath, block_size=10)
+
+    assert result["before"]["members"] == 25
+    assert result["after"]["members"] == 3
+    assert result["after"]["bytes"] < result["before"]["bytes"]
+    assert _read(filepath) == records
+    assert not list(tmp_path.glob("tmp_*"))
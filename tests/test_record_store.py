@@ -0,0 +1,102 @@
+import gzip
+import json
+
+import pytest
+
+from src.utils.files import JsonlWriter, compact_jsonl_gz, write_to_file
+from src.utils.record_store import BlockGzipRecords, PendingRecords
+from utils_extraccion.sesion import _pending_range
+
+RECORDS = [{"id": i} for i in range(250)]
+
+def _write_blocks(filepath, records, block_size):
+    with open(filepath, "wb") as f:
+        for i in range(0, len(records), block_size):
+            f.write(gzip.compress(b"".join((json.dumps(r) + "\n").encode() for r in records[i:i + block_size])))
+
+@pytest.fixture
+def blocks_file(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    _write_blocks(filepath, RECORDS, 50)
+    return filepath
+
+def test_index_has_an_access_point_per_block(blocks_file):
+    store = BlockGzipRecords(blocks_file, block_size=50)
+
+    assert len(store) == 250
+    assert [first for _, first in store.index["blocks"]] == [0, 50, 100, 150, 200]
+    assert store.index_path.exists()
+
+@pytest.mark.parametrize("start, stop", [(0, 250), (0, 1), (49, 51), (50, 100), (123, 201), (249, 250), (200, None)])
+def test_iter_range(blocks_file, start, stop):
+    store = BlockGzipRecords(blocks_file, block_size=50)
+
+    assert list(store.iter_range(start, stop)) == RECORDS[start:stop]
+
+def test_iter_range_out_of_bounds(blocks_file):
+    store = BlockGzipRecords(blocks_file, block_size=50)
+
+    assert list(store.iter_range(240, 1000)) == RECORDS[240:]
+    assert list(store.iter_range(300, 400)) == []
+    assert list(store.iter_range(10, 10)) == []
+
+def test_pending_records(blocks_file):
+    pending = PendingRecords(BlockGzipRecords(blocks_file, block_size=50), 120, 260)
+
+    assert len(pending) == 130
+    assert list(pending) == RECORDS[120:]
+    # Se puede iterar más de una vez
+    assert list(pending)[0] == {"id": 120}
+    assert len(PendingRecords(pending.store, 300, 400)) == 0
+
+def test_indexing_does_not_modify_the_file(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    # Un miembro por registro (write_to_file): sin bloques, hay un punto de acceso cada block_size registros
+    for record in RECORDS[:30]:
+        write_to_file(record, filepath)
+    content = filepath.read_bytes()
+
+    store = BlockGzipRecords(filepath, block_size=10)
+
+    assert list(store.iter_range(15, 25)) == RECORDS[15:25]
+    assert [first for _, first in store.index["blocks"]] == [0, 10, 20]
+    assert filepath.read_bytes() == content
+
+def test_single_stream_file_is_read_from_the_start(tmp_path):
+    filepath = tmp_path / "games.jsonl.gz"
+    with gzip.open(filepath, "wt") as f:
+        f.writelines(json.dumps(r) + "\n" for r in RECORDS)
+
+    store = BlockGzipRecords(filepath, block_size=50)
+
+    assert store.index["blocks"] == [[0, 0]]
+    assert list(store.iter_range(200, 205)) == RECORDS[200:205]
+
+    compact_jsonl_gz(filepath, block_size=50)
+    store = BlockGzipRecords(filepath, block_size=50)
+    assert len(store.index["blocks"]) == 5
+    assert list(store.iter_range(200, 205)) == RECORDS[200:205]
+
+def test_index_is_rebuilt_when_the_file_changes(blocks_file):
+    store = BlockGzipRecords(blocks_file, block_size=50)
+    assert len(store) == 250
+
+    with JsonlWriter(blocks_file, max_records=50) as writer:
+        writer.write([{"id": i} for i in range(250, 300)])
+
+    store = BlockGzipRecords(blocks_file, block_size=50)
+    assert len(store) == 300
+    assert list(store.iter_range(290, None)) == [{"id": i} for i in range(290, 300)]
+
+def test_saved_index_is_reused(blocks_file, monkeypatch):
+    BlockGzipRecords(blocks_file, block_size=50).build_index()
+
+    store = BlockGzipRecords(blocks_file, block_size=50)
+    monkeypatch.setattr(store, "build_index", lambda: pytest.fail("El índice guardado sigue siendo válido"))
+
+    assert len(store) == 250
+
+def test_pending_range_of_a_session(blocks_file):
+    # end_idx está incluido en el rango de la sesión
+    assert list(_pending_range(BlockGzipRecords(blocks_file, block_size=50), 100, 149)) == RECORDS[100:150]
+    assert _pending_range(RECORDS, 100, 149) == RECORDS[100:150]
@@ -0,0 +1,89 @@
+import pytest
+
+import utils_extraccion.steam_requests as steam_requests
+from src.utils.exceptions import SteamAPIException
+from utils_extraccion.response_cache import ResponseCache
+
+URL = "https://store.steampowered.com/api/appdetails"
+
+class _Response:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = {"content-type": "application/json", **(headers or {})}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+class _Session:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get(self, url, params=None, headers=None):
+        self.calls.append({"url": url, "params": dict(params), "headers": headers})
+        return self.responses.pop(0)
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, max_age=3600)
+    monkeypatch.setattr(steam_requests, "RESPONSE_CACHE", cache)
+    return cache
+
+def test_key_ignores_param_order():
+    assert ResponseCache.key(URL, {"appids": 10, "cc": "es"}) == ResponseCache.key(URL, {"cc": "es", "appids": 10})
+    assert ResponseCache.key(URL, {"appids": 10}) != ResponseCache.key(URL, {"appids": 20})
+
+def test_put_and_get(tmp_path):
+    cache = ResponseCache(tmp_path)
+    assert cache.get(URL, {"appids": 10}) is None
+
+    cache.put(URL, {"appids": 10}, {"10": {"success": True}}, etag='"abc"')
+    entry = cache.get(URL, {"appids": 10})
+
+    assert entry["data"] == {"10": {"success": True}}
+    assert entry["etag"] == '"abc"'
+    assert not list(tmp_path.rglob("*.tmp"))
+
+def test_is_fresh(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, max_age=60)
+    entry = cache.put(URL, {}, {})
+    assert cache.is_fresh(entry)
+
+    monkeypatch.setattr("utils_extraccion.response_cache.time", lambda: entry["fetched_at"] + 61)
+    assert not cache.is_fresh(entry)
+    assert ResponseCache(tmp_path, max_age=60, offline=True).is_fresh(entry)
+    assert ResponseCache(tmp_path).is_fresh(entry)
+
+def test_request_url_stores_and_reuses(cache):
+    session = _Session([_Response(200, {"10": {"success": True}}, {"ETag": '"v1"'})])
+
+    assert steam_requests._request_url(session, {"appids": 10}, URL) == {"10": {"success": True}}
+    assert steam_requests._request_url(session, {"appids": 10}, URL) == {"10": {"success": True}}
+
+    assert len(session.calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+def test_request_url_revalidates_expired_entries(cache, monkeypatch):
+    entry = cache.put(URL, {"appids": 10}, {"old": True}, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cache.max_age = 0
+    session = _Session([_Response(304)])
+
+    assert steam_requests._request_url(session, {"appids": 10}, URL) == {"old": True}
+    assert session.calls[0]["headers"] == {"If-None-Match": '"v1"', "If-Modified-Since": entry["last_modified"]}
+    assert cache.get(URL, {"appids": 10})["fetched_at"] >= entry["fetched_at"]
+
+def test_request_url_offline(cache):
+    cache.offline = True
+    with pytest.raises(SteamAPIException):
+        steam_requests._request_url(_Session([]), {"appids": 10}, URL)
+
+def test_request_url_without_cache(cache):
+    session = _Session([_Response(200, {"a": 1}), _Response(200, {"a": 2})])
+
+    assert steam_requests._request_url(session, {"cursor": "*"}, URL, use_cache = False) == {"a": 1}
+    assert steam_requests._request_url(session, {"cursor": "*"}, URL, use_cache = False) == {"a": 2}
+    assert cache.get(URL, {"cursor": "*"}) is None